@@ -0,0 +1,29 @@
+"""retail baseline
+
+The core retail schema (geography, stores, products, customers,
+transactions) predates the migration chain and is created by
+``create_retail_schema.py``. Databases built that way are brought under
+Alembic with ``alembic stamp 0001_retail_baseline`` followed by
+``alembic upgrade head``.
+
+Revision ID: 0001_retail_baseline
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_retail_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
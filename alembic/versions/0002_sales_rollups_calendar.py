@@ -0,0 +1,131 @@
+"""sales rollups, sketch registers and calendar dimension
+
+Tables that ``create_retail_schema.py`` already created are skipped, so this
+applies cleanly on top of either a stamped or a freshly built database.
+
+Revision ID: 0002_sales_rollups_calendar
+Revises: 0001_retail_baseline
+Create Date: 2026-10-17 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_sales_rollups_calendar"
+down_revision: Union[str, None] = "0001_retail_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    tables = _existing_tables()
+
+    if "daily_store_sales" not in tables:
+        op.create_table(
+            "daily_store_sales",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sales_date", sa.Date(), nullable=False),
+            sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id"), nullable=False),
+            sa.Column("total_sales", sa.Float(), nullable=False),
+            sa.Column("total_transactions", sa.Integer(), nullable=False),
+            sa.Column("total_items", sa.Integer(), nullable=False),
+            sa.UniqueConstraint("sales_date", "store_id", name="uq_daily_store_sales"),
+        )
+        op.create_index("ix_daily_store_sales_id", "daily_store_sales", ["id"])
+        op.create_index("ix_daily_store_sales_sales_date", "daily_store_sales", ["sales_date"])
+
+    if "daily_product_sales" not in tables:
+        op.create_table(
+            "daily_product_sales",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sales_date", sa.Date(), nullable=False),
+            sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id"), nullable=False),
+            sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+            sa.Column("total_sales", sa.Float(), nullable=False),
+            sa.Column("total_quantity", sa.Float(), nullable=False),
+            sa.Column("total_transactions", sa.Integer(), nullable=False),
+            sa.UniqueConstraint(
+                "sales_date", "store_id", "product_id", name="uq_daily_product_sales"
+            ),
+        )
+        op.create_index("ix_daily_product_sales_id", "daily_product_sales", ["id"])
+        op.create_index("ix_daily_product_sales_sales_date", "daily_product_sales", ["sales_date"])
+
+    if "daily_group_sales" not in tables:
+        op.create_table(
+            "daily_group_sales",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sales_date", sa.Date(), nullable=False),
+            sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id"), nullable=False),
+            sa.Column("group_type", sa.String(20), nullable=False),
+            sa.Column("group_id", sa.Integer(), nullable=False),
+            sa.Column("total_sales", sa.Float(), nullable=False),
+            sa.Column("total_quantity", sa.Float(), nullable=False),
+            sa.Column("total_transactions", sa.Integer(), nullable=False),
+            sa.UniqueConstraint(
+                "sales_date", "store_id", "group_type", "group_id", name="uq_daily_group_sales"
+            ),
+        )
+        op.create_index("ix_daily_group_sales_id", "daily_group_sales", ["id"])
+        op.create_index("ix_daily_group_sales_sales_date", "daily_group_sales", ["sales_date"])
+
+    if "daily_sketch_registers" not in tables:
+        op.create_table(
+            "daily_sketch_registers",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sales_date", sa.Date(), nullable=False),
+            sa.Column("sketch", sa.String(20), nullable=False),
+            sa.Column("register_index", sa.Integer(), nullable=False),
+            sa.Column("weight", sa.Float(), nullable=False),
+            sa.UniqueConstraint(
+                "sales_date", "sketch", "register_index", name="uq_daily_sketch_registers"
+            ),
+        )
+        op.create_index("ix_daily_sketch_registers_id", "daily_sketch_registers", ["id"])
+
+    if "calendar_days" not in tables:
+        op.create_table(
+            "calendar_days",
+            sa.Column("date_key", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("calendar_date", sa.Date(), nullable=False, unique=True),
+            sa.Column("day_of_week", sa.Integer(), nullable=False),
+            sa.Column("iso_year", sa.Integer(), nullable=False),
+            sa.Column("iso_week", sa.Integer(), nullable=False),
+            sa.Column("week_key", sa.Integer(), nullable=False),
+            sa.Column("week_start", sa.Date(), nullable=False),
+            sa.Column("month", sa.Integer(), nullable=False),
+            sa.Column("month_key", sa.Integer(), nullable=False),
+            sa.Column("month_start", sa.Date(), nullable=False),
+            sa.Column("quarter", sa.Integer(), nullable=False),
+            sa.Column("quarter_key", sa.Integer(), nullable=False),
+            sa.Column("quarter_start", sa.Date(), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column("year_start", sa.Date(), nullable=False),
+        )
+        op.create_index("ix_calendar_days_week_key", "calendar_days", ["week_key"])
+        op.create_index("ix_calendar_days_month_key", "calendar_days", ["month_key"])
+        op.create_index("ix_calendar_days_quarter_key", "calendar_days", ["quarter_key"])
+        op.create_index("ix_calendar_days_year", "calendar_days", ["year"])
+
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("transactions")}
+    if "date_key" not in columns:
+        op.add_column("transactions", sa.Column("date_key", sa.Integer(), nullable=True))
+        op.create_index("ix_transactions_date_key", "transactions", ["date_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_date_key", table_name="transactions")
+    op.drop_column("transactions", "date_key")
+    op.drop_table("calendar_days")
+    op.drop_table("daily_sketch_registers")
+    op.drop_table("daily_group_sales")
+    op.drop_table("daily_product_sales")
+    op.drop_table("daily_store_sales")
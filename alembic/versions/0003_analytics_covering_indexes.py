@@ -0,0 +1,58 @@
+"""covering indexes for the retail analytics queries
+
+Every analytics query filters transactions on status and a date range and
+joins items by transaction or product. These composite indexes carry the
+columns the aggregates read, so the scans are served from the index alone.
+
+Revision ID: 0003_analytics_covering_indexes
+Revises: 0002_sales_rollups_calendar
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_analytics_covering_indexes"
+down_revision: Union[str, None] = "0002_sales_rollups_calendar"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    (
+        "ix_transactions_status_date_covering", "transactions",
+        ["status", "transaction_date", "store_id", "customer_id", "total_amount"],
+    ),
+    (
+        "ix_transaction_items_tx_product_covering", "transaction_items",
+        ["transaction_id", "product_id", "quantity", "total_price"],
+    ),
+    (
+        "ix_transaction_items_product_tx_covering", "transaction_items",
+        ["product_id", "transaction_id", "quantity", "total_price"],
+    ),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {ix["name"] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        # MySQL drops its implicit foreign key indexes once a covering index
+        # can stand in for them; restore them before removing the covering ones
+        inspector = sa.inspect(op.get_bind())
+        existing = {ix["name"] for ix in inspector.get_indexes("transaction_items")}
+        for column in ("transaction_id", "product_id"):
+            name = f"ix_transaction_items_{column}"
+            if name not in existing:
+                op.create_index(name, "transaction_items", [column])
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
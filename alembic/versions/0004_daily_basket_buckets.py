@@ -0,0 +1,43 @@
+"""basket-size quantile sketch per store and day
+
+Run ``python rebuild_sales_rollup.py`` afterwards to fill the sketch for
+existing transactions.
+
+Revision ID: 0004_daily_basket_buckets
+Revises: 0003_analytics_covering_indexes
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_daily_basket_buckets"
+down_revision: Union[str, None] = "0003_analytics_covering_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "daily_basket_buckets" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "daily_basket_buckets",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sales_date", sa.Date(), nullable=False),
+        sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id"), nullable=False),
+        sa.Column("bucket_index", sa.Integer(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "sales_date", "store_id", "bucket_index", name="uq_daily_basket_buckets"
+        ),
+    )
+    op.create_index("ix_daily_basket_buckets_id", "daily_basket_buckets", ["id"])
+    op.create_index("ix_daily_basket_buckets_sales_date", "daily_basket_buckets", ["sales_date"])
+
+
+def downgrade() -> None:
+    op.drop_table("daily_basket_buckets")
@@ -0,0 +1,55 @@
+"""precomputed customer RFM segments
+
+Run ``python refresh_customer_segments.py`` afterwards to score existing
+customers.
+
+Revision ID: 0005_customer_segments
+Revises: 0004_daily_basket_buckets
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_customer_segments"
+down_revision: Union[str, None] = "0004_daily_basket_buckets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "customer_segments" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "customer_segments",
+        sa.Column(
+            "customer_id", sa.Integer(), sa.ForeignKey("customers.id"),
+            primary_key=True, autoincrement=False
+        ),
+        sa.Column("frequency", sa.Integer(), nullable=False),
+        sa.Column("monetary", sa.Float(), nullable=False),
+        sa.Column("first_purchase_date", sa.Date()),
+        sa.Column("last_purchase_date", sa.Date()),
+        sa.Column("r_score", sa.Integer(), nullable=False),
+        sa.Column("f_score", sa.Integer(), nullable=False),
+        sa.Column("m_score", sa.Integer(), nullable=False),
+        sa.Column("segment", sa.String(30), nullable=False),
+        sa.Column("clv", sa.Float(), nullable=False),
+        sa.Column("loyalty_score", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_customer_segments_loyalty", "customer_segments", ["loyalty_score", "customer_id"]
+    )
+    op.create_index(
+        "ix_customer_segments_segment_loyalty", "customer_segments",
+        ["segment", "loyalty_score", "customer_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("customer_segments")
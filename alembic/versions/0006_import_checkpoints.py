@@ -0,0 +1,37 @@
+"""checkpoints for resumable POS history imports
+
+Revision ID: 0006_import_checkpoints
+Revises: 0005_customer_segments
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_import_checkpoints"
+down_revision: Union[str, None] = "0005_customer_segments"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "import_checkpoints" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "import_checkpoints",
+        sa.Column("source_key", sa.String(40), primary_key=True),
+        sa.Column("source", sa.String(500), nullable=False),
+        sa.Column("rows_read", sa.Integer(), nullable=False),
+        sa.Column("first_day", sa.Date()),
+        sa.Column("last_day", sa.Date()),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("import_checkpoints")
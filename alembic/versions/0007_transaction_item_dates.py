@@ -0,0 +1,54 @@
+"""copy the transaction date onto transaction items
+
+Items carry their transaction's date so both tables can be RANGE
+partitioned on it and pruned by the same window. Partitioning itself
+rebuilds the tables and is run separately with
+``python manage_partitions.py init`` (MySQL only).
+
+Revision ID: 0007_transaction_item_dates
+Revises: 0006_import_checkpoints
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_transaction_item_dates"
+down_revision: Union[str, None] = "0006_import_checkpoints"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {c["name"] for c in sa.inspect(bind).get_columns("transaction_items")}
+    if "transaction_date" in columns:
+        return
+
+    op.add_column(
+        "transaction_items", sa.Column("transaction_date", sa.DateTime(timezone=True), nullable=True)
+    )
+    if bind.dialect.name == "mysql":
+        op.execute(
+            "UPDATE transaction_items ti JOIN transactions t ON t.id = ti.transaction_id "
+            "SET ti.transaction_date = t.transaction_date"
+        )
+    else:
+        op.execute(
+            "UPDATE transaction_items SET transaction_date = ("
+            "SELECT transactions.transaction_date FROM transactions "
+            "WHERE transactions.id = transaction_items.transaction_id)"
+        )
+    with op.batch_alter_table("transaction_items") as batch:
+        batch.alter_column(
+            "transaction_date", existing_type=sa.DateTime(timezone=True), nullable=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("transaction_items") as batch:
+        batch.drop_column("transaction_date")
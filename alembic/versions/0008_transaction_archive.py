@@ -0,0 +1,59 @@
+"""manifest and customer totals for the transaction archive
+
+Old months of transactions are moved to compressed column files by
+``python archive_transactions.py``; these tables record the files and keep
+the per-customer purchase totals RFM needs from the archived rows.
+
+Revision ID: 0008_transaction_archive
+Revises: 0007_transaction_item_dates
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_transaction_archive"
+down_revision: Union[str, None] = "0007_transaction_item_dates"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if "archive_segments" not in tables:
+        op.create_table(
+            "archive_segments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("month", sa.Date(), nullable=False),
+            sa.Column("path", sa.String(500), nullable=False, unique=True),
+            sa.Column("transaction_count", sa.Integer(), nullable=False),
+            sa.Column("item_count", sa.Integer(), nullable=False),
+            sa.Column("total_sales", sa.Float(), nullable=False),
+            sa.Column("first_transaction_id", sa.Integer(), nullable=False),
+            sa.Column("last_transaction_id", sa.Integer(), nullable=False),
+            sa.Column("file_bytes", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_archive_segments_id", "archive_segments", ["id"])
+        op.create_index("ix_archive_segments_month", "archive_segments", ["month"])
+    if "archived_customer_totals" not in tables:
+        op.create_table(
+            "archived_customer_totals",
+            sa.Column(
+                "customer_id", sa.Integer(), sa.ForeignKey("customers.id"),
+                primary_key=True, autoincrement=False
+            ),
+            sa.Column("frequency", sa.Integer(), nullable=False),
+            sa.Column("monetary", sa.Float(), nullable=False),
+            sa.Column("first_date_key", sa.Integer(), nullable=False),
+            sa.Column("last_date_key", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("archived_customer_totals")
+    op.drop_table("archive_segments")
@@ -0,0 +1,28 @@
+"""index transactions on (transaction_date, id) for keyset pagination
+
+Revision ID: 0009_transaction_date_id_index
+Revises: 0008_transaction_archive
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_transaction_date_id_index"
+down_revision: Union[str, None] = "0008_transaction_archive"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("transactions")}
+    if "ix_transactions_date_id" not in indexes:
+        op.create_index("ix_transactions_date_id", "transactions", ["transaction_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_date_id", table_name="transactions")
@@ -0,0 +1,47 @@
+"""commit-ordered change sequence on transactions
+
+``data_versions`` holds one counter per data set; every write to
+``transactions`` bumps it and stamps the value into ``change_seq``, so the
+columnar engine catches up on exactly the rows committed since it last
+looked. Existing rows are stamped 0.
+
+Revision ID: 0010_transaction_change_seq
+Revises: 0009_transaction_date_id_index
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_transaction_change_seq"
+down_revision: Union[str, None] = "0009_transaction_date_id_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "data_versions" not in inspector.get_table_names():
+        data_versions = op.create_table(
+            "data_versions",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+        )
+        op.bulk_insert(data_versions, [{"name": "transactions", "version": 0}])
+
+    columns = {c["name"] for c in inspector.get_columns("transactions")}
+    if "change_seq" not in columns:
+        op.add_column("transactions", sa.Column("change_seq", sa.BigInteger(), nullable=True))
+        op.execute("UPDATE transactions SET change_seq = 0")
+        op.create_index("ix_transactions_change_seq", "transactions", ["change_seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_change_seq", table_name="transactions")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("change_seq")
+    op.drop_table("data_versions")
@@ -0,0 +1,41 @@
+"""transaction code lookup table
+
+Partitioning ``transactions`` by date widens its code key with the date, so
+``transaction_codes`` (unpartitioned, keyed by code) keeps codes unique and
+maps each one to its transaction. Filled from the existing transactions.
+
+Revision ID: 0011_transaction_codes
+Revises: 0010_transaction_change_seq
+Create Date: 2026-10-17 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_transaction_codes"
+down_revision: Union[str, None] = "0010_transaction_change_seq"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "transaction_codes" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "transaction_codes",
+        sa.Column("transaction_code", sa.String(100), primary_key=True),
+        sa.Column("transaction_id", sa.Integer(), nullable=False),
+        sa.Column("transaction_date", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO transaction_codes (transaction_code, transaction_id, transaction_date) "
+        "SELECT transaction_code, id, transaction_date FROM transactions"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_codes")
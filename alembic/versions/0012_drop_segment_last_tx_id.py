@@ -0,0 +1,41 @@
+"""drop customer_segments.last_transaction_id
+
+RFM refreshes track new purchases by ``change_seq`` (see 0010), so the
+per-customer newest transaction id and its index are no longer read.
+Databases created from the current 0005 never had the column.
+
+Revision ID: 0012_drop_segment_last_tx_id
+Revises: 0011_transaction_codes
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012_drop_segment_last_tx_id"
+down_revision: Union[str, None] = "0011_transaction_codes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    indexes = {i["name"] for i in inspector.get_indexes("customer_segments")}
+    if "ix_customer_segments_last_transaction_id" in indexes:
+        op.drop_index("ix_customer_segments_last_transaction_id", table_name="customer_segments")
+    columns = {c["name"] for c in inspector.get_columns("customer_segments")}
+    if "last_transaction_id" in columns:
+        with op.batch_alter_table("customer_segments") as batch:
+            batch.drop_column("last_transaction_id")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("customer_segments") as batch:
+        batch.add_column(sa.Column("last_transaction_id", sa.Integer(), nullable=False, server_default="0"))
+    op.create_index(
+        "ix_customer_segments_last_transaction_id", "customer_segments", ["last_transaction_id"]
+    )
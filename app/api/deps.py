@@ -1,12 +1,18 @@
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+from typing import Any, Callable, Optional
+from fastapi import Depends, Header, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from app.core.compression import SCOPE_KEY as COMPRESSION_SCOPE_KEY
 from app.core.config import settings
+from app.core.pagination import MAX_PAGE_SIZE
+from app.core.responses import json_bytes
 from app.core.security import decode_token
+from app.core.tabular import negotiate, pa
+from app.crud.profiles import EXPAND_DESCRIPTION, FIELDS_DESCRIPTION, FieldSelection, LoadProfile
 from app.db.base import get_db
 from app.models.user import User
+from app.schemas.pagination import CursorPage
 from app.schemas.user import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -55,4 +61,70 @@ async def get_current_superuser(
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+def cursor_page(get_page: Callable[..., Any], *args, limit: int, **kwargs) -> CursorPage:
+    """Call a ``(rows, next_cursor)`` page reader and wrap its result for the response.
+
+    Bad limits and malformed cursors become 400 responses.
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    try:
+        items, next_cursor = get_page(*args, limit=limit, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CursorPage(items=items, next_cursor=next_cursor)
+
+
+def field_selection(profile: LoadProfile) -> Callable[..., FieldSelection]:
+    """Dependency reading ``expand``/``fields`` for an endpoint serving ``profile``.
+    
+    Unknown relations or fields become 400 responses.
+    """
+    def dependency(
+        expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    ) -> FieldSelection:
+        try:
+            return profile.select(expand, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return dependency
+
+
+def render(selection: FieldSelection, result: Any) -> Any:
+    """Return a list or cursor page of response models, trimmed to the requested ``fields``.
+    
+    Trimmed responses, and every response with FAST_JSON_RESPONSES, are
+    encoded here by the schema's compiled serializer, bypassing the route's
+    response model (which would also fill left-out fields back in).
+    """
+    if selection.include is None and not settings.FAST_JSON_RESPONSES:
+        return result
+    return json_bytes(selection.dump_json(result))
+
+
+def tabular_format(accept: Optional[str] = Header(None)) -> Optional[str]:
+    """Dependency picking an Arrow IPC or Parquet response from ``Accept``, None for JSON.
+    
+    Answers 406 when a tabular format is preferred but pyarrow is not installed.
+    """
+    media_type = negotiate(accept)
+    if media_type is not None and pa is None:
+        raise HTTPException(status_code=406, detail="Arrow and Parquet responses need pyarrow on the server")
+    return media_type
+
+
+def compression(
+    gzip_level: Optional[int] = None, brotli_quality: Optional[int] = None, enabled: bool = True
+) -> Callable[[Request], None]:
+    """Route dependency setting the compression of its responses.
+    
+    Levels left as None use COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY;
+    ``enabled=False`` sends the route's responses uncompressed.
+    """
+    def dependency(request: Request) -> None:
+        request.scope[COMPRESSION_SCOPE_KEY] = (enabled, gzip_level, brotli_quality)
+    return dependency
@@ -4,16 +4,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract, and_
-from typing import List, Optional
+from typing import List, Optional, Union
+from operator import attrgetter
 from datetime import date, datetime, timedelta
 import calendar
 
+from app.api.deps import cursor_page, render, tabular_format
+from app.core.pagination import CURSOR_DESCRIPTION, keyset_page
+from app.core.tabular import TABULAR_RESPONSES, query_batches, rows_batch, tabular_response
+from app.crud.profiles import analytics_transaction_profile
 from app.db.base import get_db
 from app.models.analytics import Transaction, Product, Geography, AnalyticsSummary
 from app.schemas.analytics import (
     DashboardMetrics, SalesTrend, CategorySales, TopProduct,
-    TransactionResponse, GeographyResponse, TransactionCreate
+    TransactionResponse, GeographyAnalytics, TransactionCreate
 )
+from app.schemas.pagination import CursorPage
 
 router = APIRouter(tags=["analytics"])
 
@@ -181,7 +187,7 @@ async def get_top_products(
     
     return products
 
-@router.get("/geography", response_model=List[GeographyResponse])
+@router.get("/geography", response_model=List[GeographyAnalytics])
 async def get_geography_analytics(
     limit: int = Query(10, description="Number of locations to return"),
     db: Session = Depends(get_db)
@@ -209,7 +215,7 @@ async def get_geography_analytics(
     for result in results:
         avg_order_value = result.total_sales / result.total_orders if result.total_orders > 0 else 0
         
-        locations.append(GeographyResponse(
+        locations.append(GeographyAnalytics(
             region=result.region,
             city=result.city,
             total_sales=result.total_sales or 0.0,
@@ -220,17 +226,29 @@ async def get_geography_analytics(
     
     return locations
 
-@router.get("/transactions", response_model=List[TransactionResponse])
+@router.get(
+    "/transactions",
+    response_model=Union[CursorPage[TransactionResponse], List[TransactionResponse]],
+    responses=TABULAR_RESPONSES
+)
 async def get_transactions(
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     skip: int = Query(0, description="Number of records to skip"),
     limit: int = Query(100, description="Number of records to return"),
     category: Optional[str] = Query(None, description="Filter by category"),
     region: Optional[str] = Query(None, description="Filter by region"),
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
+    media_type: Optional[str] = Depends(tabular_format),
     db: Session = Depends(get_db)
 ):
-    """Get transaction data with filters"""
+    """Get transaction data with filters
+    
+    With an Arrow or Parquet ``Accept`` the rows come back as one table,
+    streamed a fetch batch at a time; a cursor page's next cursor is then
+    sent in the X-Next-Cursor header. Only cursor pages are capped at
+    MAX_PAGE_SIZE.
+    """
     
     query = db.query(Transaction)
     
@@ -243,9 +261,32 @@ async def get_transactions(
     if end_date:
         query = query.filter(Transaction.order_date <= end_date)
     
-    transactions = query.offset(skip).limit(limit).all()
+    if media_type is not None:
+        query = query.with_entities(*(getattr(Transaction, name) for name in TransactionResponse.model_fields))
+        if cursor is None:
+            return tabular_response(
+                query_batches(query.offset(skip).limit(limit), TransactionResponse), TransactionResponse, media_type
+            )
+        page = cursor_page(
+            keyset_page, query, [(Transaction.order_date, False), (Transaction.id, False)],
+            cursor=cursor, limit=limit, key=attrgetter("order_date", "id")
+        )
+        headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+        return tabular_response(
+            [rows_batch(page.items, TransactionResponse)], TransactionResponse, media_type, headers=headers
+        )
     
-    return transactions
+    if cursor is not None:
+        # Keyed on (order_date, id); the order_date index already ends in the id
+        return render(analytics_transaction_profile.select(), cursor_page(
+            keyset_page, query, [(Transaction.order_date, False), (Transaction.id, False)],
+            cursor=cursor, limit=limit, key=attrgetter("order_date", "id"),
+            fetch=analytics_transaction_profile.project
+        ))
+    return render(
+        analytics_transaction_profile.select(),
+        analytics_transaction_profile.project(query.offset(skip).limit(limit))
+    )
 
 @router.post("/transactions", response_model=TransactionResponse)
 async def create_transaction(
@@ -7,11 +7,12 @@ from typing import Optional, List, Dict, Any, Union
 import sqlite3
 import logging
 from datetime import datetime
-from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.responses import model_response
 from app.models.user import User
 from app.api import deps
+from app.schemas.ph_awards import AwardPredictionRequest, CampaignSearchRequest, PHAwardsResponse
 
 logger = logging.getLogger(__name__)
 
@@ -27,22 +28,6 @@ except Exception as e:
 
 router = APIRouter()
 
-# Pydantic models
-class CampaignSearchRequest(BaseModel):
-    query: Optional[str] = ""
-    filters: Optional[Dict[str, Any]] = {}
-    limit: Optional[int] = 10
-    offset: Optional[int] = 0
-
-class AwardPredictionRequest(BaseModel):
-    campaign_text: str
-
-class PHAwardsResponse(BaseModel):
-    success: bool
-    data: Any
-    timestamp: str
-    message: Optional[str] = None
-
 # Database connection helper
 def get_ph_awards_db():
     """Get SQLite database connection for PH Awards data"""
@@ -191,7 +176,7 @@ async def search_campaigns(
         
         conn.close()
         
-        return PHAwardsResponse(
+        return model_response(PHAwardsResponse(
             success=True,
             data={
                 "campaigns": campaigns,
@@ -204,7 +189,7 @@ async def search_campaigns(
                 "filters_applied": request.filters
             },
             timestamp=datetime.utcnow().isoformat()
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Campaign search error: {e}")
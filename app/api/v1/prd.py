@@ -1,11 +1,12 @@
 # routers/prd.py
 # PRD (Product Requirements Document) endpoints for Render backend
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import Dict, Any
 import os
 from datetime import datetime
 
+from app.core.compression import model_payload
 from app.schemas.analytics import PRDDocument, PRDSection, PRDSummary, ImplementationStatus
 
 router = APIRouter(tags=["documentation"])
@@ -145,10 +146,10 @@ curl -X POST https://gagambi-backend.onrender.com/api/v1/auth/login \\
 **Deployed on Render Cloud Platform**
 """
 
-@router.get("/", response_model=PRDDocument)
-async def get_prd_document():
-    """Get the complete PRD document"""
-    
+# The documents below only change with a deploy, so each is encoded and
+# compressed once at startup and served from memory
+
+def _prd_document() -> PRDDocument:
     return PRDDocument(
         title="Scout Analytics Dashboard PRD v4.0",
         version="4.0",
@@ -180,10 +181,15 @@ async def get_prd_document():
         }
     )
 
-@router.get("/summary", response_model=PRDSummary)
-async def get_prd_summary():
-    """Get a summary of the PRD document"""
+_DOCUMENT = model_payload(PRDDocument, _prd_document())
+
+@router.get("/", response_model=PRDDocument)
+async def get_prd_document(request: Request):
+    """Get the complete PRD document"""
     
+    return _DOCUMENT.response(request.headers.get("accept-encoding"))
+
+def _prd_summary() -> PRDSummary:
     return PRDSummary(
         document={
             "title": "Scout Analytics Dashboard",
@@ -227,10 +233,15 @@ async def get_prd_summary():
         }
     )
 
-@router.get("/sections/{section_name}", response_model=PRDSection)
-async def get_prd_section(section_name: str):
-    """Get a specific section of the PRD"""
+_SUMMARY = model_payload(PRDSummary, _prd_summary())
+
+@router.get("/summary", response_model=PRDSummary)
+async def get_prd_summary(request: Request):
+    """Get a summary of the PRD document"""
     
+    return _SUMMARY.response(request.headers.get("accept-encoding"))
+
+def _prd_sections() -> Dict[str, PRDSection]:
     sections = {
         "executive-summary": {
             "title": "Executive Summary",
@@ -297,22 +308,27 @@ Analytics Summary:
         }
     }
     
-    if section_name not in sections:
-        raise HTTPException(status_code=404, detail="Section not found")
+    return {
+        section_name: PRDSection(
+            section=section_name,
+            title=section_data["title"],
+            content=section_data["content"],
+            format="markdown"
+        ) for section_name, section_data in sections.items()
+    }
+
+_SECTIONS = {name: model_payload(PRDSection, section) for name, section in _prd_sections().items()}
+
+@router.get("/sections/{section_name}", response_model=PRDSection)
+async def get_prd_section(section_name: str, request: Request):
+    """Get a specific section of the PRD"""
     
-    section_data = sections[section_name]
+    if section_name not in _SECTIONS:
+        raise HTTPException(status_code=404, detail="Section not found")
     
-    return PRDSection(
-        section=section_name,
-        title=section_data["title"],
-        content=section_data["content"],
-        format="markdown"
-    )
+    return _SECTIONS[section_name].response(request.headers.get("accept-encoding"))
 
-@router.get("/implementation-status", response_model=ImplementationStatus)
-async def get_implementation_status():
-    """Get current implementation status"""
-    
+def _implementation_status() -> ImplementationStatus:
     return ImplementationStatus(
         overall_status="production",
         services={
@@ -353,4 +369,12 @@ async def get_implementation_status():
             "Set up monitoring dashboards",
             "Implement caching layer"
         ]
-    )
\ No newline at end of file
+    )
+
+_IMPLEMENTATION_STATUS = model_payload(ImplementationStatus, _implementation_status())
+
+@router.get("/implementation-status", response_model=ImplementationStatus)
+async def get_implementation_status(request: Request):
+    """Get current implementation status"""
+    
+    return _IMPLEMENTATION_STATUS.response(request.headers.get("accept-encoding"))
\ No newline at end of file
@@ -1,40 +1,80 @@
-from typing import List, Optional
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query
+from concurrent.futures import TimeoutError
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Union
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import compression, cursor_page, field_selection, get_db, render, tabular_format
+from app.core.calendar import default_window
+from app.core.compression import model_payload
+from app.core.config import settings
+from app.core.pagination import CURSOR_DESCRIPTION
+from app.core.tabular import TABULAR_RESPONSES, columns_batch, tabular_response
 from app.crud import retail as crud
+from app.crud.columnar import columnar_analytics
+from app.crud.export import EXPORT_FORMATS, transaction_export
+from app.crud.group_commit import transaction_group_commit
+from app.crud.profiles import (
+    FieldSelection, city_profile, customer_profile, product_profile, province_profile, store_profile,
+    transaction_profile
+)
+from app.crud.rfm import customer_segment
 from app.schemas import retail as schemas
+from app.schemas.pagination import CursorPage
 
 router = APIRouter()
 
+# Longest NDJSON record buffered while waiting for its newline
+MAX_NDJSON_LINE_BYTES = 1 << 20
+
+
+def _analytics_engine(engine: str):
+    if engine == "sql":
+        return crud.analytics
+    if engine == "columnar":
+        return columnar_analytics
+    raise HTTPException(status_code=400, detail="Unknown analytics engine")
+
+
+def _reference_list(request: Request, name: str, response_type, load: Callable[[], list]) -> Response:
+    """A reference-data list served from its precompressed payload, loaded on a miss."""
+    found, payload = crud.reference_payloads.get(name)
+    if not found:
+        payload = model_payload(response_type, load())
+        crud.reference_payloads.set(name, payload)
+    return payload.response(request.headers.get("accept-encoding"))
+
+
 # Geography endpoints
 @router.get("/geography/regions", response_model=List[schemas.Region])
-def get_regions(db: Session = Depends(get_db)):
+def get_regions(request: Request, db: Session = Depends(get_db)):
     """Get all regions."""
-    return crud.region.get_all(db)
+    return _reference_list(request, "regions", List[schemas.Region], lambda: crud.region.get_all(db))
 
 
 @router.get("/geography/provinces", response_model=List[schemas.Province])
 def get_provinces(
     region_id: Optional[int] = Query(None, description="Filter by region ID"),
+    selection: FieldSelection = Depends(field_selection(province_profile)),
     db: Session = Depends(get_db)
 ):
     """Get provinces, optionally filtered by region."""
     if region_id:
-        return crud.province.get_by_region(db, region_id=region_id)
+        return render(selection, crud.province.get_by_region(db, region_id=region_id, expand=selection.expand))
     return []
 
 
 @router.get("/geography/cities", response_model=List[schemas.City])
 def get_cities(
     province_id: Optional[int] = Query(None, description="Filter by province ID"),
+    selection: FieldSelection = Depends(field_selection(city_profile)),
     db: Session = Depends(get_db)
 ):
     """Get cities, optionally filtered by province."""
     if province_id:
-        return crud.city.get_by_province(db, province_id=province_id)
+        return render(selection, crud.city.get_by_province(db, province_id=province_id, expand=selection.expand))
     return []
 
 
@@ -42,108 +82,133 @@ def get_cities(
 @router.get("/stores/by-region", response_model=List[schemas.Store])
 def get_stores_by_region(
     region_id: Optional[int] = Query(None, description="Filter by region ID"),
+    selection: FieldSelection = Depends(field_selection(store_profile)),
     db: Session = Depends(get_db)
 ):
     """Get stores by region."""
     if region_id:
-        return crud.store.get_by_region(db, region_id=region_id)
-    return crud.store.get_all(db)
+        return render(selection, crud.store.get_by_region(db, region_id=region_id, expand=selection.expand))
+    return render(selection, crud.store.get_all(db, expand=selection.expand))
 
 
-@router.get("/stores/performance", response_model=List[schemas.StorePerformance])
+@router.get(
+    "/stores/performance", response_model=List[schemas.StorePerformance], responses=TABULAR_RESPONSES
+)
 def get_store_performance(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
+    media_type: Optional[str] = Depends(tabular_format),
     db: Session = Depends(get_db)
 ):
-    """Get store performance metrics."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    """Get store performance metrics, as JSON or (per ``Accept``) an Arrow stream or Parquet file."""
+    start_date, end_date = default_window(start_date, end_date)
+    analytics = _analytics_engine(engine)
     
-    return crud.analytics.get_store_performance(db, start_date=start_date, end_date=end_date)
+    if media_type is None:
+        return analytics.get_store_performance(db, start_date=start_date, end_date=end_date)
+    columns = analytics.get_store_performance_columns(db, start_date=start_date, end_date=end_date)
+    return tabular_response([columns_batch(columns, schemas.StorePerformance)], schemas.StorePerformance, media_type)
 
 
 # Sales analytics endpoints
 @router.get("/sales/by-region", response_model=List[schemas.SalesByRegion])
 def get_sales_by_region(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get sales data aggregated by region."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_sales_by_region(db, start_date=start_date, end_date=end_date)
+    return _analytics_engine(engine).get_sales_by_region(db, start_date=start_date, end_date=end_date)
 
 
 @router.get("/sales/by-brand", response_model=List[schemas.SalesByBrand])
 def get_sales_by_brand(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get sales data aggregated by brand."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_sales_by_brand(db, start_date=start_date, end_date=end_date)
+    return _analytics_engine(engine).get_sales_by_brand(db, start_date=start_date, end_date=end_date)
 
 
 @router.get("/sales/by-category", response_model=List[schemas.SalesByCategory])
 def get_sales_by_category(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get sales data aggregated by category."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_sales_by_category(db, start_date=start_date, end_date=end_date)
+    return _analytics_engine(engine).get_sales_by_category(db, start_date=start_date, end_date=end_date)
 
 
-@router.get("/sales/trends", response_model=List[schemas.SalesTrend])
+@router.get("/sales/trends", response_model=List[schemas.SalesTrend], responses=TABULAR_RESPONSES)
 def get_sales_trends(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
-    granularity: str = Query("day", description="Granularity: day, week, month"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    granularity: str = Query("day", description="Granularity: day, week, month, quarter, year"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
+    media_type: Optional[str] = Depends(tabular_format),
     db: Session = Depends(get_db)
 ):
-    """Get sales trends over time."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    """Get sales trends over time, as JSON or (per ``Accept``) an Arrow stream or Parquet file."""
+    start_date, end_date = default_window(start_date, end_date)
+    analytics = _analytics_engine(engine)
     
-    return crud.analytics.get_sales_trends(
+    if media_type is None:
+        return analytics.get_sales_trends(
+            db, start_date=start_date, end_date=end_date, granularity=granularity
+        )
+    columns = analytics.get_sales_trend_columns(
         db, start_date=start_date, end_date=end_date, granularity=granularity
     )
+    return tabular_response([columns_batch(columns, schemas.SalesTrend)], schemas.SalesTrend, media_type)
+
+
+@router.get("/dashboard", response_model=schemas.RetailDashboard)
+def get_dashboard(
+    start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    limit: int = Query(10, description="Number of top products to return"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
+    db: Session = Depends(get_db)
+):
+    """Get region, brand, category, top product and summary figures in one call."""
+    start_date, end_date = default_window(start_date, end_date)
+    
+    return _analytics_engine(engine).get_dashboard(
+        db, start_date=start_date, end_date=end_date, limit=limit
+    )
+
+
+@router.get("/analytics/cache-stats", response_model=schemas.AnalyticsCacheStats)
+def get_analytics_cache_stats():
+    """Get hit/miss counters of the analytics result cache."""
+    return crud.analytics.stats()
 
 
 # Product endpoints
 @router.get("/products/top-selling", response_model=List[schemas.TopSellingProduct])
 def get_top_selling_products(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
     limit: int = Query(10, description="Number of top products to return"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get top selling products."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_top_selling_products(
+    return _analytics_engine(engine).get_top_selling_products(
         db, start_date=start_date, end_date=end_date, limit=limit
     )
 
@@ -151,74 +216,69 @@ def get_top_selling_products(
 @router.get("/products/by-category", response_model=List[schemas.Product])
 def get_products_by_category(
     category_id: int = Query(..., description="Category ID"),
+    selection: FieldSelection = Depends(field_selection(product_profile)),
     db: Session = Depends(get_db)
 ):
     """Get products by category."""
-    return crud.product.get_by_category(db, category_id=category_id)
+    return render(selection, crud.product.get_by_category(db, category_id=category_id, expand=selection.expand))
 
 
 @router.get("/products/brand-performance", response_model=List[schemas.SalesByBrand])
 def get_brand_performance(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get brand performance metrics."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_sales_by_brand(db, start_date=start_date, end_date=end_date)
+    return _analytics_engine(engine).get_sales_by_brand(db, start_date=start_date, end_date=end_date)
 
 
 # Transaction endpoints
 @router.get("/transactions/summary", response_model=schemas.TransactionSummary)
 def get_transaction_summary(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    exact: bool = Query(False, description="Count distinct customers and products exactly"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get transaction summary statistics."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_transaction_summary(db, start_date=start_date, end_date=end_date)
+    return _analytics_engine(engine).get_transaction_summary(
+        db, start_date=start_date, end_date=end_date, exact=exact
+    )
 
 
 @router.get("/transactions/trends", response_model=List[schemas.SalesTrend])
 def get_transaction_trends(
     start_date: Optional[datetime] = Query(None, description="Start date for analysis"),
-    end_date: Optional[datetime] = Query(None, description="End date for analysis"),
-    granularity: str = Query("day", description="Granularity: day, week, month"),
+    end_date: Optional[datetime] = Query(None, description="End of the analysis window (exclusive)"),
+    granularity: str = Query("day", description="Granularity: day, week, month, quarter, year"),
+    engine: str = Query("sql", description="Analytics engine: sql or columnar"),
     db: Session = Depends(get_db)
 ):
     """Get transaction trends over time."""
-    if not start_date:
-        start_date = datetime.utcnow() - timedelta(days=30)
-    if not end_date:
-        end_date = datetime.utcnow()
+    start_date, end_date = default_window(start_date, end_date)
     
-    return crud.analytics.get_sales_trends(
+    return _analytics_engine(engine).get_sales_trends(
         db, start_date=start_date, end_date=end_date, granularity=granularity
     )
 
 
 # CRUD endpoints for data management
+# Reference data is upserted by its code, so posting the same record twice
+# updates it instead of failing
 @router.post("/regions", response_model=schemas.Region)
 def create_region(
     region: schemas.RegionCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new region."""
-    # Check if region code already exists
-    existing = crud.region.get_by_code(db, code=region.code)
-    if existing:
-        raise HTTPException(status_code=400, detail="Region code already exists")
-    
-    return crud.region.create(db, obj_in=region)
+    """Create a region, or update the region with the same code."""
+    return crud.region.upsert(db, obj_in=region)
 
 
 @router.post("/stores", response_model=schemas.Store)
@@ -226,8 +286,8 @@ def create_store(
     store: schemas.StoreCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new store."""
-    return crud.store.create(db, obj_in=store)
+    """Create a store, or update the store with the same code."""
+    return crud.store.upsert(db, obj_in=store)
 
 
 @router.post("/brands", response_model=schemas.Brand)
@@ -235,8 +295,18 @@ def create_brand(
     brand: schemas.BrandCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new brand."""
-    return crud.brand.create(db, obj_in=brand)
+    """Create a brand, or update the brand with the same code."""
+    return crud.brand.upsert(db, obj_in=brand)
+
+
+@router.post("/brands/bulk", response_model=schemas.BulkUpsertResponse)
+def upsert_brands(
+    brands: List[schemas.BrandCreate],
+    db: Session = Depends(get_db)
+):
+    """Create or update many brands by code."""
+    ids = crud.brand.upsert_many(db, objs_in=brands)
+    return schemas.BulkUpsertResponse(upserted=len(ids), ids=ids)
 
 
 @router.post("/categories", response_model=schemas.Category)
@@ -244,8 +314,18 @@ def create_category(
     category: schemas.CategoryCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new category."""
-    return crud.category.create(db, obj_in=category)
+    """Create a category, or update the category with the same code."""
+    return crud.category.upsert(db, obj_in=category)
+
+
+@router.post("/categories/bulk", response_model=schemas.BulkUpsertResponse)
+def upsert_categories(
+    categories: List[schemas.CategoryCreate],
+    db: Session = Depends(get_db)
+):
+    """Create or update many categories by code."""
+    ids = crud.category.upsert_many(db, objs_in=categories)
+    return schemas.BulkUpsertResponse(upserted=len(ids), ids=ids)
 
 
 @router.post("/products", response_model=schemas.Product)
@@ -253,8 +333,18 @@ def create_product(
     product: schemas.ProductCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new product."""
-    return crud.product.create(db, obj_in=product)
+    """Create a product, or update the product with the same SKU."""
+    return crud.product.upsert(db, obj_in=product)
+
+
+@router.post("/products/bulk", response_model=schemas.BulkUpsertResponse)
+def upsert_products(
+    products: List[schemas.ProductCreate],
+    db: Session = Depends(get_db)
+):
+    """Create or update many products by SKU, e.g. for a catalog sync."""
+    ids = crud.product.upsert_many(db, objs_in=products)
+    return schemas.BulkUpsertResponse(upserted=len(ids), ids=ids)
 
 
 @router.post("/customers", response_model=schemas.Customer)
@@ -262,13 +352,18 @@ def create_customer(
     customer: schemas.CustomerCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new customer."""
-    # Check if customer code already exists
-    existing = crud.customer.get_by_code(db, customer_code=customer.customer_code)
-    if existing:
-        raise HTTPException(status_code=400, detail="Customer code already exists")
-    
-    return crud.customer.create(db, obj_in=customer)
+    """Create a customer, or update the customer with the same code."""
+    return crud.customer.upsert(db, obj_in=customer)
+
+
+@router.post("/customers/bulk", response_model=schemas.BulkUpsertResponse)
+def upsert_customers(
+    customers: List[schemas.CustomerCreate],
+    db: Session = Depends(get_db)
+):
+    """Create or update many customers by customer code."""
+    ids = crud.customer.upsert_many(db, objs_in=customers)
+    return schemas.BulkUpsertResponse(upserted=len(ids), ids=ids)
 
 
 @router.post("/transactions", response_model=schemas.Transaction)
@@ -276,110 +371,208 @@ def create_transaction(
     transaction: schemas.TransactionCreate,
     db: Session = Depends(get_db)
 ):
-    """Create a new transaction with items."""
-    return crud.transaction.create(db, obj_in=transaction)
+    """Create a new transaction with items.
+    
+    With GROUP_COMMIT_ENABLED the transaction is queued and committed together
+    with concurrent requests; the response is sent once its batch is durable.
+    """
+    if not settings.GROUP_COMMIT_ENABLED:
+        return crud.transaction.create(db, obj_in=transaction)
+    
+    try:
+        result = transaction_group_commit.create(transaction)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Timed out waiting for the group commit; the transaction may still be committed, "
+                   "and retrying is safe because a duplicate transaction code is rejected"
+        )
+    if result.status != 'created':
+        raise HTTPException(status_code=400, detail=result.error)
+    return crud.transaction.get(db, id=result.id)
+
+
+@router.get("/transactions/group-commit-stats", response_model=schemas.GroupCommitStats)
+def get_group_commit_stats():
+    """Get queue depth, batch size and flush latency of the group commit queue."""
+    return transaction_group_commit.stats()
+
+
+@router.post("/transactions/bulk", response_model=schemas.BulkTransactionResponse)
+def create_transactions_bulk(
+    transactions: List[schemas.TransactionCreate],
+    chunk_size: int = Query(
+        settings.BULK_INSERT_CHUNK_SIZE, ge=1, le=5000,
+        description="Transactions per multi-row INSERT and commit"
+    ),
+    db: Session = Depends(get_db)
+):
+    """Create many transactions at once, reporting per-row status and ids."""
+    return crud.transaction.create_bulk(db, objs_in=transactions, chunk_size=chunk_size)
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Yield (line number, line) from the request body as it arrives.
+    
+    Lines longer than MAX_NDJSON_LINE_BYTES are dropped and yielded as None.
+    """
+    pending = bytearray()
+    line_number = 0
+    overflow = False
+    async for chunk in request.stream():
+        pending += chunk
+        while (end := pending.find(b"\n")) >= 0:
+            line_number += 1
+            yield line_number, None if overflow else bytes(pending[:end])
+            overflow = False
+            del pending[:end + 1]
+        if len(pending) > MAX_NDJSON_LINE_BYTES:
+            overflow = True
+            pending.clear()
+    if overflow or pending.strip():
+        yield line_number + 1, None if overflow else bytes(pending)
+
+
+@router.post("/transactions/stream", response_model=schemas.StreamIngestResponse)
+async def ingest_transactions_stream(
+    request: Request,
+    batch_size: int = Query(
+        settings.STREAM_INGEST_BATCH_SIZE, ge=1, le=5000,
+        description="Records written per batch"
+    ),
+    db: Session = Depends(get_db)
+):
+    """Ingest newline-delimited TransactionCreate records as the body streams in.
+    
+    The body is only read further once the previous batch is committed, so a
+    slow database pushes back on the upload instead of buffering it.
+    """
+    ingest = crud.TransactionStreamIngest(batch_size)
+    async for line_number, line in _ndjson_lines(request):
+        if ingest.add(line_number, line):
+            await run_in_threadpool(ingest.flush, db)
+    await run_in_threadpool(ingest.flush, db)
+    return ingest.report()
+
+
+# Exports run to gigabytes, so they trade ratio for compression speed
+@router.get("/transactions/export", dependencies=[Depends(compression(gzip_level=1, brotli_quality=1))])
+def export_transactions(
+    fmt: str = Query("csv", alias="format", description="Export format: csv or ndjson"),
+    start_date: Optional[datetime] = Query(None, description="Earliest transaction date"),
+    end_date: Optional[datetime] = Query(None, description="Latest transaction date"),
+    store_id: Optional[int] = Query(None, description="Filter by store ID"),
+    region_id: Optional[int] = Query(None, description="Filter by region ID"),
+    db: Session = Depends(get_db)
+):
+    """Stream transactions with their items, store, region, customer and product codes.
+    
+    CSV has one line per item; NDJSON one object per transaction with its
+    items nested. Rows come from a server-side cursor in date order. Months
+    moved to the cold archive are not included.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Unknown export format")
+    return StreamingResponse(
+        transaction_export.stream(
+            db, fmt, start_date=start_date, end_date=end_date, store_id=store_id, region_id=region_id
+        ),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{fmt}"'}
+    )
 
 
 # List endpoints
 @router.get("/brands", response_model=List[schemas.Brand])
-def get_brands(db: Session = Depends(get_db)):
+def get_brands(request: Request, db: Session = Depends(get_db)):
     """Get all brands."""
-    return crud.brand.get_all(db)
+    return _reference_list(request, "brands", List[schemas.Brand], lambda: crud.brand.get_all(db))
 
 
 @router.get("/categories", response_model=List[schemas.Category])
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(request: Request, db: Session = Depends(get_db)):
     """Get all categories."""
-    return crud.category.get_all(db)
+    return _reference_list(request, "categories", List[schemas.Category], lambda: crud.category.get_all(db))
 
 
-@router.get("/products", response_model=List[schemas.Product])
+@router.get(
+    "/products", response_model=Union[CursorPage[schemas.Product], List[schemas.Product]]
+)
 def get_products(
-    skip: int = Query(0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    skip: int = Query(0, description="Number of records to skip (offset mode)"),
     limit: int = Query(100, description="Maximum number of records to return"),
+    selection: FieldSelection = Depends(field_selection(product_profile)),
     db: Session = Depends(get_db)
 ):
-    """Get products with pagination."""
-    return crud.product.get_all(db, skip=skip, limit=limit)
+    """Get active products by id, one cursor page or (without ``cursor``) an offset list."""
+    if cursor is None:
+        return render(selection, crud.product.get_all(db, skip=skip, limit=limit, expand=selection.expand))
+    return render(selection, cursor_page(
+        crud.product.get_page, db, cursor=cursor, limit=limit, expand=selection.expand
+    ))
 
 
-@router.get("/customers", response_model=List[schemas.Customer])
+@router.get(
+    "/customers", response_model=Union[CursorPage[schemas.Customer], List[schemas.Customer]]
+)
 def get_customers(
-    skip: int = Query(0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    skip: int = Query(0, description="Number of records to skip (offset mode)"),
     limit: int = Query(100, description="Maximum number of records to return"),
+    selection: FieldSelection = Depends(field_selection(customer_profile)),
     db: Session = Depends(get_db)
 ):
-    """Get customers with pagination."""
-    return crud.customer.get_all(db, skip=skip, limit=limit)
+    """Get customers by id, one cursor page or (without ``cursor``) an offset list."""
+    if cursor is None:
+        return render(selection, crud.customer.get_all(db, skip=skip, limit=limit))
+    return render(selection, cursor_page(crud.customer.get_page, db, cursor=cursor, limit=limit))
 
 
-@router.get("/transactions", response_model=List[schemas.Transaction])
+@router.get(
+    "/transactions", response_model=Union[CursorPage[schemas.Transaction], List[schemas.Transaction]]
+)
 def get_transactions(
     days: int = Query(30, description="Number of recent days to fetch"),
-    skip: int = Query(0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    skip: int = Query(0, description="Number of records to skip (offset mode)"),
+    limit: int = Query(100, description="Maximum number of records to return"),
+    selection: FieldSelection = Depends(field_selection(transaction_profile)),
+    db: Session = Depends(get_db)
+):
+    """Get recent transactions newest first, one cursor page or (without ``cursor``) an offset list.
+    
+    Only the hot tables are listed; months moved to the cold archive are not.
+    """
+    if cursor is None:
+        return render(selection, crud.transaction.get_recent(
+            db, days=days, skip=skip, limit=limit, expand=selection.expand
+        ))
+    return render(selection, cursor_page(
+        crud.transaction.get_recent_page, db, days=days, cursor=cursor, limit=limit, expand=selection.expand
+    ))
+
+
+@router.get(
+    "/customers/rfm-segments",
+    response_model=Union[CursorPage[schemas.RFMSegment], List[schemas.RFMSegment]]
+)
+def get_rfm_segments(
+    segment: Optional[str] = Query(None, description="Filter by segment, e.g. Champions or At Risk"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    skip: int = Query(0, description="Number of records to skip (offset mode)"),
     limit: int = Query(100, description="Maximum number of records to return"),
     db: Session = Depends(get_db)
 ):
-    """Get recent transactions with pagination."""
-    return crud.transaction.get_recent(db, days=days, skip=skip, limit=limit)
-
-
-@router.get("/customers/rfm-segments", response_model=List[schemas.RFMSegment])
-def get_rfm_segments(db: Session = Depends(get_db)):
-    """Get customer RFM segmentation data for customer intelligence."""
-    # For now, return mock data that matches Scout Analytics expectations
-    # This will be replaced with real RFM calculation logic
-    mock_rfm_segments = [
-        {
-            "customer_id": "C001",
-            "customer_name": "Juan Dela Cruz",
-            "recency": 5,
-            "frequency": 15,
-            "monetary": 850000,
-            "segment": "Champions",
-            "clv": 2500000,
-            "loyalty_score": 95
-        },
-        {
-            "customer_id": "C002", 
-            "customer_name": "Maria Santos",
-            "recency": 12,
-            "frequency": 8,
-            "monetary": 450000,
-            "segment": "Loyal Customers", 
-            "clv": 1200000,
-            "loyalty_score": 78
-        },
-        {
-            "customer_id": "C003",
-            "customer_name": "Pedro Rodriguez", 
-            "recency": 25,
-            "frequency": 3,
-            "monetary": 120000,
-            "segment": "At Risk",
-            "clv": 350000,
-            "loyalty_score": 45
-        },
-        {
-            "customer_id": "C004",
-            "customer_name": "Ana Garcia",
-            "recency": 45,
-            "frequency": 2,
-            "monetary": 80000,
-            "segment": "Cannot Lose Them",
-            "clv": 180000,
-            "loyalty_score": 35
-        },
-        {
-            "customer_id": "C005",
-            "customer_name": "Luis Martinez",
-            "recency": 8,
-            "frequency": 12,
-            "monetary": 680000,
-            "segment": "Potential Loyalists",
-            "clv": 1800000,
-            "loyalty_score": 68
-        }
-    ]
+    """Get precomputed customer RFM segments, highest loyalty first.
     
-    return mock_rfm_segments
\ No newline at end of file
+    Answers 503 until refresh_customer_segments.py has run once.
+    """
+    if not customer_segment.computed(db):
+        raise HTTPException(
+            status_code=503,
+            detail="Customer segments have not been computed yet; run refresh_customer_segments.py"
+        )
+    if cursor is None:
+        return customer_segment.get_segments(db, segment=segment, skip=skip, limit=limit)
+    return cursor_page(customer_segment.get_segments_page, db, segment=segment, cursor=cursor, limit=limit)
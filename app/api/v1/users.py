@@ -1,23 +1,28 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.core.pagination import CURSOR_DESCRIPTION
 from app.crud.user import user as crud_user
 from app.db.base import get_db
 from app.models.user import User as UserModel
+from app.schemas.pagination import CursorPage
 from app.schemas.user import User, UserCreate, UserUpdate
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=Union[CursorPage[User], List[User]])
 async def read_users(
     db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     skip: int = 0,
     limit: int = 100,
     current_user: UserModel = Depends(deps.get_current_superuser),
 ) -> Any:
     """Retrieve users (superuser only)."""
+    if cursor is not None:
+        return deps.cursor_page(crud_user.get_page, db, cursor=cursor, limit=limit)
     users = crud_user.get_multi(db, skip=skip, limit=limit)
     return users
 
@@ -0,0 +1,78 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+_business_tz = ZoneInfo(settings.BUSINESS_TIMEZONE)
+
+
+def business_date(value: datetime) -> date:
+    """Local business date of a timestamp.
+    
+    Timezone-aware values are converted to ``BUSINESS_TIMEZONE``; naive values
+    are taken to already be in business-local time, as stored by the POS.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(_business_tz)
+    return value.date()
+
+
+def business_time(value: datetime) -> datetime:
+    """Naive business-local timestamp, the form transaction dates are stored in.
+    
+    Timezone-aware values are converted to ``BUSINESS_TIMEZONE``, as in
+    ``business_date``; naive values are returned unchanged.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(_business_tz).replace(tzinfo=None)
+    return value
+
+
+def date_key(day: date) -> int:
+    """Integer YYYYMMDD key for a calendar day."""
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def key_to_date(key: int) -> date:
+    return date(key // 10000, key // 100 % 100, key % 100)
+
+
+def calendar_row(day: date) -> Dict[str, Any]:
+    """Column values of the calendar dimension row for ``day``."""
+    iso_year, iso_week, iso_weekday = day.isocalendar()
+    quarter = (day.month - 1) // 3 + 1
+    return {
+        'date_key': date_key(day),
+        'calendar_date': day,
+        'day_of_week': iso_weekday,
+        'iso_year': iso_year,
+        'iso_week': iso_week,
+        'week_key': iso_year * 100 + iso_week,
+        'week_start': day - timedelta(days=iso_weekday - 1),
+        'month': day.month,
+        'month_key': day.year * 100 + day.month,
+        'month_start': day.replace(day=1),
+        'quarter': quarter,
+        'quarter_key': day.year * 10 + quarter,
+        'quarter_start': date(day.year, 3 * quarter - 2, 1),
+        'year': day.year,
+        'year_start': date(day.year, 1, 1),
+    }
+
+
+def default_window(
+    start_date: Optional[datetime], end_date: Optional[datetime], days: int = 30
+) -> Tuple[datetime, datetime]:
+    """Fill missing bounds with the last ``days`` whole business days.
+    
+    Windows are half-open, so the default end is the midnight after today.
+    Snapping to day boundaries keeps the default window identical across
+    requests, so results are cacheable and can be served from the rollups.
+    """
+    today = business_date(datetime.now(timezone.utc))
+    if not start_date:
+        start_date = datetime.combine(today - timedelta(days=days), time.min)
+    if not end_date:
+        end_date = datetime.combine(today + timedelta(days=1), time.min)
+    return start_date, end_date
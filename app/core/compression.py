@@ -0,0 +1,195 @@
+"""
+gzip and brotli compression of responses.
+
+``CompressionMiddleware`` compresses bodies of at least
+COMPRESSION_MINIMUM_SIZE bytes in the encoding the client prefers, brotli
+over gzip on a tie. Streamed bodies are compressed chunk by chunk and flushed
+after each, so exports still arrive incrementally. A route can choose its own
+levels, or opt out, with the ``compression`` dependency in app.api.deps.
+
+Payloads that rarely change (the PRD documents, reference-data lists) are
+compressed once, at the highest levels, into a ``CompressedPayload`` and
+served from memory; the middleware passes those responses through untouched.
+"""
+import gzip
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional; responses fall back to gzip
+    brotli = None
+
+# Scope key where the ``compression`` dependency leaves a route's
+# (enabled, gzip level, brotli quality)
+SCOPE_KEY = "compression"
+
+# Already compressed formats
+_INCOMPRESSIBLE = ("application/gzip", "application/zip", "application/vnd.apache.parquet", "image/", "video/")
+
+
+def preferred_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """``br``, ``gzip`` or None (identity) for an Accept-Encoding header."""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    candidates = [("br", accepted.get("br", wildcard))] if brotli is not None else []
+    candidates.append(("gzip", accepted.get("gzip", wildcard)))
+    # max keeps the first of equal q-values, so brotli wins ties
+    coding, q = max(candidates, key=lambda candidate: candidate[1])
+    return coding if q > 0 else None
+
+
+class _Compressor:
+    """Incremental gzip or brotli stream."""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            chunk = self._brotli.process(data)
+            return chunk + (self._brotli.finish() if final else self._brotli.flush())
+        chunk = self._zlib.compress(data)
+        return chunk + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Compress HTTP response bodies for clients that accept gzip or brotli."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = preferred_encoding(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, scope, send, coding))
+
+
+class _CompressingSend:
+    """The ``send`` of one response, compressing its body if it qualifies.
+
+    The start message is held back until the first body chunk shows whether
+    the response is worth compressing.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, coding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.send = send
+        self.coding = coding
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.compressor is None:
+            enabled, gzip_level, brotli_quality = self._levels()
+            headers = MutableHeaders(raw=self.start["headers"])
+            if (
+                not enabled
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith(_INCOMPRESSIBLE)
+                or (not more_body and len(body) < self.middleware.minimum_size)
+            ):
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.coding, gzip_level, brotli_quality)
+            headers["Content-Encoding"] = self.coding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            body = self.compressor.compress(body, final=not more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
+
+    def _levels(self) -> Tuple[bool, int, int]:
+        enabled, gzip_level, brotli_quality = self.scope.get(SCOPE_KEY, (True, None, None))
+        return (
+            enabled,
+            self.middleware.gzip_level if gzip_level is None else gzip_level,
+            self.middleware.brotli_quality if brotli_quality is None else brotli_quality,
+        )
+
+
+class CompressedPayload:
+    """A response body compressed ahead of time in every supported encoding."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.media_type = media_type
+        self.bodies: Dict[Optional[str], bytes] = {
+            None: body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+
+    def response(self, accept_encoding: Optional[str]) -> Response:
+        """The stored body in the encoding ``accept_encoding`` prefers."""
+        coding = preferred_encoding(accept_encoding) if settings.COMPRESSION_ENABLED else None
+        headers = {"Vary": "Accept-Encoding"}
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+        return Response(self.bodies[coding], media_type=self.media_type, headers=headers)
+
+
+def model_payload(response_type: Any, content: Any) -> CompressedPayload:
+    """``content`` (models or ORM objects) encoded as ``response_type`` JSON and compressed."""
+    adapter = TypeAdapter(response_type)
+    return CompressedPayload(adapter.dump_json(adapter.validate_python(content, from_attributes=True)))
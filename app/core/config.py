@@ -36,6 +36,44 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
     
+    # Retail analytics
+    BUSINESS_TIMEZONE: str = "Asia/Manila"
+    ANALYTICS_CACHE_SIZE: int = 512
+    ANALYTICS_CACHE_TTL: int = 300  # seconds
+    ANALYTICS_VERSION_POLL_INTERVAL: float = 1.0  # seconds between data version reads
+    
+    # Bulk ingest
+    BULK_INSERT_CHUNK_SIZE: int = 1000  # transactions per multi-row INSERT
+    STREAM_INGEST_BATCH_SIZE: int = 500  # NDJSON records buffered per flush
+    
+    # Group commit of POST /retail/transactions
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_MAX_BATCH: int = 200  # transactions per commit
+    GROUP_COMMIT_INTERVAL_MS: int = 5  # longest wait for a batch to fill
+    GROUP_COMMIT_MAX_QUEUE: int = 10000  # callers block beyond this depth
+    GROUP_COMMIT_TIMEOUT_SECONDS: float = 10.0  # longest a caller waits for its commit
+    
+    # Monthly transaction partitions (MySQL)
+    PARTITION_MONTHS_AHEAD: int = 3  # future months created at startup
+    
+    # Encode responses with orjson and the schemas' compiled serializers
+    FAST_JSON_RESPONSES: bool = False
+    
+    # gzip/brotli compression of responses
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
+    REFERENCE_PAYLOAD_TTL: int = 300  # seconds a precompressed reference list is served
+    
+    # Fail responses that lazy load a relationship their loading profile
+    # does not plan for, instead of issuing a query per row (enable in tests)
+    RAISE_ON_LAZY_LOAD: bool = False
+    
+    # Cold archive of old transactions
+    ARCHIVE_DIR: str = "archive"  # where archive_transactions.py writes segment files
+    ARCHIVE_HORIZON_MONTHS: int = 24  # months of transactions kept in the hot tables
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination.
+
+A page is read with ``WHERE (k1, k2, ...) > last_seen ORDER BY k1, k2, ...
+LIMIT n`` over an index on the key columns, so every page costs the same
+index seek however deep it is. The key of the last row is handed to the
+client as an opaque cursor. The last key column must be unique (the id).
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+# Largest page a list endpoint returns
+MAX_PAGE_SIZE = 1000
+CURSOR_DESCRIPTION = (
+    "Keyset pagination: pass an empty value for the first page, then each response's "
+    "next_cursor. Without it the endpoint returns a plain list paged by skip/limit."
+)
+
+# (column, descending) pairs in sort order
+KeyOrder = Sequence[Tuple[Any, bool]]
+
+
+def _jsonable(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_jsonable(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: KeyOrder) -> List[Any]:
+    """Key values of ``cursor``, typed like the key columns; ValueError if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(order):
+        raise ValueError("Invalid cursor")
+    typed = []
+    for (column, _), value in zip(order, values):
+        python_type = column.type.python_type
+        try:
+            if value is not None and python_type in (datetime, date):
+                value = python_type.fromisoformat(value)
+            elif value is not None:
+                value = python_type(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        typed.append(value)
+    return typed
+
+
+def _after(order: KeyOrder, values: Sequence[Any]):
+    """Rows strictly after ``values`` in ``order``, as an OR of prefix matches.
+
+    Spelled out instead of a row-value comparison so MySQL turns it into an
+    index range and mixed sort directions work.
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*(c == v for (c, _), v in zip(order[:i], values[:i])), beyond))
+    return or_(*clauses)
+
+
+def keyset_page(
+    query: Query,
+    order: KeyOrder,
+    cursor: Optional[str],
+    limit: int,
+    key: Callable[[Any], Sequence[Any]],
+    fetch: Optional[Callable[[Query], List[Any]]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """One page of ``query`` after ``cursor`` (None or empty for the first page).
+
+    ``key`` extracts a row's values of the ``order`` columns. ``fetch`` runs
+    the final query, ``Query.all`` by default. Returns the rows and the cursor
+    of the next page, None on the last page.
+    """
+    if cursor:
+        query = query.filter(_after(order, decode_cursor(cursor, order)))
+    query = query.order_by(
+        *(column.desc() if descending else column.asc() for column, descending in order)
+    ).limit(limit + 1)
+    rows = fetch(query) if fetch is not None else query.all()
+    if len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_cursor(key(rows[limit - 1]))
@@ -0,0 +1,43 @@
+"""
+Fast JSON encoding of large responses.
+
+FastAPI encodes a route's return value in three passes: it validates it
+against the response model, converts it to JSON-compatible Python objects and
+runs ``json.dumps`` over those. With FAST_JSON_RESPONSES, list endpoints that
+already hold validated response models skip all three and serialize them with
+the schema's compiled pydantic serializer straight to bytes, and every other
+response is rendered with orjson instead of ``json.dumps``.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional; responses fall back to json.dumps
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_bytes(body: bytes, status_code: int = 200) -> Response:
+    """A response around an already encoded JSON body."""
+    return Response(body, status_code=status_code, media_type="application/json")
+
+
+def model_response(model: BaseModel) -> Any:
+    """``model`` serialized by its compiled serializer when FAST_JSON_RESPONSES
+    is on, else returned for FastAPI to encode."""
+    if not settings.FAST_JSON_RESPONSES:
+        return model
+    return json_bytes(model.model_dump_json().encode())
@@ -0,0 +1,83 @@
+import hashlib
+import math
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+# 2^11 registers gives a standard error of about 2.3%
+HLL_PRECISION = 11
+
+# Quantile sketch values are within 1% of the true quantile
+QUANTILE_RELATIVE_ACCURACY = 0.01
+QUANTILE_ZERO_BUCKET = -(1 << 30)  # zero and negative values
+
+_GAMMA = (1 + QUANTILE_RELATIVE_ACCURACY) / (1 - QUANTILE_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+def _hash64(value: Any) -> int:
+    digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def hll_register(value: Any, precision: int = HLL_PRECISION) -> Tuple[int, float]:
+    """Return the HyperLogLog (register index, weight) for a value.
+
+    The weight is 2^-rank rather than the rank itself, so merging sketches is
+    MIN(weight) per register and an estimate only needs SUM(weight).
+    """
+    hashed = _hash64(value)
+    width = 64 - precision
+    index = hashed >> width
+    remainder = hashed & ((1 << width) - 1)
+    rank = width - remainder.bit_length() + 1
+    return index, 2.0 ** -rank
+
+
+def hll_estimate(weight_sum: float, nonzero_registers: int, precision: int = HLL_PRECISION) -> int:
+    """Estimate cardinality from the merged weights of the non-empty registers."""
+    m = 1 << precision
+    empty = m - nonzero_registers
+    if nonzero_registers == 0:
+        return 0
+
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / ((weight_sum or 0.0) + empty)
+    if estimate <= 2.5 * m and empty:
+        # Linear counting is more accurate for small cardinalities
+        estimate = m * math.log(m / empty)
+    return int(round(estimate))
+
+
+def quantile_bucket(value: float) -> int:
+    """Return the log-scale bucket of a value in a mergeable quantile sketch.
+
+    Bucket i covers (gamma^(i-1), gamma^i], so reporting any value in it at the
+    bucket midpoint stays within QUANTILE_RELATIVE_ACCURACY of the truth.
+    Sketches merge by summing the counts of equal buckets.
+    """
+    if value <= 0:
+        return QUANTILE_ZERO_BUCKET
+    return math.ceil(math.log(value) / _LOG_GAMMA)
+
+
+def quantile_estimates(
+    buckets: Iterable[Tuple[int, int]], quantiles: Sequence[float]
+) -> List[Optional[float]]:
+    """Estimate quantiles from merged (bucket, count) pairs; None when empty."""
+    ordered = sorted(buckets)
+    total = sum(count for _, count in ordered)
+    if not total:
+        return [None] * len(quantiles)
+
+    estimates = []
+    for q in quantiles:
+        rank = q * (total - 1)
+        seen = 0
+        for index, count in ordered:
+            seen += count
+            if seen > rank:
+                break
+        if index == QUANTILE_ZERO_BUCKET:
+            estimates.append(0.0)
+        else:
+            estimates.append(2 * _GAMMA ** index / (_GAMMA + 1))
+    return estimates
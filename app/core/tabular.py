@@ -0,0 +1,175 @@
+"""
+Apache Arrow IPC and Parquet renderings of analytics results.
+
+Analytics endpoints answer ``Accept: application/vnd.apache.arrow.stream`` or
+``Accept: application/vnd.apache.parquet`` with a table instead of a JSON
+array. Tables are built a column at a time: from the columnar engine's NumPy
+arrays, or from database rows transposed per fetch batch, never through one
+response model per row. The Arrow schema comes from the endpoint's response
+model, so the columns and their nullability match the JSON fields.
+Responses are streamed: each record batch is encoded and sent as soon as it
+is built, so memory stays flat however many rows are asked for.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Type, Union, get_args, get_origin
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, Session
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional; tabular formats are refused with 406 without it
+    pa = pq = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+TABULAR_MEDIA_TYPES = (ARROW_STREAM, PARQUET)
+# ``responses=`` for routes that negotiate them, so the docs list both
+TABULAR_RESPONSES = {200: {"content": {media_type: {} for media_type in TABULAR_MEDIA_TYPES}}}
+
+# Rows fetched from the database, and converted to one record batch, at a time
+_BATCH_ROWS = 50000
+
+_JSON_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """The tabular media type ``accept`` prefers, or None to answer with JSON.
+
+    Follows the header's q-values; on a tie the type listed first wins.
+    """
+    best, best_q = None, 0.0
+    for part in (accept or "").split(","):
+        media_type, _, params = part.partition(";")
+        media_type = media_type.strip().lower()
+        if media_type not in TABULAR_MEDIA_TYPES and media_type not in _JSON_MEDIA_TYPES:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best if best in TABULAR_MEDIA_TYPES else None
+
+
+def _arrow_field(name: str, field: Any):
+    annotation, nullable = field.annotation, not field.is_required()
+    if get_origin(annotation) is Union and type(None) in get_args(annotation):
+        annotation, nullable = next(arg for arg in get_args(annotation) if arg is not type(None)), True
+    types = {
+        str: pa.string(),
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        datetime: pa.timestamp("us"),
+        date: pa.date32(),
+    }
+    if annotation not in types:
+        raise TypeError(f"No Arrow type for {name}: {annotation!r}")
+    return pa.field(name, types[annotation], nullable=nullable)
+
+
+@lru_cache(maxsize=None)
+def arrow_schema(model: Type[BaseModel]):
+    """Arrow schema with one column per field of a flat response model."""
+    return pa.schema([_arrow_field(name, field) for name, field in model.model_fields.items()])
+
+
+def model_columns(items: Sequence[BaseModel], model: Type[BaseModel]) -> Dict[str, List[Any]]:
+    """Columns of already built response models (for short aggregate results)."""
+    return {name: [getattr(item, name) for item in items] for name in model.model_fields}
+
+
+def columns_batch(columns: Mapping[str, Any], model: Type[BaseModel]):
+    """A record batch from one sequence or NumPy array per field of ``model``."""
+    schema = arrow_schema(model)
+    return pa.record_batch([pa.array(columns[f.name], type=f.type) for f in schema], schema=schema)
+
+
+def rows_batch(rows: Sequence[Sequence[Any]], model: Type[BaseModel]):
+    """A record batch from rows whose values are in ``model``'s field order."""
+    schema = arrow_schema(model)
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch([pa.array(column, type=f.type) for column, f in zip(columns, schema)], schema=schema)
+
+
+def query_batches(query: Query, model: Type[BaseModel]) -> Iterator[Any]:
+    """Record batches of ``query`` (an ORM query selecting ``model``'s fields
+    in order), read through a server-side cursor.
+
+    Uses its own session on the query's engine, since a streamed body is
+    produced after the request's dependencies have closed theirs; it is
+    released when the response ends or the client disconnects.
+    """
+    db = Session(bind=query.session.get_bind())
+    try:
+        result = db.execute(query.statement, execution_options={"yield_per": _BATCH_ROWS})
+        for rows in result.partitions():
+            yield rows_batch(rows, model)
+    finally:
+        db.close()
+
+
+class _ChunkSink:
+    """Write-only file whose contents are taken out with ``drain``."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Writers record offsets (Parquet's footer), so count everything written
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _encode(batches: Iterable[Any], schema, media_type: str) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    if media_type == PARQUET:
+        writer = pq.ParquetWriter(out, schema)
+        write = lambda batch: writer.write_table(pa.Table.from_batches([batch], schema=schema))
+    else:
+        writer = pa.ipc.new_stream(out, schema)
+        write = writer.write_batch
+    with writer:
+        for batch in batches:
+            write(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def tabular_response(
+    batches: Iterable[Any], model: Type[BaseModel], media_type: str, headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """``batches`` streamed as an Arrow IPC stream or a Parquet file.
+
+    Each batch is sent once written: an IPC stream message, or a Parquet row
+    group, with the file footer last.
+    """
+    return StreamingResponse(_encode(batches, arrow_schema(model), media_type), media_type=media_type, headers=headers)
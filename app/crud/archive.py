@@ -0,0 +1,257 @@
+"""
+Cold storage tier for old retail transactions.
+
+Whole months of ``transactions`` and ``transaction_items`` are written to
+compressed NumPy column files (``.npz``) and deleted from the hot tables, so
+those tables and their indexes only hold recent history. ``archive_segments``
+is the manifest of the files and ``archived_customer_totals`` keeps the
+per-customer aggregates RFM needs.
+
+Daily rollups are not touched, so day-aligned analytics keep reading them
+for archived months. Queries that need the raw rows of an archived month
+(partial days, exact distinct counts) are refused with ``ArchivedRangeError``
+rather than loading the files into a web worker; read the files offline with
+``load_segment`` instead. Transaction lists and exports cover the hot tables
+only.
+"""
+import os
+import threading
+import time as clock
+from datetime import date, datetime, time
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.calendar import business_date, business_time, date_key
+from app.core.config import settings
+from app.db.partitions import add_months, month_start
+from app.db.upsert import upsert
+from app.db.versions import bump_version
+from app.models.retail import ArchiveSegment, ArchivedCustomerTotal, Transaction, TransactionItem
+
+_DELETE_BATCH = 1000
+# Seconds a process trusts its cached archive boundary
+_BOUNDARY_TTL = 60.0
+
+
+class ArchivedRangeError(ValueError):
+    """A query needs raw rows of months that now only exist in archive files."""
+
+
+def load_segment(path: str) -> Dict[str, np.ndarray]:
+    """Column arrays of an archive file, keyed ``tx_*`` and ``item_*``."""
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def horizon_cutoff(today: Optional[date] = None) -> date:
+    """First day of the oldest month kept hot under ``ARCHIVE_HORIZON_MONTHS``."""
+    return add_months(month_start(today or date.today()), -settings.ARCHIVE_HORIZON_MONTHS)
+
+
+class CRUDArchive:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boundary: Optional[datetime] = None
+        self._boundary_checked = float('-inf')
+
+    def archived_until(self, db: Session, cached: bool = True) -> Optional[datetime]:
+        """Start of the month after the newest archived one; None without archives.
+
+        Raw rows older than this may only exist in archive files. Pass
+        ``cached=False`` to skip the per-process cache before destructive work.
+        """
+        with self._lock:
+            if cached and clock.monotonic() - self._boundary_checked < _BOUNDARY_TTL:
+                return self._boundary
+        month = db.query(func.max(ArchiveSegment.month)).scalar()
+        boundary = datetime.combine(add_months(month, 1), time.min) if month else None
+        with self._lock:
+            self._boundary, self._boundary_checked = boundary, clock.monotonic()
+        return boundary
+
+    def covers(self, db: Session, start_date: datetime) -> bool:
+        """Whether a window starting at ``start_date`` reaches into archived months."""
+        boundary = self.archived_until(db)
+        return boundary is not None and business_time(start_date) < boundary
+
+    def check_hot(self, db: Session, start_date: datetime) -> None:
+        """Raise ArchivedRangeError if a raw-row query from ``start_date`` would miss archived rows."""
+        if self.covers(db, start_date):
+            raise ArchivedRangeError(
+                f"Raw transactions before {self.archived_until(db):%Y-%m-%d} are archived; "
+                "whole-day windows are still answered from the daily rollups (engine=sql)"
+            )
+
+    def segments(self, db: Session) -> List[ArchiveSegment]:
+        return db.query(ArchiveSegment).order_by(ArchiveSegment.month, ArchiveSegment.id).all()
+
+    def archive_before(self, db: Session, cutoff: date, directory: str) -> List[ArchiveSegment]:
+        """Archive every month entirely before ``cutoff`` that still has hot rows, oldest first."""
+        oldest = db.query(func.min(Transaction.transaction_date)).scalar()
+        segments: List[ArchiveSegment] = []
+        if oldest is None:
+            return segments
+        month = month_start(business_time(oldest).date())
+        while month < month_start(cutoff):
+            segment = self.archive_month(db, month, directory)
+            if segment:
+                segments.append(segment)
+            month = add_months(month, 1)
+        return segments
+
+    def archive_month(self, db: Session, month: date, directory: str) -> Optional[ArchiveSegment]:
+        """Move one month of transactions to a compressed file; None if it has no hot rows.
+
+        The file is written and read back before the manifest row, customer
+        totals and deletes are committed together, so a failure leaves the
+        rows in the hot tables.
+        """
+        start = datetime.combine(month, time.min)
+        end = datetime.combine(add_months(month, 1), time.min)
+        transactions = db.execute(
+            select(
+                Transaction.id, Transaction.transaction_code, Transaction.store_id,
+                Transaction.customer_id, Transaction.transaction_date, Transaction.date_key,
+                Transaction.total_amount, Transaction.discount_amount, Transaction.tax_amount,
+                Transaction.payment_method, Transaction.status
+            ).where(
+                and_(Transaction.transaction_date >= start, Transaction.transaction_date < end)
+            ).order_by(Transaction.id)
+        ).all()
+        if not transactions:
+            return None
+        items = db.execute(
+            select(
+                TransactionItem.id, TransactionItem.transaction_id, TransactionItem.product_id,
+                TransactionItem.quantity, TransactionItem.unit_price, TransactionItem.total_price,
+                TransactionItem.discount_amount
+            ).where(
+                and_(
+                    TransactionItem.transaction_date >= start,
+                    TransactionItem.transaction_date < end,
+                    TransactionItem.transaction_id.in_(
+                        select(Transaction.id).where(and_(
+                            Transaction.transaction_date >= start, Transaction.transaction_date < end
+                        ))
+                    )
+                )
+            ).order_by(TransactionItem.id)
+        ).all()
+
+        columns = {
+            'tx_id': np.array([r.id for r in transactions], dtype=np.int64),
+            'tx_code': np.array([r.transaction_code for r in transactions], dtype=str),
+            'tx_store': np.array([r.store_id for r in transactions], dtype=np.int64),
+            'tx_customer': np.array(
+                [r.customer_id if r.customer_id is not None else -1 for r in transactions], dtype=np.int64
+            ),
+            'tx_time': np.array(
+                [business_time(r.transaction_date) for r in transactions], dtype='datetime64[us]'
+            ),
+            'tx_day': np.array(
+                [r.date_key or date_key(business_date(r.transaction_date)) for r in transactions],
+                dtype=np.int32
+            ),
+            'tx_amount': np.array([r.total_amount for r in transactions], dtype=np.float64),
+            'tx_discount': np.array([r.discount_amount or 0 for r in transactions], dtype=np.float64),
+            'tx_tax': np.array([r.tax_amount or 0 for r in transactions], dtype=np.float64),
+            'tx_payment': np.array([r.payment_method or '' for r in transactions], dtype=str),
+            'tx_status': np.array([r.status or 'completed' for r in transactions], dtype=str),
+            'item_id': np.array([r.id for r in items], dtype=np.int64),
+            'item_tx_id': np.array([r.transaction_id for r in items], dtype=np.int64),
+            'item_product': np.array([r.product_id for r in items], dtype=np.int64),
+            'item_quantity': np.array([r.quantity for r in items], dtype=np.float64),
+            'item_unit_price': np.array([r.unit_price for r in items], dtype=np.float64),
+            'item_price': np.array([r.total_price for r in items], dtype=np.float64),
+            'item_discount': np.array([r.discount_amount or 0 for r in items], dtype=np.float64),
+        }
+        completed = columns['tx_status'] == 'completed'
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.abspath(os.path.join(directory, f"transactions_{month:%Y%m}_{transactions[0].id}.npz"))
+        with open(f"{path}.tmp", 'wb') as f:
+            np.savez_compressed(f, **columns)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
+
+        try:
+            written = load_segment(path)
+            if not (
+                np.array_equal(written['tx_id'], columns['tx_id'])
+                and np.array_equal(written['item_id'], columns['item_id'])
+                and np.array_equal(written['tx_amount'], columns['tx_amount'])
+            ):
+                raise RuntimeError(f"Archive file {path} does not match the rows read")
+
+            self._add_customer_totals(db, columns, completed)
+            segment = ArchiveSegment(
+                month=month,
+                path=path,
+                transaction_count=len(transactions),
+                item_count=len(items),
+                total_sales=float(columns['tx_amount'][completed].sum()),
+                first_transaction_id=int(columns['tx_id'][0]),
+                last_transaction_id=int(columns['tx_id'][-1]),
+                file_bytes=os.path.getsize(path),
+            )
+            db.add(segment)
+            # Tells change readers (the columnar engine) to pick up the file
+            bump_version(db)
+
+            # Delete exactly the rows written, pruned to the month's partitions
+            for column, model, ids in (
+                (TransactionItem.id, TransactionItem, columns['item_id']),
+                (Transaction.id, Transaction, columns['tx_id']),
+            ):
+                for offset in range(0, ids.size, _DELETE_BATCH):
+                    db.execute(delete(model).where(and_(
+                        model.transaction_date >= start,
+                        model.transaction_date < end,
+                        column.in_(ids[offset:offset + _DELETE_BATCH].tolist())
+                    )))
+            db.commit()
+        except Exception:
+            db.rollback()
+            os.remove(path)
+            raise
+
+        with self._lock:
+            self._boundary_checked = float('-inf')
+        return segment
+
+    def _add_customer_totals(self, db: Session, columns: Dict[str, np.ndarray], completed: np.ndarray) -> None:
+        known = completed & (columns['tx_customer'] >= 0)
+        customers, inverse = np.unique(columns['tx_customer'][known], return_inverse=True)
+        if not customers.size:
+            return
+        days = columns['tx_day'][known]
+        first = np.full(customers.size, np.iinfo(np.int32).max, dtype=np.int64)
+        last = np.zeros(customers.size, dtype=np.int64)
+        np.minimum.at(first, inverse, days)
+        np.maximum.at(last, inverse, days)
+        frequency = np.bincount(inverse)
+        monetary = np.bincount(inverse, weights=columns['tx_amount'][known])
+        upsert(
+            db, ArchivedCustomerTotal,
+            [
+                {
+                    'customer_id': int(customer_id),
+                    'frequency': int(frequency[i]),
+                    'monetary': float(monetary[i]),
+                    'first_date_key': int(first[i]),
+                    'last_date_key': int(last[i]),
+                }
+                for i, customer_id in enumerate(customers)
+            ],
+            index_elements=('customer_id',),
+            increment=('frequency', 'monetary'),
+            minimum=('first_date_key',),
+            maximum=('last_date_key',),
+        )
+
+
+transaction_archive = CRUDArchive()
@@ -0,0 +1,506 @@
+"""
+In-process columnar engine for the retail analytics queries.
+
+Completed transactions and their items are held as NumPy column arrays, with
+store/product/brand/category/region ids dictionary-encoded to dense indexes,
+so every group-by is a ``bincount``/``unique`` reduction over contiguous
+arrays instead of a SQL join. The engine loads on first use and afterwards,
+whenever the data version moves, reads the rows stamped with a higher
+``change_seq`` than it has seen, column by column into preallocated arrays.
+Reference data upserts bump their own version, on which the dimension maps
+are rebuilt. It holds the hot tables only: rows are
+dropped when their month is archived, and windows reaching into archived
+months raise ArchivedRangeError.
+"""
+import threading
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.calendar import business_time, calendar_row, key_to_date
+from app.crud.archive import transaction_archive
+from app.db.versions import REFERENCE, current_version
+from app.models.retail import (
+    Region, Store, Brand, Category, Product, Transaction, TransactionItem
+)
+from app.schemas.retail import (
+    SalesByRegion, SalesByBrand, SalesByCategory, TopSellingProduct,
+    StorePerformance, TransactionSummary, SalesTrend, RetailDashboard
+)
+
+_LOAD_CHUNK = 50000
+_BASKET_QUANTILES = (0.5, 0.9, 0.99)
+
+_BUCKET_STARTS = {
+    'day': 'calendar_date',
+    'week': 'week_start',
+    'month': 'month_start',
+    'quarter': 'quarter_start',
+    'year': 'year_start',
+}
+
+
+def _encode(ids: np.ndarray, values) -> np.ndarray:
+    """Map ids to their dense index in the sorted ``ids`` array."""
+    return np.searchsorted(ids, np.asarray(values, dtype=np.int64)).astype(np.int32)
+
+
+def _read_columns(
+    db: Session,
+    statement,
+    size: int,
+    dtypes: Dict[str, Any],
+    convert: Optional[Dict[str, Callable[[Any], Any]]] = None,
+) -> Dict[str, np.ndarray]:
+    """Read ``statement`` into one array per selected column, named by ``dtypes``.
+
+    Arrays are allocated for ``size`` rows (the caller's count) and filled one
+    ``yield_per`` partition at a time, transposed in place, so no row list of
+    the whole result is built. ``convert`` maps a column to a per-value
+    function applied on the way in. Rows beyond ``size`` grow the arrays.
+    """
+    convert = convert or {}
+    columns = {name: np.empty(size, dtype=dtype) for name, dtype in dtypes.items()}
+    filled = 0
+    result = db.execute(statement.execution_options(yield_per=_LOAD_CHUNK))
+    for rows in result.partitions():
+        end = filled + len(rows)
+        if end > size:
+            size = max(end, 2 * size)
+            columns = {
+                name: np.concatenate([array[:filled], np.empty(size - filled, dtype=array.dtype)])
+                for name, array in columns.items()
+            }
+        for (name, array), values in zip(columns.items(), zip(*rows)):
+            array[filled:end] = [convert[name](v) for v in values] if name in convert else values
+        filled = end
+    return {name: array[:filled] for name, array in columns.items()}
+
+
+def _day_keys(times: np.ndarray) -> np.ndarray:
+    """YYYYMMDD keys of business-local timestamps."""
+    days = times.astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    return (
+        (years.astype(np.int64) + 1970) * 10000
+        + (months - years).astype(np.int64) * 100 + 100
+        + (days - months).astype(np.int64) + 1
+    ).astype(np.int32)
+
+
+def _models(model, columns: Dict[str, Any]) -> list:
+    """Response models from a dict of equal-length columns."""
+    values = [
+        column.tolist() if isinstance(column, np.ndarray) else column for column in columns.values()
+    ]
+    return [model(**dict(zip(columns, row))) for row in zip(*values)]
+
+
+def _distinct_per_group(groups: np.ndarray, members: np.ndarray, size: int) -> np.ndarray:
+    """Count distinct ``members`` within each group index."""
+    if groups.size == 0:
+        return np.zeros(size, dtype=np.int64)
+    stride = np.int64(members.max()) + 1
+    pairs = np.unique(groups.astype(np.int64) * stride + members)
+    return np.bincount(pairs // stride, minlength=size)
+
+
+class _Dimensions:
+    """Dictionary-encoded dimension tables."""
+
+    def __init__(self, db: Session):
+        regions = db.query(Region.id, Region.code, Region.name).order_by(Region.id).all()
+        self.region_ids = np.array([r.id for r in regions], dtype=np.int64)
+        self.region_code = [r.code for r in regions]
+        self.region_name = [r.name for r in regions]
+
+        stores = db.query(Store.id, Store.code, Store.name, Store.region_id).order_by(Store.id).all()
+        self.store_ids = np.array([s.id for s in stores], dtype=np.int64)
+        self.store_code = [s.code for s in stores]
+        self.store_name = [s.name for s in stores]
+        self.store_region = _encode(self.region_ids, [s.region_id for s in stores])
+
+        brands = db.query(Brand.id, Brand.code, Brand.name).order_by(Brand.id).all()
+        self.brand_ids = np.array([b.id for b in brands], dtype=np.int64)
+        self.brand_code = [b.code for b in brands]
+        self.brand_name = [b.name for b in brands]
+
+        categories = db.query(Category.id, Category.code, Category.name).order_by(Category.id).all()
+        self.category_ids = np.array([c.id for c in categories], dtype=np.int64)
+        self.category_code = [c.code for c in categories]
+        self.category_name = [c.name for c in categories]
+
+        products = db.query(
+            Product.id, Product.sku, Product.name, Product.brand_id, Product.category_id
+        ).order_by(Product.id).all()
+        self.product_ids = np.array([p.id for p in products], dtype=np.int64)
+        self.product_sku = [p.sku for p in products]
+        self.product_name = [p.name for p in products]
+        self.product_brand = _encode(self.brand_ids, [p.brand_id for p in products])
+        self.product_category = _encode(self.category_ids, [p.category_id for p in products])
+
+    def knows(self, store_ids: np.ndarray, product_ids: np.ndarray) -> bool:
+        return bool(
+            np.isin(store_ids, self.store_ids).all()
+            and np.isin(product_ids, self.product_ids).all()
+        )
+
+
+class _Facts:
+    """Column arrays of completed transactions and their items."""
+
+    def __init__(self):
+        self.tx_id = np.empty(0, dtype=np.int64)
+        self.tx_time = np.empty(0, dtype='datetime64[us]')
+        self.tx_day = np.empty(0, dtype=np.int32)  # YYYYMMDD business date
+        self.tx_store = np.empty(0, dtype=np.int32)
+        self.tx_customer = np.empty(0, dtype=np.int64)  # -1 for walk-ins
+        self.tx_amount = np.empty(0, dtype=np.float64)
+        self.item_tx = np.empty(0, dtype=np.int64)  # row index into the tx_* arrays
+        self.item_product = np.empty(0, dtype=np.int32)
+        self.item_quantity = np.empty(0, dtype=np.float64)
+        self.item_price = np.empty(0, dtype=np.float64)
+
+    def since(self, start: np.datetime64) -> "_Facts":
+        """The transactions at or after ``start``, and their items."""
+        keep = self.tx_time >= start
+        if keep.all():
+            return self
+        position = np.cumsum(keep) - 1
+        items = keep[self.item_tx]
+        kept = _Facts()
+        for name in ('tx_id', 'tx_time', 'tx_day', 'tx_store', 'tx_customer', 'tx_amount'):
+            setattr(kept, name, getattr(self, name)[keep])
+        kept.item_tx = position[self.item_tx[items]]
+        for name in ('item_product', 'item_quantity', 'item_price'):
+            setattr(kept, name, getattr(self, name)[items])
+        return kept
+
+
+class ColumnarAnalytics:
+    """Vectorized counterparts of the CRUDAnalytics queries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dims: Optional[_Dimensions] = None
+        self._facts = _Facts()
+        self._version: Optional[int] = None  # data version last caught up to
+        self._reference_version: Optional[int] = None  # reference version the dims were built at
+        self._seq = -1  # highest change_seq loaded
+
+    def reload(self, db: Session) -> None:
+        """Drop everything and load from scratch."""
+        with self._lock:
+            self._dims = None
+            self._facts = _Facts()
+            self._version = None
+            self._reference_version = None
+            self._seq = -1
+        self.refresh(db)
+
+    def refresh(self, db: Session) -> int:
+        """Append transactions committed since the last refresh; return how many.
+
+        Costs two primary-key reads while the data versions have not moved.
+        """
+        with self._lock:
+            version = current_version(db)
+            reference_version = current_version(db, REFERENCE)
+            if reference_version != self._reference_version and self._dims is not None:
+                self._redimension(db)
+            self._reference_version = reference_version
+            if version == self._version:
+                return 0
+
+            # change_seq is handed out in commit order (app.db.versions), so
+            # every row stamped up to ``version`` is committed and rows
+            # committed out of id order are still read exactly once
+            changed = and_(
+                Transaction.change_seq > self._seq,
+                Transaction.change_seq <= version,
+                Transaction.status == 'completed'
+            )
+            transactions = _read_columns(
+                db,
+                select(
+                    Transaction.id, Transaction.transaction_date, func.coalesce(Transaction.date_key, 0),
+                    Transaction.store_id, func.coalesce(Transaction.customer_id, -1), Transaction.total_amount
+                ).where(changed).order_by(Transaction.id),
+                db.execute(select(func.count()).select_from(Transaction).where(changed)).scalar_one(),
+                {
+                    'tx_id': np.int64, 'tx_time': 'datetime64[us]', 'tx_day': np.int32,
+                    'tx_store': np.int64, 'tx_customer': np.int64, 'tx_amount': np.float64,
+                },
+                convert={'tx_time': business_time},
+            )
+
+            added = int(transactions['tx_id'].size)
+            if added:
+                # Rows stamped before the calendar backfill have no date key yet
+                missing = transactions['tx_day'] == 0
+                transactions['tx_day'][missing] = _day_keys(transactions['tx_time'][missing])
+                item_join = select(
+                    TransactionItem.transaction_id, TransactionItem.product_id,
+                    TransactionItem.quantity, TransactionItem.total_price
+                ).join(Transaction, TransactionItem.transaction_id == Transaction.id).where(changed)
+                items = _read_columns(
+                    db,
+                    item_join,
+                    db.execute(select(func.count()).select_from(item_join.subquery())).scalar_one(),
+                    {
+                        'item_tx_id': np.int64, 'item_product': np.int64,
+                        'item_quantity': np.float64, 'item_price': np.float64,
+                    },
+                )
+                self._append(db, **transactions, **items)
+            self._seq = version
+
+            # Rows loaded before their month was archived are dropped with it
+            boundary = transaction_archive.archived_until(db, cached=False)
+            if boundary is not None and self._facts.tx_id.size:
+                self._facts = self._facts.since(np.datetime64(boundary, 'us'))
+
+            if self._dims is None:
+                self._dims = _Dimensions(db)
+            self._version = version
+            return added
+
+    def _redimension(self, db: Session) -> None:
+        """Reload the dimension maps and re-encode the facts' store and product indexes."""
+        old, dims = self._dims, _Dimensions(db)
+        facts = self._facts
+        if facts.tx_id.size:
+            updated = _Facts()
+            for name in vars(facts):
+                setattr(updated, name, getattr(facts, name))
+            updated.tx_store = _encode(dims.store_ids, old.store_ids[facts.tx_store])
+            updated.item_product = _encode(dims.product_ids, old.product_ids[facts.item_product])
+            self._facts = updated
+        self._dims = dims
+
+    def _append(
+        self,
+        db: Session,
+        tx_id: np.ndarray,
+        tx_time: np.ndarray,
+        tx_day: np.ndarray,
+        tx_store: np.ndarray,
+        tx_customer: np.ndarray,
+        tx_amount: np.ndarray,
+        item_tx_id: np.ndarray,
+        item_product: np.ndarray,
+        item_quantity: np.ndarray,
+        item_price: np.ndarray,
+    ) -> None:
+        """Concatenate new rows onto the facts; store and product ids are raw ids."""
+        if self._dims is None:
+            self._dims = _Dimensions(db)
+        elif not self._dims.knows(tx_store, item_product):
+            self._redimension(db)
+        dims, facts = self._dims, self._facts
+
+        order = np.argsort(tx_id)
+        offset = facts.tx_id.size
+        updated = _Facts()
+        updated.tx_id = np.concatenate([facts.tx_id, tx_id])
+        updated.tx_time = np.concatenate([facts.tx_time, tx_time])
+        updated.tx_day = np.concatenate([facts.tx_day, tx_day.astype(np.int32)])
+        updated.tx_store = np.concatenate([facts.tx_store, _encode(dims.store_ids, tx_store)])
+        updated.tx_customer = np.concatenate([facts.tx_customer, tx_customer])
+        updated.tx_amount = np.concatenate([facts.tx_amount, tx_amount])
+        updated.item_tx = np.concatenate([
+            facts.item_tx,
+            offset + order[np.searchsorted(tx_id, item_tx_id, sorter=order)]
+        ])
+        updated.item_product = np.concatenate([facts.item_product, _encode(dims.product_ids, item_product)])
+        updated.item_quantity = np.concatenate([facts.item_quantity, item_quantity])
+        updated.item_price = np.concatenate([facts.item_price, item_price])
+        self._facts = updated
+
+    def _snapshot(self, db: Session, start_date: datetime, end_date: datetime):
+        transaction_archive.check_hot(db, start_date)
+        self.refresh(db)
+        with self._lock:
+            facts, dims = self._facts, self._dims
+        tx_mask = (
+            (facts.tx_time >= np.datetime64(business_time(start_date), 'us'))
+            & (facts.tx_time < np.datetime64(business_time(end_date), 'us'))
+        )
+        return facts, dims, tx_mask, tx_mask[facts.item_tx]
+
+    def get_sales_by_region(self, db: Session, start_date: datetime, end_date: datetime) -> List[SalesByRegion]:
+        facts, dims, tx_mask, _ = self._snapshot(db, start_date, end_date)
+        size = dims.region_ids.size
+        stores = facts.tx_store[tx_mask]
+        regions = dims.store_region[stores]
+        sales = np.bincount(regions, weights=facts.tx_amount[tx_mask], minlength=size)
+        transactions = np.bincount(regions, minlength=size)
+        active_stores = np.bincount(dims.store_region[np.unique(stores)], minlength=size)
+
+        return [
+            SalesByRegion(
+                region_code=dims.region_code[i],
+                region_name=dims.region_name[i],
+                total_sales=float(sales[i]),
+                total_transactions=int(transactions[i]),
+                total_stores=int(active_stores[i])
+            ) for i in np.flatnonzero(transactions)
+        ]
+
+    def _item_breakdown(self, db: Session, start_date: datetime, end_date: datetime, group: str):
+        facts, dims, _, item_mask = self._snapshot(db, start_date, end_date)
+        products = facts.item_product[item_mask]
+        if group == 'brand':
+            groups, size = dims.product_brand[products], dims.brand_ids.size
+        elif group == 'category':
+            groups, size = dims.product_category[products], dims.category_ids.size
+        else:
+            groups, size = products, dims.product_ids.size
+
+        sales = np.bincount(groups, weights=facts.item_price[item_mask], minlength=size)
+        quantity = np.bincount(groups, weights=facts.item_quantity[item_mask], minlength=size)
+        transactions = _distinct_per_group(groups, facts.item_tx[item_mask], size)
+        return dims, sales, quantity, transactions
+
+    def get_sales_by_brand(self, db: Session, start_date: datetime, end_date: datetime) -> List[SalesByBrand]:
+        dims, sales, quantity, transactions = self._item_breakdown(db, start_date, end_date, 'brand')
+        return [
+            SalesByBrand(
+                brand_code=dims.brand_code[i],
+                brand_name=dims.brand_name[i],
+                total_sales=float(sales[i]),
+                total_quantity=float(quantity[i]),
+                total_transactions=int(transactions[i])
+            ) for i in np.flatnonzero(transactions)
+        ]
+
+    def get_sales_by_category(self, db: Session, start_date: datetime, end_date: datetime) -> List[SalesByCategory]:
+        dims, sales, quantity, transactions = self._item_breakdown(db, start_date, end_date, 'category')
+        return [
+            SalesByCategory(
+                category_code=dims.category_code[i],
+                category_name=dims.category_name[i],
+                total_sales=float(sales[i]),
+                total_quantity=float(quantity[i]),
+                total_transactions=int(transactions[i])
+            ) for i in np.flatnonzero(transactions)
+        ]
+
+    def get_top_selling_products(self, db: Session, start_date: datetime, end_date: datetime, limit: int = 10) -> List[TopSellingProduct]:
+        dims, sales, quantity, transactions = self._item_breakdown(db, start_date, end_date, 'product')
+        sold = np.flatnonzero(transactions)
+        top = sold[np.argsort(-sales[sold], kind='stable')[:limit]]
+        return [
+            TopSellingProduct(
+                sku=dims.product_sku[i],
+                product_name=dims.product_name[i],
+                brand_name=dims.brand_name[dims.product_brand[i]],
+                category_name=dims.category_name[dims.product_category[i]],
+                total_sales=float(sales[i]),
+                total_quantity=float(quantity[i]),
+                total_transactions=int(transactions[i])
+            ) for i in top
+        ]
+
+    def get_store_performance(self, db: Session, start_date: datetime, end_date: datetime) -> List[StorePerformance]:
+        return _models(StorePerformance, self.get_store_performance_columns(db, start_date, end_date))
+
+    def get_store_performance_columns(self, db: Session, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """get_store_performance as one array per StorePerformance field."""
+        facts, dims, tx_mask, _ = self._snapshot(db, start_date, end_date)
+        size = dims.store_ids.size
+        stores = facts.tx_store[tx_mask]
+        amounts = facts.tx_amount[tx_mask]
+        sales = np.bincount(stores, weights=amounts, minlength=size)
+        transactions = np.bincount(stores, minlength=size)
+
+        # Sort amounts within each store so percentiles are exact slices
+        order = np.lexsort((amounts, stores))
+        amounts, offsets = amounts[order], np.concatenate(([0], np.cumsum(transactions)))
+
+        active = np.flatnonzero(transactions)
+        percentiles = np.array([
+            np.quantile(amounts[offsets[i]:offsets[i + 1]], _BASKET_QUANTILES, method='lower')
+            for i in active
+        ]).reshape(-1, len(_BASKET_QUANTILES))
+        return {
+            'store_code': [dims.store_code[i] for i in active],
+            'store_name': [dims.store_name[i] for i in active],
+            'region_name': [dims.region_name[dims.store_region[i]] for i in active],
+            'total_sales': sales[active],
+            'total_transactions': transactions[active],
+            'avg_basket_size': sales[active] / transactions[active],
+            'p50_basket_size': percentiles[:, 0],
+            'p90_basket_size': percentiles[:, 1],
+            'p99_basket_size': percentiles[:, 2],
+            'sales_growth': [None] * active.size,
+        }
+
+    def get_transaction_summary(
+        self, db: Session, start_date: datetime, end_date: datetime, exact: bool = True
+    ) -> TransactionSummary:
+        # Distinct counts are always exact here; ``exact`` is accepted for parity
+        facts, _, tx_mask, item_mask = self._snapshot(db, start_date, end_date)
+        total_transactions = int(tx_mask.sum())
+        total_sales = float(facts.tx_amount[tx_mask].sum())
+        customers = facts.tx_customer[tx_mask]
+
+        return TransactionSummary(
+            total_transactions=total_transactions,
+            total_sales=total_sales,
+            avg_basket_size=total_sales / total_transactions if total_transactions else 0.0,
+            avg_items_per_transaction=(
+                int(item_mask.sum()) / total_transactions if total_transactions else 0.0
+            ),
+            total_customers=int(np.unique(customers[customers >= 0]).size),
+            total_products_sold=int(np.unique(facts.item_product[item_mask]).size)
+        )
+
+    def get_sales_trends(self, db: Session, start_date: datetime, end_date: datetime, granularity: str = 'day') -> List[SalesTrend]:
+        return _models(SalesTrend, self.get_sales_trend_columns(db, start_date, end_date, granularity))
+
+    def get_sales_trend_columns(
+        self, db: Session, start_date: datetime, end_date: datetime, granularity: str = 'day'
+    ) -> Dict[str, Any]:
+        """get_sales_trends as one array per SalesTrend field."""
+        facts, _, tx_mask, _ = self._snapshot(db, start_date, end_date)
+        days, day_index = np.unique(facts.tx_day[tx_mask], return_inverse=True)
+        bucket_column = _BUCKET_STARTS.get(granularity, 'calendar_date')
+        day_buckets = [calendar_row(key_to_date(int(key)))[bucket_column] for key in days]
+        buckets, bucket_of_day = np.unique(
+            np.array(day_buckets, dtype='datetime64[D]'), return_inverse=True
+        )
+        bucket_index = bucket_of_day[day_index]
+        sales = np.bincount(bucket_index, weights=facts.tx_amount[tx_mask], minlength=buckets.size)
+        transactions = np.bincount(bucket_index, minlength=buckets.size)
+
+        return {
+            'date': buckets.astype('datetime64[us]'),
+            'total_sales': sales,
+            'total_transactions': transactions,
+            'avg_basket_size': sales / transactions,
+        }
+
+    def get_dashboard(self, db: Session, start_date: datetime, end_date: datetime, limit: int = 10) -> RetailDashboard:
+        by_sales = attrgetter('total_sales')
+        return RetailDashboard(
+            sales_by_region=sorted(
+                self.get_sales_by_region(db, start_date, end_date), key=by_sales, reverse=True
+            ),
+            sales_by_brand=sorted(
+                self.get_sales_by_brand(db, start_date, end_date), key=by_sales, reverse=True
+            ),
+            sales_by_category=sorted(
+                self.get_sales_by_category(db, start_date, end_date), key=by_sales, reverse=True
+            ),
+            top_selling_products=self.get_top_selling_products(db, start_date, end_date, limit),
+            summary=self.get_transaction_summary(db, start_date, end_date)
+        )
+
+
+columnar_analytics = ColumnarAnalytics()
@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.retail import transaction
+from app.db.base import SessionLocal
+from app.schemas.retail import BulkTransactionResult, TransactionCreate
+
+
+class TransactionGroupCommit:
+    """Write-behind queue that commits transactions from many callers together.
+
+    ``create`` queues a transaction and blocks until the batch holding it is
+    committed. A background thread flushes the queue through
+    ``CRUDTransaction.create_bulk`` once ``max_batch`` records are waiting or
+    ``interval_ms`` after the first one arrived, so concurrent receipts share
+    one commit (and one fsync) instead of paying for their own.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int,
+        interval_ms: float,
+        max_queue: int,
+        timeout: float,
+    ):
+        self.max_batch = max_batch
+        self.interval = interval_ms / 1000
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._session_factory = session_factory
+        self._queue: Deque[Tuple[TransactionCreate, Future, float]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._max_queue_depth = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._records = 0
+        self._max_batch_size = 0
+        self._flush_seconds = 0.0
+        self._last_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def create(self, obj_in: TransactionCreate, timeout: Optional[float] = None) -> BulkTransactionResult:
+        """Queue ``obj_in`` and return its result once its batch is durable.
+
+        Raises ``concurrent.futures.TimeoutError`` if that takes longer than
+        ``timeout`` seconds (default ``self.timeout``). A record still queued
+        then is withdrawn; one already being flushed may yet be committed.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        future = self.submit(obj_in, timeout=deadline - time.monotonic())
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def submit(self, obj_in: TransactionCreate, timeout: Optional[float] = None) -> "Future[BulkTransactionResult]":
+        """Queue ``obj_in``; blocks while ``max_queue`` records are already waiting.
+
+        Raises ``concurrent.futures.TimeoutError`` if the queue stays full for
+        ``timeout`` seconds.
+        """
+        future: "Future[BulkTransactionResult]" = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Group commit queue is closed")
+            if not self._cond.wait_for(lambda: len(self._queue) < self.max_queue, timeout):
+                raise TimeoutError("Group commit queue is full")
+            self._queue.append((obj_in, future, time.perf_counter()))
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="transaction-group-commit", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+        return future
+
+    def close(self) -> None:
+        """Flush whatever is queued and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queue_depth = len(self._queue)
+        with self._stats_lock:
+            return {
+                "enabled": settings.GROUP_COMMIT_ENABLED,
+                "queue_depth": queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "batches": self._batches,
+                "failed_batches": self._failed_batches,
+                "records": self._records,
+                "avg_batch_size": self._records / self._batches if self._batches else 0.0,
+                "max_batch_size": self._max_batch_size,
+                "last_flush_ms": self._last_flush_seconds * 1000,
+                "avg_flush_ms": self._flush_seconds / self._batches * 1000 if self._batches else 0.0,
+                "max_flush_ms": self._max_flush_seconds * 1000,
+                "avg_wait_ms": self._wait_seconds / self._records * 1000 if self._records else 0.0,
+                "max_wait_ms": self._max_wait_seconds * 1000,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # Give other callers until the deadline to join this batch
+                deadline = time.monotonic() + self.interval
+                while len(self._queue) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch))]
+                self._cond.notify_all()  # wake callers blocked on a full queue
+            # Callers that timed out while queued have cancelled their futures
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[TransactionCreate, Future, float]]) -> None:
+        started = time.perf_counter()
+        db = None
+        try:
+            db = self._session_factory()
+            result = transaction.create_bulk(db, [obj_in for obj_in, _, _ in batch], chunk_size=len(batch))
+        except Exception as e:
+            if db is not None:
+                db.rollback()
+            failed, outcomes = True, [e] * len(batch)
+        else:
+            failed, outcomes = False, result.results
+        finally:
+            if db is not None:
+                db.close()
+
+        finished = time.perf_counter()
+        waits = [finished - enqueued for _, _, enqueued in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._failed_batches += failed
+            self._records += len(batch)
+            self._max_batch_size = max(self._max_batch_size, len(batch))
+            self._last_flush_seconds = finished - started
+            self._flush_seconds += self._last_flush_seconds
+            self._max_flush_seconds = max(self._max_flush_seconds, self._last_flush_seconds)
+            self._wait_seconds += sum(waits)
+            self._max_wait_seconds = max(self._max_wait_seconds, max(waits))
+
+        for (_, future, _), outcome in zip(batch, outcomes):
+            if failed:
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+transaction_group_commit = TransactionGroupCommit(
+    SessionLocal,
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+    interval_ms=settings.GROUP_COMMIT_INTERVAL_MS,
+    max_queue=settings.GROUP_COMMIT_MAX_QUEUE,
+    timeout=settings.GROUP_COMMIT_TIMEOUT_SECONDS,
+)
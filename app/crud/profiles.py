@@ -0,0 +1,355 @@
+"""
+Eager-loading profiles and sparse fieldsets for the list endpoints.
+
+A profile walks a response schema's nested models alongside the ORM model's
+relationships, so a query loads exactly the relations its response
+serializes: many-to-one relations are joined into the SELECT and collections
+come from one extra ``SELECT ... IN`` per level. Relations a client leaves
+out of ``expand`` or ``fields`` are not loaded at all and serialize as null
+(or ``[]``). With RAISE_ON_LAZY_LOAD every other relationship raises instead
+of lazy loading, so a response that would issue a query per row fails loudly.
+
+List endpoints go further with ``LoadProfile.project``: the same plan runs as
+a column projection, and rows become response models without ORM entities.
+With RAISE_ON_LAZY_LOAD a projection also fails on any statement besides the
+SELECTs it plans, one per level and batch of parent keys.
+"""
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, get_args
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import event, exc, inspect, orm
+from sqlalchemy.orm import Query, aliased
+
+from app.core.config import settings
+from app.models import analytics as analytics_models
+from app.models import retail as models
+from app.schemas import analytics as analytics_schemas
+from app.schemas import retail as schemas
+from app.schemas.pagination import CursorPage
+
+# Parent keys per SELECT ... IN of a projected collection
+_IN_BATCH = 1000
+# Execution option marking a projection's own SELECTs
+_PLANNED = "profile_projection"
+
+EXPAND_DESCRIPTION = (
+    "Comma-separated relations to load and return, e.g. store,items.product; "
+    "others come back null or empty. Defaults to all of them"
+)
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return, dotted for nested ones, e.g. "
+    "id,total_amount,store.name. Defaults to all of them"
+)
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The response model inside ``Optional[X]`` / ``List[X]``, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class _Relation:
+    def __init__(self, attribute, uselist: bool, schema: Type[BaseModel]):
+        self.attribute = attribute
+        self.uselist = uselist
+        self.schema = schema
+
+
+class _Node:
+    """One entity of a projection: its columns' positions in the row and its joined relations."""
+
+    def __init__(self, name: str, schema: Type[BaseModel], children: List[str], relations: Dict[str, _Relation]):
+        self.name = name
+        self.schema = schema
+        names = [child.rpartition(".")[2] for child in children]
+        # Relations default to null/[] until loaded
+        self.empty = {name: None for name in names}
+        self.lists = [name for name, child in zip(names, children) if relations[child].uselist]
+        self.fields: List[str] = []
+        self.start = self.pk = 0
+        self.joined: List["_Node"] = []
+        # Rows of the same primary key share one response model, unless a
+        # collection still has to be appended to it
+        self.shared = True
+        self.cache: Dict[Any, BaseModel] = {}
+
+    def build(self, row, built: Dict["_Node", Dict[str, Any]]) -> Any:
+        key = row[self.pk]
+        if key is None:
+            return None
+        if self.shared and key in self.cache:
+            return self.cache[key]
+        values = dict(zip(self.fields, row[self.start:self.pk]))
+        values.update(self.empty)
+        for name in self.lists:
+            values[name] = []
+        for joined in self.joined:
+            values[joined.name] = joined.build(row, built)
+        if not self.shared:
+            built[self] = values
+            return values
+        model = self.cache[key] = self.schema.model_validate(values)
+        return model
+
+
+class FieldSelection:
+    """The relations to load for one request, and the fields to return."""
+
+    def __init__(self, profile: "LoadProfile", expand: FrozenSet[str], include: Optional[Dict[str, Any]]):
+        self.profile = profile
+        self.expand = expand
+        self.include = include
+
+    def dump_json(self, result: Any) -> bytes:
+        """JSON of a list or cursor page of response models, keeping only the selected fields."""
+        return self.profile.dump_json(result, self.include)
+
+
+class LoadProfile:
+    """Loader options for serializing ``model`` rows as ``schema``.
+
+    Relations are named by dotted path from the root (``store.city.province``);
+    ``default_expand`` is what a request without ``expand`` gets, all of them
+    unless given.
+    """
+
+    def __init__(self, model, schema: Type[BaseModel], default_expand: Optional[Iterable[str]] = None):
+        self.model = model
+        self.schema = schema
+        self.relations: Dict[str, _Relation] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._walk(model, schema, "")
+        self._adapter = TypeAdapter(List[schema])
+        self._page_adapter = TypeAdapter(CursorPage[schema])
+        self.default_expand = (
+            frozenset(self.relations) if default_expand is None else self._closed(default_expand)
+        )
+
+    def _walk(self, model, schema: Type[BaseModel], parent: str) -> None:
+        relationships = inspect(model).relationships
+        for name, field in schema.model_fields.items():
+            nested = _nested_schema(field.annotation)
+            if nested is None or name not in relationships:
+                continue
+            relationship = relationships[name]
+            path = f"{parent}.{name}" if parent else name
+            self.relations[path] = _Relation(getattr(model, name), relationship.uselist, nested)
+            self._children.setdefault(parent, []).append(path)
+            self._walk(relationship.mapper.class_, nested, path)
+
+    def _closed(self, paths: Iterable[str]) -> FrozenSet[str]:
+        """Validate relation paths and add their ancestors."""
+        closed = set()
+        for path in paths:
+            if path not in self.relations:
+                raise ValueError(f"Unknown relation in expand: {path}")
+            while path:
+                closed.add(path)
+                path = path.rpartition(".")[0]
+        return frozenset(closed)
+
+    def options(self, expand: Optional[Iterable[str]] = None) -> List[Any]:
+        """Loader options for ``Query.options``: load ``expand`` (default: the
+        profile default), skip the schema's other relations."""
+        expanded = self.default_expand if expand is None else self._closed(expand)
+        return self._options(expanded, "", None)
+
+    def _options(self, expanded: FrozenSet[str], parent: str, chain) -> List[Any]:
+        # Top-level options come from sqlalchemy.orm, nested ones chain off their parent's loader
+        source = orm if chain is None else chain
+        options = []
+        for path in self._children.get(parent, ()):
+            relation = self.relations[path]
+            if path in expanded:
+                strategy = "selectinload" if relation.uselist else "joinedload"
+                loader = getattr(source, strategy)(relation.attribute)
+                options.append(loader)
+                options.extend(self._options(expanded, path, loader))
+            else:
+                options.append(source.noload(relation.attribute))
+        if settings.RAISE_ON_LAZY_LOAD:
+            options.append(source.raiseload("*", sql_only=True))
+        return options
+
+    def project(self, query: Query, expand: Optional[Iterable[str]] = None) -> List[BaseModel]:
+        """Run ``query`` (over ``model``) as a column projection and return response models.
+
+        Selects only the schema's columns, with expanded many-to-one relations
+        outer-joined into the same SELECT and collections read with one
+        ``SELECT ... IN`` per level, so no ORM entities are hydrated or kept in
+        the session. The rows are validated into ``schema`` in one call.
+        """
+        expanded = self.default_expand if expand is None else self._closed(expand)
+        if not settings.RAISE_ON_LAZY_LOAD:
+            rows = self._project(query, self.model, "", expanded)
+            return self._adapter.validate_python([row for row, _ in rows])
+
+        def unplanned(state) -> None:
+            if not state.execution_options.get(_PLANNED):
+                raise exc.InvalidRequestError(
+                    f"{self.schema.__name__} projection issued an unplanned statement: {state.statement}"
+                )
+
+        event.listen(query.session, "do_orm_execute", unplanned)
+        try:
+            rows = self._project(query, self.model, "", expanded)
+            return self._adapter.validate_python([row for row, _ in rows])
+        finally:
+            event.remove(query.session, "do_orm_execute", unplanned)
+
+    def _project(self, query: Query, entity, root: str, expanded: FrozenSet[str], key=None):
+        """``(dict, key value)`` per row of ``query``; ``key`` is an extra column to return."""
+        columns: List[Any] = []
+        nodes: List[_Node] = []
+        # (collection path, node holding it, parent key column)
+        collections: List[Tuple[str, _Node, int]] = []
+        # LIMIT/OFFSET may already be applied; joining many-to-one relations
+        # cannot change the row count, so the legacy Query assertion is moot
+        query = query.enable_assertions(False)
+
+        def visit(path: str, entity, schema: Type[BaseModel]) -> _Node:
+            nonlocal query
+            mapper = inspect(entity).mapper
+            children = self._children.get(path, [])
+            node = _Node(path.rpartition(".")[2], schema, children, self.relations)
+            node.fields = [name for name in schema.model_fields if name not in node.empty]
+            node.start = len(columns)
+            columns.extend(getattr(entity, name) for name in node.fields)
+            node.pk = len(columns)
+            columns.append(getattr(entity, mapper.get_property_by_column(mapper.primary_key[0]).key))
+            nodes.append(node)
+            for child in children:
+                if child not in expanded:
+                    continue
+                relation = self.relations[child]
+                prop = relation.attribute.property
+                if relation.uselist:
+                    local = prop.local_remote_pairs[0][0]
+                    columns.append(getattr(entity, mapper.get_property_by_column(local).key))
+                    collections.append((child, node, len(columns) - 1))
+                    node.shared = False
+                    continue
+                target = aliased(prop.mapper.class_)
+                query = query.outerjoin(target, getattr(entity, prop.key).of_type(target))
+                joined = visit(child, target, relation.schema)
+                node.joined.append(joined)
+                node.shared = node.shared and joined.shared
+            return node
+
+        top = visit(root, entity, self.relations[root].schema if root else self.schema)
+        top.shared = False
+        if key is not None:
+            columns.append(key)
+
+        rows = []
+        parents: Dict[str, List[Tuple[Dict[str, Any], Any]]] = {path: [] for path, _, _ in collections}
+        for row in query.with_entities(*columns).execution_options(**{_PLANNED: True}):
+            built: Dict[_Node, Dict[str, Any]] = {}
+            rows.append((top.build(row, built), row[-1] if key is not None else None))
+            for path, node, index in collections:
+                if node in built:
+                    parents[path].append((built[node], row[index]))
+
+        for path, _, _ in collections:
+            self._attach(query.session, path, parents[path], expanded)
+        return rows
+
+    def _attach(self, session, path: str, parents: List[Tuple[Dict[str, Any], Any]], expanded: FrozenSet[str]) -> None:
+        """Load the ``path`` collection of ``parents`` and append it to their dicts."""
+        prop = self.relations[path].attribute.property
+        model = prop.mapper.class_
+        remote = prop.local_remote_pairs[0][1]
+        name = path.rpartition(".")[2]
+        by_key: Dict[Any, List[Dict[str, Any]]] = {}
+        for parent, value in parents:
+            by_key.setdefault(value, []).append(parent)
+        keys = list(by_key)
+        for offset in range(0, len(keys), _IN_BATCH):
+            query = session.query(model).filter(remote.in_(keys[offset:offset + _IN_BATCH])).order_by(
+                *(prop.order_by or prop.mapper.primary_key)
+            )
+            for child, value in self._project(query, model, path, expanded, key=remote):
+                for parent in by_key[value]:
+                    parent[name].append(child)
+
+    def dump_json(self, result: Any, include: Optional[Dict[str, Any]] = None) -> bytes:
+        """Serialize a list or cursor page of response models (as returned by
+        ``project``) to JSON with the schema's compiled serializer."""
+        if isinstance(result, CursorPage):
+            page = CursorPage[self.schema](items=result.items, next_cursor=result.next_cursor)
+            return self._page_adapter.dump_json(
+                page, include=None if include is None else {"items": {"__all__": include}, "next_cursor": True}
+            )
+        return self._adapter.dump_json(result, include=None if include is None else {"__all__": include})
+
+    def select(self, expand: Optional[str] = None, fields: Optional[str] = None) -> FieldSelection:
+        """Parse a request's ``expand``/``fields`` parameters.
+
+        Relations outside ``fields`` are not loaded even when expanded.
+        Raises ValueError for unknown relations or fields.
+        """
+        expanded = self.default_expand if expand is None else self._closed(_split(expand))
+        paths = _split(fields) if fields else []
+        if not paths:
+            return FieldSelection(self, expanded, None)
+
+        include = self._include(paths)
+        expanded = frozenset(
+            relation for relation in expanded
+            if any(
+                path == relation or path.startswith(relation + ".") or relation.startswith(path + ".")
+                for path in paths
+            )
+        )
+        return FieldSelection(self, expanded, include)
+
+    def _include(self, paths: List[str]) -> Dict[str, Any]:
+        """Build a pydantic ``include`` tree from dotted field paths."""
+        tree: Dict[str, Any] = {}
+        for path in paths:
+            schema, node, prefix = self.schema, tree, ""
+            parts = path.split(".")
+            for depth, part in enumerate(parts):
+                relation = self.relations.get(prefix + part)
+                if part not in schema.model_fields or (depth < len(parts) - 1 and relation is None):
+                    raise ValueError(f"Unknown field: {path}")
+                if depth == len(parts) - 1:
+                    node[part] = True
+                    break
+                if node.get(part) is True:
+                    break  # the whole relation is already selected
+                node = node.setdefault(part, {})
+                schema, prefix = relation.schema, prefix + part + "."
+        return self._lists(tree, "")
+
+    def _lists(self, tree: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+        """Wrap the selections under collections in ``__all__``, as pydantic expects."""
+        include: Dict[str, Any] = {}
+        for name, selected in tree.items():
+            if selected is True:
+                include[name] = True
+                continue
+            nested = self._lists(selected, prefix + name + ".")
+            include[name] = {"__all__": nested} if self.relations[prefix + name].uselist else nested
+        return include
+
+
+# One profile per response schema served by a list endpoint
+transaction_profile = LoadProfile(models.Transaction, schemas.Transaction)
+product_profile = LoadProfile(models.Product, schemas.Product)
+store_profile = LoadProfile(models.Store, schemas.Store)
+province_profile = LoadProfile(models.Province, schemas.Province)
+city_profile = LoadProfile(models.City, schemas.City)
+customer_profile = LoadProfile(models.Customer, schemas.Customer)
+analytics_transaction_profile = LoadProfile(
+    analytics_models.Transaction, analytics_schemas.TransactionResponse
+)
@@ -1,21 +1,100 @@
-from typing import List, Optional, Dict, Any
+import threading
+import time as clock
+from collections import Counter
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, extract
-from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, desc, and_, extract, insert, select, update, literal, case, null, union_all
+from datetime import date, datetime, time, timedelta
+from operator import attrgetter, itemgetter
 
+from app.core.cache import LRUCache
+from app.core.calendar import business_date, calendar_row, date_key
+from app.core.config import settings
+from app.core.pagination import keyset_page
+from app.core.sketches import hll_estimate, hll_register, quantile_bucket, quantile_estimates
+from app.core.tabular import model_columns
+from app.crud.archive import transaction_archive
+from app.crud.profiles import (
+    city_profile, customer_profile, product_profile, province_profile, store_profile,
+    transaction_profile
+)
+from app.db.upsert import upsert
+from app.db.versions import REFERENCE, TRANSACTIONS, bump_version, current_version
 from app.models.retail import (
     Region, Province, City, Store, Brand, Category, Product, 
-    Customer, Transaction, TransactionItem, Inventory
+    Customer, Transaction, TransactionCode, TransactionItem, Inventory,
+    DailyStoreSales, DailyProductSales, DailyGroupSales, DailySketchRegister,
+    DailyBasketBucket, CalendarDay
 )
 from app.schemas.retail import (
     RegionCreate, ProvinceCreate, CityCreate, StoreCreate,
     BrandCreate, CategoryCreate, ProductCreate, CustomerCreate,
     TransactionCreate, SalesByRegion, SalesByBrand, SalesByCategory,
-    TopSellingProduct, StorePerformance, TransactionSummary, SalesTrend
+    TopSellingProduct, StorePerformance, TransactionSummary, SalesTrend,
+    RetailDashboard, BulkTransactionResult, BulkTransactionResponse,
+    IngestError, StreamIngestResponse,
+    Province as ProvinceResponse, City as CityResponse, Store as StoreResponse,
+    Product as ProductResponse, Customer as CustomerResponse, Transaction as TransactionResponse
 )
 
 
-class CRUDRegion:
+# Rows per IN (...) lookup of upserted ids
+_LOOKUP_BATCH = 1000
+
+
+class CRUDReference:
+    """Create-or-update of reference data by its natural key.
+
+    Writes go through one ``INSERT ... ON DUPLICATE KEY UPDATE`` (MySQL) or
+    ``ON CONFLICT DO UPDATE`` statement per 1000 rows, so concurrent writers
+    of the same code update one row instead of racing a lookup.
+    """
+    model = None
+    key = "code"
+
+    def upsert(self, db: Session, obj_in) -> Any:
+        """Insert ``obj_in`` or overwrite the row with the same key."""
+        self._upsert_rows(db, [obj_in.model_dump()])
+        db.commit()
+        reference_payloads.clear()
+        return db.query(self.model).filter(getattr(self.model, self.key) == getattr(obj_in, self.key)).one()
+
+    def upsert_many(self, db: Session, objs_in: Iterable) -> Dict[str, int]:
+        """Upsert ``objs_in`` in one transaction and return the id of each key.
+
+        When a key repeats, the last record wins.
+        """
+        rows = {}
+        for obj_in in objs_in:
+            row = obj_in.model_dump()
+            rows[row[self.key]] = row
+        if not rows:
+            return {}
+        self._upsert_rows(db, list(rows.values()))
+        db.commit()
+        reference_payloads.clear()
+
+        keys = list(rows)
+        column = getattr(self.model, self.key)
+        ids: Dict[str, int] = {}
+        for offset in range(0, len(keys), _LOOKUP_BATCH):
+            ids.update(db.execute(
+                select(column, self.model.id).where(column.in_(keys[offset:offset + _LOOKUP_BATCH]))
+            ).all())
+        return ids
+
+    def _upsert_rows(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        replace = [column for column in rows[0] if column != self.key]
+        upsert(db, self.model, rows, index_elements=(self.key,), replace=replace)
+        # Tells the columnar engine to reload its dimension maps
+        bump_version(db, REFERENCE)
+
+
+class CRUDRegion(CRUDReference):
+    model = Region
+
     def get_all(self, db: Session) -> List[Region]:
         return db.query(Region).all()
     
@@ -23,104 +102,154 @@ class CRUDRegion:
         return db.query(Region).filter(Region.code == code).first()
     
     def create(self, db: Session, obj_in: RegionCreate) -> Region:
-        db_obj = Region(**obj_in.dict())
+        db_obj = Region(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDProvince:
-    def get_by_region(self, db: Session, region_id: int) -> List[Province]:
-        return db.query(Province).filter(Province.region_id == region_id).all()
+class CRUDProvince(CRUDReference):
+    model = Province
+
+    def get_by_region(
+        self, db: Session, region_id: int, expand: Optional[Iterable[str]] = None
+    ) -> List[ProvinceResponse]:
+        return province_profile.project(
+            db.query(Province).filter(Province.region_id == region_id), expand
+        )
     
     def create(self, db: Session, obj_in: ProvinceCreate) -> Province:
-        db_obj = Province(**obj_in.dict())
+        db_obj = Province(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDCity:
-    def get_by_province(self, db: Session, province_id: int) -> List[City]:
-        return db.query(City).filter(City.province_id == province_id).all()
+class CRUDCity(CRUDReference):
+    model = City
+
+    def get_by_province(
+        self, db: Session, province_id: int, expand: Optional[Iterable[str]] = None
+    ) -> List[CityResponse]:
+        return city_profile.project(db.query(City).filter(City.province_id == province_id), expand)
     
     def create(self, db: Session, obj_in: CityCreate) -> City:
-        db_obj = City(**obj_in.dict())
+        db_obj = City(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDStore:
-    def get_all(self, db: Session) -> List[Store]:
-        return db.query(Store).filter(Store.is_active == True).all()
+class CRUDStore(CRUDReference):
+    model = Store
+
+    def get_all(self, db: Session, expand: Optional[Iterable[str]] = None) -> List[StoreResponse]:
+        return store_profile.project(db.query(Store).filter(Store.is_active == True), expand)
     
-    def get_by_region(self, db: Session, region_id: int) -> List[Store]:
-        return db.query(Store).filter(
-            and_(Store.region_id == region_id, Store.is_active == True)
-        ).all()
+    def get_by_region(
+        self, db: Session, region_id: int, expand: Optional[Iterable[str]] = None
+    ) -> List[StoreResponse]:
+        return store_profile.project(
+            db.query(Store).filter(and_(Store.region_id == region_id, Store.is_active == True)), expand
+        )
     
     def create(self, db: Session, obj_in: StoreCreate) -> Store:
-        db_obj = Store(**obj_in.dict())
+        db_obj = Store(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDBrand:
+class CRUDBrand(CRUDReference):
+    model = Brand
+
     def get_all(self, db: Session) -> List[Brand]:
         return db.query(Brand).all()
     
     def create(self, db: Session, obj_in: BrandCreate) -> Brand:
-        db_obj = Brand(**obj_in.dict())
+        db_obj = Brand(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDCategory:
+class CRUDCategory(CRUDReference):
+    model = Category
+
     def get_all(self, db: Session) -> List[Category]:
         return db.query(Category).all()
     
     def create(self, db: Session, obj_in: CategoryCreate) -> Category:
-        db_obj = Category(**obj_in.dict())
+        db_obj = Category(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDProduct:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
-        return db.query(Product).filter(Product.is_active == True).offset(skip).limit(limit).all()
+class CRUDProduct(CRUDReference):
+    model = Product
+    key = "sku"
+
+    def get_all(
+        self, db: Session, skip: int = 0, limit: int = 100, expand: Optional[Iterable[str]] = None
+    ) -> List[ProductResponse]:
+        return product_profile.project(
+            db.query(Product).filter(Product.is_active == True).offset(skip).limit(limit), expand
+        )
     
-    def get_by_category(self, db: Session, category_id: int) -> List[Product]:
-        return db.query(Product).filter(
-            and_(Product.category_id == category_id, Product.is_active == True)
-        ).all()
+    def get_page(
+        self, db: Session, cursor: Optional[str] = None, limit: int = 100,
+        expand: Optional[Iterable[str]] = None
+    ) -> Tuple[List[ProductResponse], Optional[str]]:
+        """Active products in id order after ``cursor``; returns the page and the next cursor."""
+        return keyset_page(
+            db.query(Product).filter(Product.is_active == True), [(Product.id, False)], cursor, limit,
+            key=lambda p: (p.id,), fetch=lambda query: product_profile.project(query, expand)
+        )
+    
+    def get_by_category(
+        self, db: Session, category_id: int, expand: Optional[Iterable[str]] = None
+    ) -> List[ProductResponse]:
+        return product_profile.project(
+            db.query(Product).filter(and_(Product.category_id == category_id, Product.is_active == True)),
+            expand
+        )
     
     def create(self, db: Session, obj_in: ProductCreate) -> Product:
-        db_obj = Product(**obj_in.dict())
+        db_obj = Product(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
 
-class CRUDCustomer:
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Customer]:
-        return db.query(Customer).offset(skip).limit(limit).all()
+class CRUDCustomer(CRUDReference):
+    model = Customer
+    key = "customer_code"
+
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[CustomerResponse]:
+        return customer_profile.project(db.query(Customer).offset(skip).limit(limit))
+    
+    def get_page(
+        self, db: Session, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[CustomerResponse], Optional[str]]:
+        """Customers in id order after ``cursor``; returns the page and the next cursor."""
+        return keyset_page(
+            db.query(Customer), [(Customer.id, False)], cursor, limit,
+            key=lambda c: (c.id,), fetch=customer_profile.project
+        )
     
     def get_by_code(self, db: Session, customer_code: str) -> Optional[Customer]:
         return db.query(Customer).filter(Customer.customer_code == customer_code).first()
     
     def create(self, db: Session, obj_in: CustomerCreate) -> Customer:
-        db_obj = Customer(**obj_in.dict())
+        db_obj = Customer(**obj_in.model_dump())
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -128,37 +257,738 @@ class CRUDCustomer:
 
 
 class CRUDTransaction:
-    def get_recent(self, db: Session, days: int = 30, skip: int = 0, limit: int = 100) -> List[Transaction]:
+    # By default a list reads in two queries: the transaction columns with
+    # store/customer joined, then its items with their products
+    def get_recent(
+        self, db: Session, days: int = 30, skip: int = 0, limit: int = 100,
+        expand: Optional[Iterable[str]] = None
+    ) -> List[TransactionResponse]:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        return db.query(Transaction).filter(
-            Transaction.transaction_date >= cutoff_date
-        ).order_by(desc(Transaction.transaction_date)).offset(skip).limit(limit).all()
+        return transaction_profile.project(
+            db.query(Transaction).filter(
+                Transaction.transaction_date >= cutoff_date
+            ).order_by(desc(Transaction.transaction_date)).offset(skip).limit(limit),
+            expand
+        )
+    
+    def get_recent_page(
+        self, db: Session, days: int = 30, cursor: Optional[str] = None, limit: int = 100,
+        expand: Optional[Iterable[str]] = None
+    ) -> Tuple[List[TransactionResponse], Optional[str]]:
+        """Newest-first ``get_recent`` after ``cursor``; returns the page and the next cursor.
+        
+        Keyed on (transaction_date, id), served by ix_transactions_date_id.
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        return keyset_page(
+            db.query(Transaction).filter(Transaction.transaction_date >= cutoff_date),
+            [(Transaction.transaction_date, True), (Transaction.id, True)], cursor, limit,
+            key=attrgetter('transaction_date', 'id'),
+            fetch=lambda query: transaction_profile.project(query, expand)
+        )
+    
+    def get(self, db: Session, id: int) -> Optional[Transaction]:
+        """Load a transaction with everything its response schema reads."""
+        return db.query(Transaction).options(*transaction_profile.options()).filter(
+            Transaction.id == id
+        ).first()
     
     def create(self, db: Session, obj_in: TransactionCreate) -> Transaction:
         # Create transaction
-        transaction_data = obj_in.dict()
+        transaction_data = obj_in.model_dump()
         items_data = transaction_data.pop('items', [])
         
         db_transaction = Transaction(**transaction_data)
+        db_transaction.date_key = calendar.ensure_day(
+            db, business_date(db_transaction.transaction_date)
+        )
+        sales_rollup.apply_transaction(db, db_transaction, items_data)
+        # Taken just before the inserts: the version row stays locked until commit
+        db_transaction.change_seq = bump_version(db)
         db.add(db_transaction)
         db.flush()  # Flush to get the ID
+        # Claims the code; a duplicate fails here even on partitioned tables
+        db.add(TransactionCode(
+            transaction_code=db_transaction.transaction_code,
+            transaction_id=db_transaction.id,
+            transaction_date=db_transaction.transaction_date
+        ))
+        
+        # Create transaction items in one statement
+        if items_data:
+            db.execute(insert(TransactionItem).values([
+                {
+                    'transaction_id': db_transaction.id,
+                    'transaction_date': db_transaction.transaction_date,
+                    **item_data
+                }
+                for item_data in items_data
+            ]))
+        
+        db.commit()
+        calendar.remember(db_transaction.date_key)
+        analytics.bump_version()
+        # Reload with the response's relationships instead of lazy loading
+        # them one by one; item ids and created_at come from the database
+        return self.get(db, db_transaction.id)
+    
+    def create_bulk(
+        self, db: Session, objs_in: List[TransactionCreate], chunk_size: int = 1000
+    ) -> BulkTransactionResponse:
+        """Insert many transactions with multi-row INSERTs, committing per chunk.
+        
+        Rows that reuse a transaction code or reference an unknown store,
+        customer or product are reported as failed without failing the rest of
+        their chunk. If a chunk still hits an integrity error (e.g. a code
+        inserted concurrently), its rows are retried one by one.
+        """
+        results: List[Optional[BulkTransactionResult]] = [None] * len(objs_in)
+        seen_codes: Set[str] = set()
+        for offset in range(0, len(objs_in), chunk_size):
+            chunk = list(enumerate(objs_in[offset:offset + chunk_size], start=offset))
+            valid = self._validate_chunk(db, chunk, seen_codes, results)
+            if not valid:
+                continue
+            
+            try:
+                created = self._insert_chunk(db, valid)
+            except IntegrityError:
+                db.rollback()
+                created = {}
+                for row in valid:
+                    try:
+                        created.update(self._insert_chunk(db, [row]))
+                    except IntegrityError as e:
+                        db.rollback()
+                        results[row[0]] = BulkTransactionResult(
+                            index=row[0],
+                            transaction_code=row[1].transaction_code,
+                            status='failed',
+                            error=str(e.orig)
+                        )
+            for index, obj_in in valid:
+                if index in created:
+                    results[index] = BulkTransactionResult(
+                        index=index,
+                        transaction_code=obj_in.transaction_code,
+                        status='created',
+                        id=created[index]
+                    )
+        
+        analytics.bump_version()
+        created_count = sum(1 for r in results if r.status == 'created')
+        return BulkTransactionResponse(
+            created=created_count,
+            failed=len(results) - created_count,
+            results=results
+        )
+    
+    def _validate_chunk(
+        self,
+        db: Session,
+        chunk: List[Tuple[int, TransactionCreate]],
+        seen_codes: Set[str],
+        results: List[Optional[BulkTransactionResult]],
+    ) -> List[Tuple[int, TransactionCreate]]:
+        """Record failures for rows that cannot insert; return the rest."""
+        codes = [obj_in.transaction_code for _, obj_in in chunk]
+        existing_codes = set(db.execute(
+            select(TransactionCode.transaction_code).where(TransactionCode.transaction_code.in_(codes))
+        ).scalars())
+        store_ids = set(db.execute(
+            select(Store.id).where(Store.id.in_({obj_in.store_id for _, obj_in in chunk}))
+        ).scalars())
+        customer_ids = set(db.execute(
+            select(Customer.id).where(Customer.id.in_({
+                obj_in.customer_id for _, obj_in in chunk if obj_in.customer_id is not None
+            }))
+        ).scalars())
+        product_ids = set(db.execute(
+            select(Product.id).where(Product.id.in_({
+                item.product_id for _, obj_in in chunk for item in obj_in.items
+            }))
+        ).scalars())
         
-        # Create transaction items
-        for item_data in items_data:
-            db_item = TransactionItem(
-                transaction_id=db_transaction.id,
+        valid = []
+        for index, obj_in in chunk:
+            unknown_products = sorted({item.product_id for item in obj_in.items} - product_ids)
+            if obj_in.transaction_code in seen_codes:
+                error = "Duplicate transaction_code in this upload"
+            elif obj_in.transaction_code in existing_codes:
+                error = "Transaction code already exists"
+            elif obj_in.store_id not in store_ids:
+                error = f"Unknown store_id {obj_in.store_id}"
+            elif obj_in.customer_id is not None and obj_in.customer_id not in customer_ids:
+                error = f"Unknown customer_id {obj_in.customer_id}"
+            elif unknown_products:
+                error = f"Unknown product_id {', '.join(map(str, unknown_products))}"
+            else:
+                error = None
+            seen_codes.add(obj_in.transaction_code)
+            
+            if error:
+                results[index] = BulkTransactionResult(
+                    index=index,
+                    transaction_code=obj_in.transaction_code,
+                    status='failed',
+                    error=error
+                )
+            else:
+                valid.append((index, obj_in))
+        return valid
+    
+    def _insert_chunk(self, db: Session, chunk: List[Tuple[int, TransactionCreate]]) -> Dict[int, int]:
+        """Insert a chunk of transactions and commit; return the new id per row index."""
+        headers: List[Dict[str, Any]] = []
+        receipts: List[Tuple[Transaction, List[Dict[str, Any]]]] = []
+        days: Dict[int, date] = {}
+        for _, obj_in in chunk:
+            header = obj_in.model_dump()
+            items_data = header.pop('items', [])
+            day = business_date(header['transaction_date'])
+            header['date_key'] = date_key(day)
+            days[header['date_key']] = day
+            headers.append(header)
+            receipts.append((Transaction(**header), items_data))
+        
+        calendar.ensure_days(db, days.values())
+        sales_rollup.apply_transactions(db, receipts)
+        # Taken just before the inserts: the version row stays locked until commit
+        seq = bump_version(db)
+        db.execute(insert(Transaction).values([{**header, 'change_seq': seq} for header in headers]))
+        # Multi-row INSERTs only report one id, so map codes back to ids; the
+        # version picks out this chunk's rows even if another writer stored
+        # the same code, and the code insert below then fails the chunk
+        ids = dict(db.execute(
+            select(Transaction.transaction_code, Transaction.id).where(and_(
+                Transaction.change_seq == seq,
+                Transaction.transaction_code.in_([header['transaction_code'] for header in headers])
+            ))
+        ).all())
+        db.execute(insert(TransactionCode).values([
+            {
+                'transaction_code': header['transaction_code'],
+                'transaction_id': ids[header['transaction_code']],
+                'transaction_date': header['transaction_date']
+            }
+            for header in headers
+        ]))
+        item_rows = [
+            {
+                'transaction_id': ids[header['transaction_code']],
+                'transaction_date': header['transaction_date'],
                 **item_data
+            }
+            for header, (_, items_data) in zip(headers, receipts)
+            for item_data in items_data
+        ]
+        for offset in range(0, len(item_rows), 1000):
+            db.execute(insert(TransactionItem).values(item_rows[offset:offset + 1000]))
+        db.commit()
+        for key in days:
+            calendar.remember(key)
+        return {index: ids[obj_in.transaction_code] for index, obj_in in chunk}
+
+
+class TransactionStreamIngest:
+    """Validates NDJSON transaction records one line at a time and writes
+    them through ``CRUDTransaction.create_bulk`` in bounded batches.
+    
+    Only the current batch and the failures are kept, so memory does not
+    grow with the size of the upload.
+    """
+    
+    MAX_REPORTED_ERRORS = 1000
+    
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._batch: List[TransactionCreate] = []
+        self._batch_lines: List[int] = []
+        self._report = StreamIngestResponse(lines=0, created=0, failed=0, batches=0, errors=[])
+    
+    def add(self, line_number: int, line: Optional[bytes]) -> bool:
+        """Validate one line; return True once the batch is full and should be flushed.
+        
+        ``line`` is None for a line that was too long to buffer.
+        """
+        self._report.lines = line_number
+        if line is None:
+            self._fail(line_number, None, "Line too long")
+            return False
+        if not line.strip():
+            return False
+        try:
+            self._batch.append(TransactionCreate.model_validate_json(line))
+        except ValidationError as e:
+            self._fail(line_number, None, '; '.join(
+                f"{'.'.join(map(str, err['loc'])) or 'record'}: {err['msg']}" for err in e.errors()
+            ))
+            return False
+        self._batch_lines.append(line_number)
+        return len(self._batch) >= self.batch_size
+    
+    def flush(self, db: Session) -> None:
+        if not self._batch:
+            return
+        result = transaction.create_bulk(db, self._batch, chunk_size=self.batch_size)
+        self._report.batches += 1
+        self._report.created += result.created
+        for r in result.results:
+            if r.status != 'created':
+                self._fail(self._batch_lines[r.index], r.transaction_code, r.error)
+        self._batch, self._batch_lines = [], []
+    
+    def report(self) -> StreamIngestResponse:
+        return self._report
+    
+    def _fail(self, line_number: int, transaction_code: Optional[str], error: str) -> None:
+        self._report.failed += 1
+        if len(self._report.errors) < self.MAX_REPORTED_ERRORS:
+            self._report.errors.append(
+                IngestError(line=line_number, transaction_code=transaction_code, error=error)
             )
-            db.add(db_item)
+        else:
+            self._report.errors_truncated = True
+
+
+class CRUDCalendar:
+    """Maintains the calendar dimension and the business date key on transactions."""
+    
+    def __init__(self):
+        self._known_keys: Set[int] = set()
+    
+    def ensure_day(self, db: Session, day: date) -> int:
+        """Insert the calendar row for ``day`` unless already known; return its key."""
+        self.ensure_days(db, [day])
+        return date_key(day)
+    
+    def ensure_days(self, db: Session, days: Iterable[date]) -> None:
+        """Insert the calendar rows of any ``days`` not already known, in one statement."""
+        rows = [calendar_row(day) for day in set(days) if date_key(day) not in self._known_keys]
+        upsert(db, CalendarDay, rows, index_elements=('date_key',))
+    
+    def remember(self, key: int) -> None:
+        """Record a key whose calendar row has been committed."""
+        self._known_keys.add(key)
+    
+    def ensure_range(self, db: Session, start_day: date, end_day: date) -> None:
+        rows = [
+            calendar_row(start_day + timedelta(days=offset))
+            for offset in range((end_day - start_day).days + 1)
+        ]
+        for offset in range(0, len(rows), 1000):
+            upsert(db, CalendarDay, rows[offset:offset + 1000], index_elements=('date_key',))
+        db.commit()
+        self._known_keys.update(row['date_key'] for row in rows)
+    
+    def backfill_date_keys(self, db: Session, batch_size: int = 5000) -> int:
+        """Set ``date_key`` on transactions written before it existed."""
+        updated = 0
+        while True:
+            batch = db.query(Transaction.id, Transaction.transaction_date).filter(
+                Transaction.date_key.is_(None)
+            ).order_by(Transaction.id).limit(batch_size).all()
+            if not batch:
+                return updated
+            
+            days = {r.id: business_date(r.transaction_date) for r in batch}
+            upsert(
+                db, CalendarDay, [calendar_row(day) for day in set(days.values())],
+                index_elements=('date_key',)
+            )
+            db.execute(
+                update(Transaction),
+                [{'id': id_, 'date_key': date_key(day)} for id_, day in days.items()]
+            )
+            db.commit()
+            updated += len(batch)
+
+
+def _rollup_days(start_date: datetime, end_date: datetime) -> Optional[Tuple[date, date]]:
+    """Return the inclusive day range for a day-aligned window, else None.
+    
+    Analytics windows are half-open, ``start_date <= t < end_date``, on the
+    rollup and raw paths alike. A window is day-aligned when both bounds are
+    midnights, so it covers whole days up to the one before ``end_date``.
+    """
+    if start_date.time() != time.min or end_date.time() != time.min:
+        return None
+    last_day = end_date.date() - timedelta(days=1)
+    if last_day < start_date.date():
+        return None
+    return start_date.date(), last_day
+
+
+def _item_window(start_date: datetime, end_date: datetime):
+    """The window on the items' copy of the transaction date.
+    
+    Partition pruning does not follow joins, so queries reading items repeat
+    the date range on them to prune ``transaction_items`` as well.
+    """
+    return and_(
+        TransactionItem.transaction_date >= start_date,
+        TransactionItem.transaction_date < end_date
+    )
+
+
+def _business_days_window(start_day: Optional[date], end_day: Optional[date]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Timestamps safely enclosing business days [start_day, end_day].
+    
+    ``date_key`` filters cannot prune the date partitions, so they are paired
+    with this range, padded by a day for the business timezone offset.
+    """
+    return (
+        datetime.combine(start_day - timedelta(days=1), time.min) if start_day else None,
+        datetime.combine(end_day + timedelta(days=2), time.min) if end_day else None,
+    )
+
+
+# Trend granularity -> (calendar bucket key, bucket start date)
+_TREND_BUCKETS = {
+    'day': (CalendarDay.date_key, CalendarDay.calendar_date),
+    'week': (CalendarDay.week_key, CalendarDay.week_start),
+    'month': (CalendarDay.month_key, CalendarDay.month_start),
+    'quarter': (CalendarDay.quarter_key, CalendarDay.quarter_start),
+    'year': (CalendarDay.year, CalendarDay.year_start),
+}
+
+
+# Basket-size percentiles reported by store performance
+_BASKET_QUANTILES = (0.5, 0.9, 0.99)
+
+
+# Analytics results are validated as one list per call rather than one
+# model constructor call per row
+_RESULT_ADAPTERS = {
+    model: TypeAdapter(List[model])
+    for model in (SalesByRegion, SalesByBrand, SalesByCategory, TopSellingProduct, StorePerformance, SalesTrend)
+}
+
+
+def _results(model, rows: List[Dict[str, Any]]) -> list:
+    return _RESULT_ADAPTERS[model].validate_python(rows)
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    _, bucket_start = _TREND_BUCKETS.get(granularity, _TREND_BUCKETS['day'])
+    return calendar_row(day)[bucket_start.key]
+
+
+class CRUDSalesRollup:
+    """Maintains the daily store and store x product sales rollups."""
+    
+    def apply_transaction(self, db: Session, db_transaction: Transaction, items_data: List[Dict[str, Any]]) -> None:
+        """Fold a new transaction into the rollups inside the caller's unit of work."""
+        self.apply_transactions(db, [(db_transaction, items_data)])
+    
+    def apply_transactions(
+        self, db: Session, receipts: List[Tuple[Transaction, List[Dict[str, Any]]]]
+    ) -> None:
+        """Fold new transactions into the rollups with one upsert per rollup table.
+        
+        Rows are merged per rollup key first, so no statement touches the same
+        key twice (PostgreSQL rejects that in a single ON CONFLICT insert).
+        """
+        receipts = [(tx, items) for tx, items in receipts if tx.status == 'completed']
+        if not receipts:
+            return
+        
+        product_ids = {item['product_id'] for _, items in receipts for item in items}
+        product_groups = {
+            product_id: (('brand', brand_id), ('category', category_id))
+            for product_id, brand_id, category_id in db.query(
+                Product.id, Product.brand_id, Product.category_id
+            ).filter(Product.id.in_(product_ids))
+        } if product_ids else {}
+        
+        store_rows: Dict[Tuple, Dict[str, Any]] = {}
+        basket_rows: Dict[Tuple, Dict[str, Any]] = {}
+        product_rows: Dict[Tuple, Dict[str, Any]] = {}
+        group_rows: Dict[Tuple, Dict[str, Any]] = {}
+        registers: Dict[Tuple[date, str, int], float] = {}
+        
+        for tx, items_data in receipts:
+            sales_date = business_date(tx.transaction_date)
+            row = store_rows.setdefault((sales_date, tx.store_id), {
+                'sales_date': sales_date,
+                'store_id': tx.store_id,
+                'total_sales': 0.0,
+                'total_transactions': 0,
+                'total_items': 0,
+            })
+            row['total_sales'] += tx.total_amount
+            row['total_transactions'] += 1
+            row['total_items'] += len(items_data)
+            
+            bucket = quantile_bucket(tx.total_amount)
+            row = basket_rows.setdefault((sales_date, tx.store_id, bucket), {
+                'sales_date': sales_date,
+                'store_id': tx.store_id,
+                'bucket_index': bucket,
+                'transaction_count': 0,
+            })
+            row['transaction_count'] += 1
+            
+            # Totals per product and per brand/category within this basket
+            by_product: Dict[int, Tuple[float, float]] = {}
+            for item_data in items_data:
+                sales, quantity = by_product.get(item_data['product_id'], (0.0, 0.0))
+                by_product[item_data['product_id']] = (
+                    sales + item_data['total_price'], quantity + item_data['quantity']
+                )
+            by_group: Dict[Tuple[str, int], Tuple[float, float]] = {}
+            for product_id, (sales, quantity) in by_product.items():
+                for group in product_groups.get(product_id, ()):
+                    group_sales, group_quantity = by_group.get(group, (0.0, 0.0))
+                    by_group[group] = (group_sales + sales, group_quantity + quantity)
+            
+            for product_id, (sales, quantity) in by_product.items():
+                row = product_rows.setdefault((sales_date, tx.store_id, product_id), {
+                    'sales_date': sales_date,
+                    'store_id': tx.store_id,
+                    'product_id': product_id,
+                    'total_sales': 0.0,
+                    'total_quantity': 0.0,
+                    'total_transactions': 0,
+                })
+                row['total_sales'] += sales
+                row['total_quantity'] += quantity
+                row['total_transactions'] += 1
+            
+            for (group_type, group_id), (sales, quantity) in by_group.items():
+                row = group_rows.setdefault((sales_date, tx.store_id, group_type, group_id), {
+                    'sales_date': sales_date,
+                    'store_id': tx.store_id,
+                    'group_type': group_type,
+                    'group_id': group_id,
+                    'total_sales': 0.0,
+                    'total_quantity': 0.0,
+                    'total_transactions': 0,
+                })
+                row['total_sales'] += sales
+                row['total_quantity'] += quantity
+                row['total_transactions'] += 1
+            
+            members = [('product', product_id) for product_id in by_product]
+            if tx.customer_id is not None:
+                members.append(('customer', tx.customer_id))
+            for sketch, member in members:
+                index, weight = hll_register(member)
+                key = (sales_date, sketch, index)
+                registers[key] = min(weight, registers.get(key, 1.0))
+        
+        upsert(
+            db, DailyStoreSales, list(store_rows.values()),
+            index_elements=('sales_date', 'store_id'),
+            increment=('total_sales', 'total_transactions', 'total_items'),
+        )
+        upsert(
+            db, DailyBasketBucket, list(basket_rows.values()),
+            index_elements=('sales_date', 'store_id', 'bucket_index'),
+            increment=('transaction_count',),
+        )
+        upsert(
+            db, DailyProductSales, list(product_rows.values()),
+            index_elements=('sales_date', 'store_id', 'product_id'),
+            increment=('total_sales', 'total_quantity', 'total_transactions'),
+        )
+        upsert(
+            db, DailyGroupSales, list(group_rows.values()),
+            index_elements=('sales_date', 'store_id', 'group_type', 'group_id'),
+            increment=('total_sales', 'total_quantity', 'total_transactions'),
+        )
+        upsert(
+            db, DailySketchRegister,
+            [
+                {'sales_date': day, 'sketch': sketch, 'register_index': index, 'weight': weight}
+                for (day, sketch, index), weight in registers.items()
+            ],
+            index_elements=('sales_date', 'sketch', 'register_index'),
+            minimum=('weight',),
+        )
+    
+    def rebuild(self, db: Session, start_day: Optional[date] = None, end_day: Optional[date] = None) -> None:
+        """Recompute the rollups from raw transactions for [start_day, end_day].
         
+        Days before the archive boundary have no raw rows left, so their
+        rollups are kept as they are.
+        """
+        archived_until = transaction_archive.archived_until(db, cached=False)
+        if archived_until and (start_day is None or start_day < archived_until.date()):
+            start_day = archived_until.date()
+        if start_day and end_day and end_day < start_day:
+            return
+        calendar.backfill_date_keys(db)
+        
+        sales_day = CalendarDay.calendar_date
+        on_calendar = CalendarDay.date_key == Transaction.date_key
+        item_count = select(func.count(TransactionItem.id)).where(
+            TransactionItem.transaction_id == Transaction.id
+        ).scalar_subquery()
+        conditions = [Transaction.status == 'completed']
+        item_conditions = []
+        since, until = _business_days_window(start_day, end_day)
+        if start_day:
+            conditions += [Transaction.date_key >= date_key(start_day), Transaction.transaction_date >= since]
+            item_conditions.append(TransactionItem.transaction_date >= since)
+        if end_day:
+            conditions += [Transaction.date_key <= date_key(end_day), Transaction.transaction_date < until]
+            item_conditions.append(TransactionItem.transaction_date < until)
+        
+        for model in (
+            DailyStoreSales, DailyProductSales, DailyGroupSales, DailySketchRegister,
+            DailyBasketBucket
+        ):
+            rows = db.query(model)
+            if start_day:
+                rows = rows.filter(model.sales_date >= start_day)
+            if end_day:
+                rows = rows.filter(model.sales_date <= end_day)
+            rows.delete(synchronize_session=False)
+        
+        db.execute(insert(DailyStoreSales).from_select(
+            ['sales_date', 'store_id', 'total_sales', 'total_transactions', 'total_items'],
+            select(
+                sales_day,
+                Transaction.store_id,
+                func.sum(Transaction.total_amount),
+                func.count(Transaction.id),
+                func.sum(item_count)
+            ).join_from(
+                Transaction, CalendarDay, on_calendar
+            ).where(and_(*conditions)).group_by(sales_day, Transaction.store_id)
+        ))
+        db.execute(insert(DailyProductSales).from_select(
+            ['sales_date', 'store_id', 'product_id', 'total_sales', 'total_quantity', 'total_transactions'],
+            select(
+                sales_day,
+                Transaction.store_id,
+                TransactionItem.product_id,
+                func.sum(TransactionItem.total_price),
+                func.sum(TransactionItem.quantity),
+                func.count(func.distinct(Transaction.id))
+            ).join_from(
+                TransactionItem, Transaction, TransactionItem.transaction_id == Transaction.id
+            ).join(
+                CalendarDay, on_calendar
+            ).where(and_(*conditions, *item_conditions)).group_by(
+                sales_day, Transaction.store_id, TransactionItem.product_id
+            )
+        ))
+        for group_type, group_column in (('brand', Product.brand_id), ('category', Product.category_id)):
+            db.execute(insert(DailyGroupSales).from_select(
+                ['sales_date', 'store_id', 'group_type', 'group_id',
+                 'total_sales', 'total_quantity', 'total_transactions'],
+                select(
+                    sales_day,
+                    Transaction.store_id,
+                    literal(group_type),
+                    group_column,
+                    func.sum(TransactionItem.total_price),
+                    func.sum(TransactionItem.quantity),
+                    func.count(func.distinct(Transaction.id))
+                ).join_from(
+                    TransactionItem, Transaction, TransactionItem.transaction_id == Transaction.id
+                ).join(
+                    Product, TransactionItem.product_id == Product.id
+                ).join(
+                    CalendarDay, on_calendar
+                ).where(and_(*conditions, *item_conditions)).group_by(
+                    sales_day, Transaction.store_id, group_column
+                )
+            ))
+        
+        # Sketches hash in Python, so stream the distinct day/member pairs
+        members = select(
+            sales_day, literal('customer'), Transaction.customer_id
+        ).join_from(
+            Transaction, CalendarDay, on_calendar
+        ).where(
+            and_(*conditions, Transaction.customer_id.isnot(None))
+        ).union(
+            select(
+                sales_day, literal('product'), TransactionItem.product_id
+            ).join_from(
+                TransactionItem, Transaction, TransactionItem.transaction_id == Transaction.id
+            ).join(
+                CalendarDay, on_calendar
+            ).where(and_(*conditions, *item_conditions))
+        )
+        registers: Dict[Tuple[date, str, int], float] = {}
+        for day, sketch, member in db.execute(members):
+            index, weight = hll_register(member)
+            key = (day, sketch, index)
+            registers[key] = min(weight, registers.get(key, 1.0))
+        rows = [
+            {'sales_date': day, 'sketch': sketch, 'register_index': index, 'weight': weight}
+            for (day, sketch, index), weight in registers.items()
+        ]
+        for offset in range(0, len(rows), 5000):
+            db.execute(insert(DailySketchRegister), rows[offset:offset + 5000])
+        
+        buckets: Counter = Counter()
+        for day, store_id, amount in db.execute(
+            select(sales_day, Transaction.store_id, Transaction.total_amount).join_from(
+                Transaction, CalendarDay, on_calendar
+            ).where(and_(*conditions)).execution_options(yield_per=5000)
+        ):
+            buckets[(day, store_id, quantile_bucket(amount))] += 1
+        rows = [
+            {'sales_date': day, 'store_id': store_id, 'bucket_index': index, 'transaction_count': count}
+            for (day, store_id, index), count in buckets.items()
+        ]
+        for offset in range(0, len(rows), 5000):
+            db.execute(insert(DailyBasketBucket), rows[offset:offset + 5000])
+        # Answers change without new rows, so cached results must go everywhere
+        bump_version(db)
         db.commit()
-        db.refresh(db_transaction)
-        return db_transaction
+        analytics.bump_version()
 
 
 class CRUDAnalytics:
+    """Sales analytics.
+    
+    Windows are half-open, ``start_date <= t < end_date``. Day-aligned
+    windows (both bounds midnights) are answered from the daily rollup
+    tables; any other window falls back to scanning raw transactions. Raw scans that reach into
+    archived months raise ArchivedRangeError, since those rows are no longer
+    in the database.
+    """
+    
     def get_sales_by_region(self, db: Session, start_date: datetime, end_date: datetime) -> List[SalesByRegion]:
-        results = db.query(
+        days = _rollup_days(start_date, end_date)
+        if days:
+            results = db.query(
+                Region.code.label('region_code'),
+                Region.name.label('region_name'),
+                func.sum(DailyStoreSales.total_sales).label('total_sales'),
+                func.sum(DailyStoreSales.total_transactions).label('total_transactions'),
+                func.count(func.distinct(DailyStoreSales.store_id)).label('total_stores')
+            ).join(
+                Store, Region.id == Store.region_id
+            ).join(
+                DailyStoreSales, Store.id == DailyStoreSales.store_id
+            ).filter(
+                DailyStoreSales.sales_date.between(*days)
+            ).group_by(
+                Region.code, Region.name
+            ).all()
+        else:
+            transaction_archive.check_hot(db, start_date)
+            results = self._sales_by_region_raw(db, start_date, end_date)
+        
+        return _results(SalesByRegion, [
+            {
+                'region_code': r.region_code,
+                'region_name': r.region_name,
+                'total_sales': float(r.total_sales or 0),
+                'total_transactions': int(r.total_transactions or 0),
+                'total_stores': r.total_stores
+            } for r in results
+        ])
+    
+    def _sales_by_region_raw(self, db: Session, start_date: datetime, end_date: datetime):
+        return db.query(
             Region.code.label('region_code'),
             Region.name.label('region_name'),
             func.sum(Transaction.total_amount).label('total_sales'),
@@ -171,25 +1001,46 @@ class CRUDAnalytics:
         ).filter(
             and_(
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
+                Transaction.transaction_date < end_date,
                 Transaction.status == 'completed'
             )
         ).group_by(
             Region.code, Region.name
         ).all()
-        
-        return [
-            SalesByRegion(
-                region_code=r.region_code,
-                region_name=r.region_name,
-                total_sales=float(r.total_sales or 0),
-                total_transactions=r.total_transactions,
-                total_stores=r.total_stores
-            ) for r in results
-        ]
     
     def get_sales_by_brand(self, db: Session, start_date: datetime, end_date: datetime) -> List[SalesByBrand]:
-        results = db.query(
+        days = _rollup_days(start_date, end_date)
+        if days:
+            results = db.query(
+                Brand.code.label('brand_code'),
+                Brand.name.label('brand_name'),
+                func.sum(DailyGroupSales.total_sales).label('total_sales'),
+                func.sum(DailyGroupSales.total_quantity).label('total_quantity'),
+                func.sum(DailyGroupSales.total_transactions).label('total_transactions')
+            ).join(
+                DailyGroupSales,
+                and_(DailyGroupSales.group_type == 'brand', DailyGroupSales.group_id == Brand.id)
+            ).filter(
+                DailyGroupSales.sales_date.between(*days)
+            ).group_by(
+                Brand.code, Brand.name
+            ).all()
+        else:
+            transaction_archive.check_hot(db, start_date)
+            results = self._sales_by_brand_raw(db, start_date, end_date)
+        
+        return _results(SalesByBrand, [
+            {
+                'brand_code': r.brand_code,
+                'brand_name': r.brand_name,
+                'total_sales': float(r.total_sales or 0),
+                'total_quantity': float(r.total_quantity or 0),
+                'total_transactions': int(r.total_transactions or 0)
+            } for r in results
+        ])
+    
+    def _sales_by_brand_raw(self, db: Session, start_date: datetime, end_date: datetime):
+        return db.query(
             Brand.code.label('brand_code'),
             Brand.name.label('brand_name'),
             func.sum(TransactionItem.total_price).label('total_sales'),
@@ -204,25 +1055,47 @@ class CRUDAnalytics:
         ).filter(
             and_(
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.status == 'completed'
+                Transaction.transaction_date < end_date,
+                Transaction.status == 'completed',
+                _item_window(start_date, end_date)
             )
         ).group_by(
             Brand.code, Brand.name
         ).all()
-        
-        return [
-            SalesByBrand(
-                brand_code=r.brand_code,
-                brand_name=r.brand_name,
-                total_sales=float(r.total_sales or 0),
-                total_quantity=float(r.total_quantity or 0),
-                total_transactions=r.total_transactions
-            ) for r in results
-        ]
     
     def get_sales_by_category(self, db: Session, start_date: datetime, end_date: datetime) -> List[SalesByCategory]:
-        results = db.query(
+        days = _rollup_days(start_date, end_date)
+        if days:
+            results = db.query(
+                Category.code.label('category_code'),
+                Category.name.label('category_name'),
+                func.sum(DailyGroupSales.total_sales).label('total_sales'),
+                func.sum(DailyGroupSales.total_quantity).label('total_quantity'),
+                func.sum(DailyGroupSales.total_transactions).label('total_transactions')
+            ).join(
+                DailyGroupSales,
+                and_(DailyGroupSales.group_type == 'category', DailyGroupSales.group_id == Category.id)
+            ).filter(
+                DailyGroupSales.sales_date.between(*days)
+            ).group_by(
+                Category.code, Category.name
+            ).all()
+        else:
+            transaction_archive.check_hot(db, start_date)
+            results = self._sales_by_category_raw(db, start_date, end_date)
+        
+        return _results(SalesByCategory, [
+            {
+                'category_code': r.category_code,
+                'category_name': r.category_name,
+                'total_sales': float(r.total_sales or 0),
+                'total_quantity': float(r.total_quantity or 0),
+                'total_transactions': int(r.total_transactions or 0)
+            } for r in results
+        ])
+    
+    def _sales_by_category_raw(self, db: Session, start_date: datetime, end_date: datetime):
+        return db.query(
             Category.code.label('category_code'),
             Category.name.label('category_name'),
             func.sum(TransactionItem.total_price).label('total_sales'),
@@ -237,25 +1110,56 @@ class CRUDAnalytics:
         ).filter(
             and_(
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.status == 'completed'
+                Transaction.transaction_date < end_date,
+                Transaction.status == 'completed',
+                _item_window(start_date, end_date)
             )
         ).group_by(
             Category.code, Category.name
         ).all()
-        
-        return [
-            SalesByCategory(
-                category_code=r.category_code,
-                category_name=r.category_name,
-                total_sales=float(r.total_sales or 0),
-                total_quantity=float(r.total_quantity or 0),
-                total_transactions=r.total_transactions
-            ) for r in results
-        ]
     
     def get_top_selling_products(self, db: Session, start_date: datetime, end_date: datetime, limit: int = 10) -> List[TopSellingProduct]:
-        results = db.query(
+        days = _rollup_days(start_date, end_date)
+        if days:
+            results = db.query(
+                Product.sku,
+                Product.name.label('product_name'),
+                Brand.name.label('brand_name'),
+                Category.name.label('category_name'),
+                func.sum(DailyProductSales.total_sales).label('total_sales'),
+                func.sum(DailyProductSales.total_quantity).label('total_quantity'),
+                func.sum(DailyProductSales.total_transactions).label('total_transactions')
+            ).join(
+                Brand, Product.brand_id == Brand.id
+            ).join(
+                Category, Product.category_id == Category.id
+            ).join(
+                DailyProductSales, Product.id == DailyProductSales.product_id
+            ).filter(
+                DailyProductSales.sales_date.between(*days)
+            ).group_by(
+                Product.sku, Product.name, Brand.name, Category.name
+            ).order_by(
+                desc(func.sum(DailyProductSales.total_sales))
+            ).limit(limit).all()
+        else:
+            transaction_archive.check_hot(db, start_date)
+            results = self._top_selling_products_raw(db, start_date, end_date, limit)
+        
+        return _results(TopSellingProduct, [
+            {
+                'sku': r.sku,
+                'product_name': r.product_name,
+                'brand_name': r.brand_name,
+                'category_name': r.category_name,
+                'total_sales': float(r.total_sales or 0),
+                'total_quantity': float(r.total_quantity or 0),
+                'total_transactions': int(r.total_transactions or 0)
+            } for r in results
+        ])
+    
+    def _top_selling_products_raw(self, db: Session, start_date: datetime, end_date: datetime, limit: int):
+        return db.query(
             Product.sku,
             Product.name.label('product_name'),
             Brand.name.label('brand_name'),
@@ -274,29 +1178,104 @@ class CRUDAnalytics:
         ).filter(
             and_(
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.status == 'completed'
+                Transaction.transaction_date < end_date,
+                Transaction.status == 'completed',
+                _item_window(start_date, end_date)
             )
         ).group_by(
             Product.sku, Product.name, Brand.name, Category.name
         ).order_by(
             desc(func.sum(TransactionItem.total_price))
         ).limit(limit).all()
-        
-        return [
-            TopSellingProduct(
-                sku=r.sku,
-                product_name=r.product_name,
-                brand_name=r.brand_name,
-                category_name=r.category_name,
-                total_sales=float(r.total_sales or 0),
-                total_quantity=float(r.total_quantity or 0),
-                total_transactions=r.total_transactions
-            ) for r in results
-        ]
     
     def get_store_performance(self, db: Session, start_date: datetime, end_date: datetime) -> List[StorePerformance]:
-        results = db.query(
+        days = _rollup_days(start_date, end_date)
+        if days:
+            results = db.query(
+                Store.code.label('store_code'),
+                Store.name.label('store_name'),
+                Region.name.label('region_name'),
+                func.sum(DailyStoreSales.total_sales).label('total_sales'),
+                func.sum(DailyStoreSales.total_transactions).label('total_transactions'),
+                (
+                    func.sum(DailyStoreSales.total_sales)
+                    / func.nullif(func.sum(DailyStoreSales.total_transactions), 0)
+                ).label('avg_basket_size')
+            ).join(
+                Region, Store.region_id == Region.id
+            ).join(
+                DailyStoreSales, Store.id == DailyStoreSales.store_id
+            ).filter(
+                DailyStoreSales.sales_date.between(*days)
+            ).group_by(
+                Store.code, Store.name, Region.name
+            ).all()
+        else:
+            transaction_archive.check_hot(db, start_date)
+            results = self._store_performance_raw(db, start_date, end_date)
+        buckets = self._basket_buckets(db, start_date, end_date, days)
+        
+        performance = []
+        for r in results:
+            p50, p90, p99 = quantile_estimates(buckets.get(r.store_code, ()), _BASKET_QUANTILES)
+            performance.append({
+                'store_code': r.store_code,
+                'store_name': r.store_name,
+                'region_name': r.region_name,
+                'total_sales': float(r.total_sales or 0),
+                'total_transactions': int(r.total_transactions or 0),
+                'avg_basket_size': float(r.avg_basket_size or 0),
+                'p50_basket_size': p50,
+                'p90_basket_size': p90,
+                'p99_basket_size': p99
+            })
+        return _results(StorePerformance, performance)
+    
+    def get_store_performance_columns(self, db: Session, start_date: datetime, end_date: datetime) -> Dict[str, List[Any]]:
+        """get_store_performance as one list per StorePerformance field (one row per store)."""
+        return model_columns(self.get_store_performance(db, start_date, end_date), StorePerformance)
+    
+    def _basket_buckets(
+        self, db: Session, start_date: datetime, end_date: datetime, days: Optional[Tuple[date, date]]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """Merged basket-size sketch per store code."""
+        buckets: Dict[str, List[Tuple[int, int]]] = {}
+        if days:
+            rows = db.query(
+                Store.code,
+                DailyBasketBucket.bucket_index,
+                func.sum(DailyBasketBucket.transaction_count)
+            ).join(
+                DailyBasketBucket, Store.id == DailyBasketBucket.store_id
+            ).filter(
+                DailyBasketBucket.sales_date.between(*days)
+            ).group_by(
+                Store.code, DailyBasketBucket.bucket_index
+            )
+            for store_code, index, count in rows:
+                buckets.setdefault(store_code, []).append((index, int(count)))
+            return buckets
+        
+        # Partial days have no sketch yet, so bucket the amounts as they stream
+        counts: Counter = Counter()
+        for store_code, amount in db.execute(
+            select(Store.code, Transaction.total_amount).join_from(
+                Transaction, Store, Transaction.store_id == Store.id
+            ).where(
+                and_(
+                    Transaction.transaction_date >= start_date,
+                    Transaction.transaction_date < end_date,
+                    Transaction.status == 'completed'
+                )
+            ).execution_options(yield_per=5000)
+        ):
+            counts[(store_code, quantile_bucket(amount))] += 1
+        for (store_code, index), count in counts.items():
+            buckets.setdefault(store_code, []).append((index, count))
+        return buckets
+    
+    def _store_performance_raw(self, db: Session, start_date: datetime, end_date: datetime):
+        return db.query(
             Store.code.label('store_code'),
             Store.name.label('store_name'),
             Region.name.label('region_name'),
@@ -310,122 +1289,422 @@ class CRUDAnalytics:
         ).filter(
             and_(
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
+                Transaction.transaction_date < end_date,
                 Transaction.status == 'completed'
             )
         ).group_by(
             Store.code, Store.name, Region.name
         ).all()
-        
-        return [
-            StorePerformance(
-                store_code=r.store_code,
-                store_name=r.store_name,
-                region_name=r.region_name,
-                total_sales=float(r.total_sales or 0),
-                total_transactions=r.total_transactions,
-                avg_basket_size=float(r.avg_basket_size or 0)
-            ) for r in results
-        ]
     
-    def get_transaction_summary(self, db: Session, start_date: datetime, end_date: datetime) -> TransactionSummary:
-        # Main transaction stats
-        transaction_stats = db.query(
-            func.count(Transaction.id).label('total_transactions'),
-            func.sum(Transaction.total_amount).label('total_sales'),
-            func.avg(Transaction.total_amount).label('avg_basket_size')
-        ).filter(
-            and_(
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.status == 'completed'
-            )
-        ).first()
+    def get_transaction_summary(
+        self, db: Session, start_date: datetime, end_date: datetime, exact: bool = False
+    ) -> TransactionSummary:
+        """Summary statistics in one round trip.
         
-        # Average items per transaction
-        avg_items = db.query(
-            func.avg(func.count(TransactionItem.id))
-        ).join(
-            Transaction, TransactionItem.transaction_id == Transaction.id
-        ).filter(
-            and_(
+        Day-aligned windows read the rollups and estimate distinct customers
+        and products by merging the daily HyperLogLog sketches (~2% error);
+        pass ``exact=True`` to count them from raw transactions instead, which
+        archived months no longer have.
+        """
+        days = _rollup_days(start_date, end_date)
+        if days and not exact:
+            customer_weights, customer_registers = self._merged_sketch(days, 'customer')
+            product_weights, product_registers = self._merged_sketch(days, 'product')
+            stats = db.query(
+                func.sum(DailyStoreSales.total_transactions).label('total_transactions'),
+                func.sum(DailyStoreSales.total_sales).label('total_sales'),
+                func.sum(DailyStoreSales.total_items).label('total_items'),
+                customer_weights.label('customer_weights'),
+                customer_registers.label('customer_registers'),
+                product_weights.label('product_weights'),
+                product_registers.label('product_registers')
+            ).filter(
+                DailyStoreSales.sales_date.between(*days)
+            ).one()
+            total_customers = hll_estimate(stats.customer_weights, stats.customer_registers or 0)
+            total_products = hll_estimate(stats.product_weights, stats.product_registers or 0)
+        else:
+            transaction_archive.check_hot(db, start_date)
+            conditions = and_(
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
+                Transaction.transaction_date < end_date,
                 Transaction.status == 'completed'
             )
-        ).group_by(Transaction.id).scalar() or 0
+            item_stats = select(TransactionItem.id, TransactionItem.product_id).join(
+                Transaction, TransactionItem.transaction_id == Transaction.id
+            ).where(and_(conditions, _item_window(start_date, end_date))).subquery()
+            stats = db.query(
+                func.count(Transaction.id).label('total_transactions'),
+                func.sum(Transaction.total_amount).label('total_sales'),
+                func.count(func.distinct(Transaction.customer_id)).label('total_customers'),
+                select(func.count(item_stats.c.id)).scalar_subquery().label('total_items'),
+                select(
+                    func.count(func.distinct(item_stats.c.product_id))
+                ).scalar_subquery().label('total_products')
+            ).filter(conditions).one()
+            total_customers = stats.total_customers or 0
+            total_products = stats.total_products or 0
         
-        # Unique customers and products
-        unique_customers = db.query(
-            func.count(func.distinct(Transaction.customer_id))
-        ).filter(
+        total_transactions = int(stats.total_transactions or 0)
+        total_sales = float(stats.total_sales or 0)
+        return TransactionSummary(
+            total_transactions=total_transactions,
+            total_sales=total_sales,
+            avg_basket_size=total_sales / total_transactions if total_transactions else 0.0,
+            avg_items_per_transaction=(
+                int(stats.total_items or 0) / total_transactions if total_transactions else 0.0
+            ),
+            total_customers=total_customers,
+            total_products_sold=total_products
+        )
+    
+    def _merged_sketch(self, days: Tuple[date, date], sketch: str):
+        """Scalar subqueries for the merged (weight sum, non-empty registers) of a sketch."""
+        merged = select(
+            func.min(DailySketchRegister.weight).label('weight')
+        ).where(
             and_(
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.status == 'completed',
-                Transaction.customer_id.isnot(None)
+                DailySketchRegister.sketch == sketch,
+                DailySketchRegister.sales_date.between(*days)
             )
-        ).scalar() or 0
-        
-        unique_products = db.query(
-            func.count(func.distinct(TransactionItem.product_id))
-        ).join(
-            Transaction, TransactionItem.transaction_id == Transaction.id
-        ).filter(
-            and_(
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
-                Transaction.status == 'completed'
-            )
-        ).scalar() or 0
-        
-        return TransactionSummary(
-            total_transactions=transaction_stats.total_transactions or 0,
-            total_sales=float(transaction_stats.total_sales or 0),
-            avg_basket_size=float(transaction_stats.avg_basket_size or 0),
-            avg_items_per_transaction=float(avg_items),
-            total_customers=unique_customers,
-            total_products_sold=unique_products
+        ).group_by(
+            DailySketchRegister.register_index
+        ).subquery()
+        return (
+            select(func.sum(merged.c.weight)).scalar_subquery(),
+            select(func.count()).select_from(merged).scalar_subquery()
         )
     
     def get_sales_trends(self, db: Session, start_date: datetime, end_date: datetime, granularity: str = 'day') -> List[SalesTrend]:
-        # Determine date truncation based on granularity
-        if granularity == 'day':
-            date_trunc = func.date(Transaction.transaction_date)
-        elif granularity == 'week':
-            date_trunc = func.date_trunc('week', Transaction.transaction_date)
-        elif granularity == 'month':
-            date_trunc = func.date_trunc('month', Transaction.transaction_date)
-        else:
-            date_trunc = func.date(Transaction.transaction_date)
+        days = _rollup_days(start_date, end_date)
+        if days:
+            return self._sales_trends_from_rollup(db, days, granularity)
+        transaction_archive.check_hot(db, start_date)
         
+        bucket_key, bucket_start = _TREND_BUCKETS.get(granularity, _TREND_BUCKETS['day'])
         results = db.query(
-            date_trunc.label('date'),
+            bucket_start.label('date'),
             func.sum(Transaction.total_amount).label('total_sales'),
             func.count(Transaction.id).label('total_transactions'),
             func.avg(Transaction.total_amount).label('avg_basket_size')
+        ).join(
+            CalendarDay, CalendarDay.date_key == Transaction.date_key
         ).filter(
             and_(
+                Transaction.date_key.between(
+                    date_key(business_date(start_date)), date_key(business_date(end_date))
+                ),
                 Transaction.transaction_date >= start_date,
-                Transaction.transaction_date <= end_date,
+                Transaction.transaction_date < end_date,
                 Transaction.status == 'completed'
             )
         ).group_by(
-            date_trunc
+            bucket_key, bucket_start
         ).order_by(
-            date_trunc
+            bucket_key
         ).all()
         
-        return [
-            SalesTrend(
-                date=r.date,
-                total_sales=float(r.total_sales or 0),
-                total_transactions=r.total_transactions,
-                avg_basket_size=float(r.avg_basket_size or 0)
-            ) for r in results
-        ]
+        return _results(SalesTrend, [
+            {
+                'date': datetime.combine(r.date, time.min),
+                'total_sales': float(r.total_sales or 0),
+                'total_transactions': r.total_transactions,
+                'avg_basket_size': float(r.avg_basket_size or 0)
+            } for r in results
+        ])
+    
+    def _sales_trends_from_rollup(self, db: Session, days: Tuple[date, date], granularity: str) -> List[SalesTrend]:
+        results = db.query(
+            DailyStoreSales.sales_date,
+            func.sum(DailyStoreSales.total_sales).label('total_sales'),
+            func.sum(DailyStoreSales.total_transactions).label('total_transactions')
+        ).filter(
+            DailyStoreSales.sales_date.between(*days)
+        ).group_by(
+            DailyStoreSales.sales_date
+        ).order_by(
+            DailyStoreSales.sales_date
+        ).all()
+        
+        # At most one row per day, so week/month buckets are folded here
+        buckets: Dict[date, List[float]] = {}
+        for r in results:
+            bucket = buckets.setdefault(_bucket_start(r.sales_date, granularity), [0.0, 0])
+            bucket[0] += float(r.total_sales or 0)
+            bucket[1] += int(r.total_transactions or 0)
+        
+        return _results(SalesTrend, [
+            {
+                'date': datetime.combine(day, time.min),
+                'total_sales': total_sales,
+                'total_transactions': total_transactions,
+                'avg_basket_size': total_sales / total_transactions if total_transactions else 0.0
+            } for day, (total_sales, total_transactions) in buckets.items()
+        ])
+    
+    def get_sales_trend_columns(
+        self, db: Session, start_date: datetime, end_date: datetime, granularity: str = 'day'
+    ) -> Dict[str, List[Any]]:
+        """get_sales_trends as one list per SalesTrend field (one row per bucket)."""
+        return model_columns(self.get_sales_trends(db, start_date, end_date, granularity), SalesTrend)
+    
+    def get_dashboard(self, db: Session, start_date: datetime, end_date: datetime, limit: int = 10) -> RetailDashboard:
+        """Compute every dashboard breakdown in a single statement.
+        
+        All breakdowns are UNION ALL branches over one filtered CTE. On MySQL,
+        region + grand total and brand + product each come from one
+        ``WITH ROLLUP`` grouping; elsewhere each level gets its own GROUP BY.
+        Day-aligned windows reaching into archived months are assembled from
+        the rollup-backed breakdowns instead, with estimated distinct counts.
+        """
+        if transaction_archive.covers(db, start_date):
+            return self._dashboard_from_rollups(db, start_date, end_date, limit)
+        base = self._dashboard_base(start_date, end_date)
+        if db.get_bind().dialect.name == 'mysql':
+            branches = [
+                self._dashboard_branch(base, 'region', base.c.region_id, rollup=True),
+                self._dashboard_branch(base, 'brand', base.c.brand_id, base.c.product_id, rollup=True),
+                self._dashboard_branch(base, 'category', base.c.category_id),
+            ]
+        else:
+            branches = [
+                self._dashboard_branch(base, 'region'),
+                self._dashboard_branch(base, 'region', base.c.region_id),
+                self._dashboard_branch(base, 'brand', base.c.brand_id),
+                self._dashboard_branch(base, 'brand', base.c.brand_id, base.c.product_id),
+                self._dashboard_branch(base, 'category', base.c.category_id),
+            ]
+        
+        regions, brands, categories, products = [], [], [], []
+        summary = TransactionSummary(
+            total_transactions=0, total_sales=0.0, avg_basket_size=0.0,
+            avg_items_per_transaction=0.0, total_customers=0, total_products_sold=0
+        )
+        for r in db.execute(union_all(*branches)).all():
+            if r.grouping == 'region' and r.key_id is None:
+                header_transactions = int(r.header_transactions or 0)
+                header_sales = float(r.header_sales or 0)
+                summary = TransactionSummary(
+                    total_transactions=header_transactions,
+                    total_sales=header_sales,
+                    avg_basket_size=header_sales / header_transactions if header_transactions else 0.0,
+                    avg_items_per_transaction=(
+                        r.total_items / header_transactions if header_transactions else 0.0
+                    ),
+                    total_customers=r.total_customers,
+                    total_products_sold=r.total_products
+                )
+            elif r.grouping == 'region':
+                regions.append({
+                    'region_code': r.region_code,
+                    'region_name': r.region_name,
+                    'total_sales': float(r.header_sales or 0),
+                    'total_transactions': int(r.header_transactions or 0),
+                    'total_stores': r.total_stores
+                })
+            elif r.grouping == 'brand' and r.key_id is None:
+                continue  # ROLLUP grand total; the region branch already has it
+            elif r.grouping == 'brand' and r.sub_id is None:
+                brands.append({
+                    'brand_code': r.brand_code,
+                    'brand_name': r.brand_name,
+                    'total_sales': float(r.item_sales or 0),
+                    'total_quantity': float(r.item_quantity or 0),
+                    'total_transactions': r.item_transactions
+                })
+            elif r.grouping == 'brand':
+                products.append({
+                    'sku': r.sku,
+                    'product_name': r.product_name,
+                    'brand_name': r.brand_name,
+                    'category_name': r.category_name,
+                    'total_sales': float(r.item_sales or 0),
+                    'total_quantity': float(r.item_quantity or 0),
+                    'total_transactions': r.item_transactions
+                })
+            else:
+                categories.append({
+                    'category_code': r.category_code,
+                    'category_name': r.category_name,
+                    'total_sales': float(r.item_sales or 0),
+                    'total_quantity': float(r.item_quantity or 0),
+                    'total_transactions': r.item_transactions
+                })
+        
+        # Plain dicts, so RetailDashboard validates every breakdown in one pass
+        by_sales = itemgetter('total_sales')
+        return RetailDashboard(
+            sales_by_region=sorted(regions, key=by_sales, reverse=True),
+            sales_by_brand=sorted(brands, key=by_sales, reverse=True),
+            sales_by_category=sorted(categories, key=by_sales, reverse=True),
+            top_selling_products=sorted(products, key=by_sales, reverse=True)[:limit],
+            summary=summary
+        )
+    
+    def _dashboard_from_rollups(
+        self, db: Session, start_date: datetime, end_date: datetime, limit: int
+    ) -> RetailDashboard:
+        if not _rollup_days(start_date, end_date):
+            transaction_archive.check_hot(db, start_date)
+        by_sales = attrgetter('total_sales')
+        return RetailDashboard(
+            sales_by_region=sorted(self.get_sales_by_region(db, start_date, end_date), key=by_sales, reverse=True),
+            sales_by_brand=sorted(self.get_sales_by_brand(db, start_date, end_date), key=by_sales, reverse=True),
+            sales_by_category=sorted(
+                self.get_sales_by_category(db, start_date, end_date), key=by_sales, reverse=True
+            ),
+            top_selling_products=self.get_top_selling_products(db, start_date, end_date, limit),
+            summary=self.get_transaction_summary(db, start_date, end_date)
+        )
+    
+    def _dashboard_base(self, start_date: datetime, end_date: datetime):
+        # One row per item (or per item-less transaction); item_rank == 1 marks
+        # exactly one row per transaction so header amounts are summed once.
+        item_rank = func.row_number().over(
+            partition_by=Transaction.id, order_by=TransactionItem.id
+        )
+        return select(
+            Transaction.id.label('transaction_id'),
+            Transaction.store_id,
+            Transaction.customer_id,
+            Transaction.total_amount,
+            Store.region_id,
+            Region.code.label('region_code'),
+            Region.name.label('region_name'),
+            TransactionItem.product_id,
+            TransactionItem.total_price,
+            TransactionItem.quantity,
+            Product.sku,
+            Product.name.label('product_name'),
+            Product.brand_id,
+            Brand.code.label('brand_code'),
+            Brand.name.label('brand_name'),
+            Product.category_id,
+            Category.code.label('category_code'),
+            Category.name.label('category_name'),
+            item_rank.label('item_rank')
+        ).select_from(
+            Transaction
+        ).join(
+            Store, Transaction.store_id == Store.id
+        ).join(
+            Region, Store.region_id == Region.id
+        ).outerjoin(
+            TransactionItem,
+            and_(
+                TransactionItem.transaction_id == Transaction.id,
+                _item_window(start_date, end_date)
+            )
+        ).outerjoin(
+            Product, TransactionItem.product_id == Product.id
+        ).outerjoin(
+            Brand, Product.brand_id == Brand.id
+        ).outerjoin(
+            Category, Product.category_id == Category.id
+        ).where(
+            and_(
+                Transaction.transaction_date >= start_date,
+                Transaction.transaction_date < end_date,
+                Transaction.status == 'completed'
+            )
+        ).cte('dashboard_base')
+    
+    def _dashboard_branch(self, base, grouping: str, *keys, rollup: bool = False):
+        first_row = base.c.item_rank == 1
+        stmt = select(
+            literal(grouping).label('grouping'),
+            (keys[0] if keys else null()).label('key_id'),
+            (keys[1] if len(keys) > 1 else null()).label('sub_id'),
+            func.max(base.c.region_code).label('region_code'),
+            func.max(base.c.region_name).label('region_name'),
+            func.max(base.c.brand_code).label('brand_code'),
+            func.max(base.c.brand_name).label('brand_name'),
+            func.max(base.c.category_code).label('category_code'),
+            func.max(base.c.category_name).label('category_name'),
+            func.max(base.c.sku).label('sku'),
+            func.max(base.c.product_name).label('product_name'),
+            func.sum(case((first_row, base.c.total_amount), else_=0)).label('header_sales'),
+            func.sum(case((first_row, 1), else_=0)).label('header_transactions'),
+            func.count(func.distinct(base.c.store_id)).label('total_stores'),
+            func.count(func.distinct(base.c.customer_id)).label('total_customers'),
+            func.count(func.distinct(base.c.product_id)).label('total_products'),
+            func.count(base.c.product_id).label('total_items'),
+            func.sum(base.c.total_price).label('item_sales'),
+            func.sum(base.c.quantity).label('item_quantity'),
+            func.count(func.distinct(base.c.transaction_id)).label('item_transactions')
+        ).select_from(base)
+        
+        if grouping != 'region':
+            stmt = stmt.where(base.c.product_id.isnot(None))
+        if keys:
+            stmt = stmt.group_by(*keys)
+        if rollup:
+            stmt = stmt.suffix_with('WITH ROLLUP')
+        return stmt
 
 
+class CachedAnalytics:
+    """Result cache in front of CRUDAnalytics.
+    
+    Entries are keyed on (method, arguments, data version), where the data
+    version is the ``data_versions`` row of the transactions and of the
+    reference data (app.db.versions). Every writer, in any worker, bumps
+    those rows, so stale entries are never read again and age out of the
+    LRU. The rows are polled at most every ``poll_interval`` seconds, so
+    writes made through another worker become visible within that interval;
+    ``bump_version`` makes this process re-read them on its next lookup.
+    """
+    
+    def __init__(self, analytics: CRUDAnalytics, maxsize: int, ttl: float, poll_interval: float):
+        self._analytics = analytics
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._poll_interval = poll_interval
+        self._version: Tuple[int, int] = (0, 0)
+        self._polled = float('-inf')
+        self._version_lock = threading.Lock()
+    
+    def bump_version(self) -> None:
+        """Re-read the data versions on the next lookup, after a write from this process."""
+        with self._version_lock:
+            self._polled = float('-inf')
+    
+    def clear(self) -> None:
+        """Drop every entry and the polled version."""
+        self._cache.clear()
+        self.bump_version()
+    
+    def data_version(self, db: Session) -> Tuple[int, int]:
+        """(transactions, reference) versions, read at most every ``poll_interval`` seconds."""
+        with self._version_lock:
+            if clock.monotonic() - self._polled < self._poll_interval:
+                return self._version
+        version = (current_version(db, TRANSACTIONS), current_version(db, REFERENCE))
+        with self._version_lock:
+            self._version, self._polled = version, clock.monotonic()
+        return version
+    
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), 'data_version': self._version[0]}
+    
+    def __getattr__(self, name: str):
+        method = getattr(self._analytics, name)
+        if not name.startswith('get_'):
+            return method
+        
+        def cached(db: Session, *args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())), self.data_version(db))
+            found, value = self._cache.get(key)
+            if not found:
+                value = method(db, *args, **kwargs)
+                self._cache.set(key, value)
+            return value
+        return cached
+
+
+# Reference-data list responses, encoded and compressed once; cleared by
+# upserts here, other workers see changes within REFERENCE_PAYLOAD_TTL
+reference_payloads = LRUCache(maxsize=16, ttl=settings.REFERENCE_PAYLOAD_TTL)
+
 # Create instances
 region = CRUDRegion()
 province = CRUDProvince()
@@ -436,4 +1715,11 @@ category = CRUDCategory()
 product = CRUDProduct()
 customer = CRUDCustomer()
 transaction = CRUDTransaction()
-analytics = CRUDAnalytics()
\ No newline at end of file
+calendar = CRUDCalendar()
+sales_rollup = CRUDSalesRollup()
+analytics = CachedAnalytics(
+    CRUDAnalytics(),
+    maxsize=settings.ANALYTICS_CACHE_SIZE,
+    ttl=settings.ANALYTICS_CACHE_TTL,
+    poll_interval=settings.ANALYTICS_VERSION_POLL_INTERVAL
+)
@@ -0,0 +1,258 @@
+"""
+Batch RFM (recency, frequency, monetary) segmentation of retail customers.
+
+Per-customer purchase aggregates live in ``customer_segments`` and are only
+recomputed for customers with transactions committed since the last run,
+tracked by the commit-ordered ``change_seq`` of app.db.versions. Scoring is
+then one vectorized pass over all stored aggregates, and only rows whose
+scores, segment or CLV changed are written back.
+"""
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.calendar import business_date, key_to_date
+from app.core.pagination import keyset_page
+from app.crud.retail import calendar
+from app.db.versions import CUSTOMER_SEGMENTS, current_version, set_version, stored_version
+from app.models.retail import ArchivedCustomerTotal, Customer, CustomerSegment, Transaction
+from app.schemas.retail import RFMSegment
+
+# CLV extrapolates a customer's historical daily spend over this horizon
+_CLV_HORIZON_DAYS = 3 * 365
+# Shortest tenure a spend rate is taken over, so a first purchase is not
+# extrapolated as a daily habit
+_MIN_TENURE_DAYS = 30
+_BATCH_SIZE = 1000
+
+NO_PURCHASES_SEGMENT = 'Prospects'
+
+# (segment, min R, max R, min FM, max FM), first match wins. FM is the
+# rounded-down mean of the frequency and monetary scores.
+_SEGMENT_RULES = [
+    ('Champions', 4, 5, 4, 5),
+    ('Loyal Customers', 3, 3, 4, 5),
+    ('Cannot Lose Them', 1, 1, 4, 5),
+    ('At Risk', 1, 2, 3, 5),
+    ('Potential Loyalists', 3, 5, 2, 3),
+    ('New Customers', 4, 5, 1, 1),
+    ('Need Attention', 3, 3, 1, 1),
+    ('Hibernating', 2, 2, 1, 2),
+    ('Lost', 1, 1, 1, 2),
+]
+
+
+def _quintile_scores(values: np.ndarray) -> np.ndarray:
+    """Score values 1-5 by quintile, higher values scoring higher; ties share a score."""
+    percentile = np.searchsorted(np.sort(values), values, side='left') / values.size
+    return (np.floor(percentile * 5) + 1).astype(np.int64)
+
+
+# Highest loyalty first; matches ix_customer_segments_loyalty
+_SEGMENT_ORDER = [(CustomerSegment.loyalty_score, True), (CustomerSegment.customer_id, True)]
+
+
+class CRUDCustomerSegment:
+    def get_segments(
+        self, db: Session, segment: Optional[str] = None, skip: int = 0, limit: int = 100
+    ) -> List[RFMSegment]:
+        rows = self._query(db, segment).order_by(
+            CustomerSegment.loyalty_score.desc(), CustomerSegment.customer_id.desc()
+        ).offset(skip).limit(limit).all()
+        return self._to_schemas(rows)
+    
+    def get_segments_page(
+        self, db: Session, segment: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[RFMSegment], Optional[str]]:
+        """Keyset-paginated ``get_segments``; returns the page and the next cursor."""
+        rows, next_cursor = keyset_page(
+            self._query(db, segment), _SEGMENT_ORDER, cursor, limit,
+            key=lambda r: (r[0].loyalty_score, r[0].customer_id)
+        )
+        return self._to_schemas(rows), next_cursor
+    
+    def _query(self, db: Session, segment: Optional[str]):
+        query = db.query(
+            CustomerSegment, Customer.customer_code, Customer.name
+        ).join(
+            Customer, CustomerSegment.customer_id == Customer.id
+        )
+        if segment:
+            query = query.filter(CustomerSegment.segment == segment)
+        return query
+    
+    def _to_schemas(self, rows) -> List[RFMSegment]:
+        today = business_date(datetime.now(timezone.utc))
+        return [
+            RFMSegment(
+                customer_id=customer_code,
+                customer_name=name or customer_code,
+                recency=(today - s.last_purchase_date).days if s.last_purchase_date else None,
+                frequency=s.frequency,
+                monetary=s.monetary,
+                segment=s.segment,
+                clv=s.clv,
+                loyalty_score=s.loyalty_score,
+                r_score=s.r_score,
+                f_score=s.f_score,
+                m_score=s.m_score
+            ) for s, customer_code, name in rows
+        ]
+    
+    def refresh(self, db: Session, full: bool = False, as_of: Optional[date] = None) -> int:
+        """Re-aggregate customers with new purchases, then rescore everyone.
+        
+        Incremental runs pick up customers with transactions committed since
+        the transactions version recorded by the previous run, whatever their
+        ids, plus customers without a segment row. The first run is always
+        full. Status changes to older transactions need a ``full`` run.
+        Returns the number of customers re-aggregated.
+        """
+        calendar.backfill_date_keys(db)
+        as_of = as_of or business_date(datetime.now(timezone.utc))
+        # Every row stamped up to this version is committed (see app.db.versions)
+        version = current_version(db)
+        last_version = stored_version(db, CUSTOMER_SEGMENTS)
+        
+        if full or last_version is None:
+            changed = set(db.execute(select(Customer.id)).scalars())
+        else:
+            changed = set(db.execute(
+                select(Transaction.customer_id).where(and_(
+                    Transaction.change_seq > last_version,
+                    Transaction.change_seq <= version,
+                    Transaction.customer_id.isnot(None)
+                )).distinct()
+            ).scalars())
+            changed.update(db.execute(
+                select(Customer.id).outerjoin(
+                    CustomerSegment, Customer.id == CustomerSegment.customer_id
+                ).where(CustomerSegment.customer_id.is_(None))
+            ).scalars())
+        
+        changed = sorted(changed)
+        for offset in range(0, len(changed), _BATCH_SIZE):
+            self._aggregate(db, changed[offset:offset + _BATCH_SIZE])
+        self._score(db, as_of)
+        set_version(db, CUSTOMER_SEGMENTS, version)
+        db.commit()
+        return len(changed)
+    
+    def computed(self, db: Session) -> bool:
+        """Whether segments have been refreshed at least once."""
+        return stored_version(db, CUSTOMER_SEGMENTS) is not None
+    
+    def _aggregate(self, db: Session, customer_ids: List[int]) -> None:
+        aggregates = {
+            r.customer_id: r for r in db.query(
+                Transaction.customer_id,
+                func.count(Transaction.id).label('frequency'),
+                func.sum(Transaction.total_amount).label('monetary'),
+                func.min(Transaction.date_key).label('first_key'),
+                func.max(Transaction.date_key).label('last_key')
+            ).filter(
+                Transaction.status == 'completed',
+                Transaction.customer_id.in_(customer_ids)
+            ).group_by(Transaction.customer_id)
+        }
+        # Purchases moved to the cold archive only survive as these totals
+        archived = {
+            r.customer_id: r for r in db.query(ArchivedCustomerTotal).filter(
+                ArchivedCustomerTotal.customer_id.in_(customer_ids)
+            )
+        }
+        
+        rows = []
+        for customer_id in customer_ids:
+            r = aggregates.get(customer_id)
+            a = archived.get(customer_id)
+            first_keys = [k for k in (r and r.first_key, a and a.first_date_key) if k]
+            last_keys = [k for k in (r and r.last_key, a and a.last_date_key) if k]
+            rows.append({
+                'customer_id': customer_id,
+                'frequency': (r.frequency if r else 0) + (a.frequency if a else 0),
+                'monetary': (float(r.monetary or 0) if r else 0.0) + (float(a.monetary) if a else 0.0),
+                'first_purchase_date': key_to_date(min(first_keys)) if first_keys else None,
+                'last_purchase_date': key_to_date(max(last_keys)) if last_keys else None,
+                'r_score': 0,
+                'f_score': 0,
+                'm_score': 0,
+                'segment': NO_PURCHASES_SEGMENT,
+                'clv': 0.0,
+                'loyalty_score': 0,
+            })
+        db.execute(delete(CustomerSegment).where(CustomerSegment.customer_id.in_(customer_ids)))
+        db.execute(insert(CustomerSegment), rows)
+    
+    def _score(self, db: Session, as_of: date) -> None:
+        rows = db.query(
+            CustomerSegment.customer_id, CustomerSegment.frequency, CustomerSegment.monetary,
+            CustomerSegment.first_purchase_date, CustomerSegment.last_purchase_date,
+            CustomerSegment.r_score, CustomerSegment.f_score, CustomerSegment.m_score,
+            CustomerSegment.segment, CustomerSegment.clv, CustomerSegment.loyalty_score
+        ).all()
+        if not rows:
+            return
+        
+        frequency = np.array([r.frequency for r in rows], dtype=np.float64)
+        monetary = np.array([r.monetary for r in rows], dtype=np.float64)
+        recency = np.array(
+            [(as_of - r.last_purchase_date).days if r.last_purchase_date else 0 for r in rows]
+        )
+        tenure = np.array(
+            [(as_of - r.first_purchase_date).days if r.first_purchase_date else 0 for r in rows]
+        )
+        purchased = frequency > 0
+        
+        r_score = np.zeros(len(rows), dtype=np.int64)
+        f_score = np.zeros(len(rows), dtype=np.int64)
+        m_score = np.zeros(len(rows), dtype=np.int64)
+        if purchased.any():
+            r_score[purchased] = _quintile_scores(-recency[purchased])
+            f_score[purchased] = _quintile_scores(frequency[purchased])
+            m_score[purchased] = _quintile_scores(monetary[purchased])
+        
+        fm_score = (f_score + m_score) // 2
+        segment = np.full(len(rows), 'Lost', dtype=object)
+        segment[~purchased] = NO_PURCHASES_SEGMENT
+        assigned = ~purchased
+        for label, r_min, r_max, fm_min, fm_max in _SEGMENT_RULES:
+            match = (
+                ~assigned
+                & (r_score >= r_min) & (r_score <= r_max)
+                & (fm_score >= fm_min) & (fm_score <= fm_max)
+            )
+            segment[match] = label
+            assigned |= match
+        
+        clv = np.where(
+            purchased,
+            monetary / np.maximum(tenure, _MIN_TENURE_DAYS) * _CLV_HORIZON_DAYS,
+            0.0
+        ).round(2)
+        loyalty = np.rint((r_score + f_score + m_score) / 15 * 100).astype(np.int64)
+        
+        changes: List[Dict[str, Any]] = []
+        for i, r in enumerate(rows):
+            scored = (
+                int(r_score[i]), int(f_score[i]), int(m_score[i]),
+                segment[i], float(clv[i]), int(loyalty[i])
+            )
+            if scored != (r.r_score, r.f_score, r.m_score, r.segment, r.clv, r.loyalty_score):
+                changes.append({
+                    'customer_id': r.customer_id,
+                    'r_score': scored[0],
+                    'f_score': scored[1],
+                    'm_score': scored[2],
+                    'segment': scored[3],
+                    'clv': scored[4],
+                    'loyalty_score': scored[5],
+                })
+        for offset in range(0, len(changes), _BATCH_SIZE):
+            db.execute(update(CustomerSegment), changes[offset:offset + _BATCH_SIZE])
+
+
+customer_segment = CRUDCustomerSegment()
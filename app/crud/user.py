@@ -1,5 +1,6 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
+from app.core.pagination import keyset_page
 from app.core.security import get_password_hash, verify_password
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -22,6 +23,10 @@ class CRUDUser:
         """Get multiple users."""
         return db.query(User).offset(skip).limit(limit).all()
     
+    def get_page(self, db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[User], Optional[str]]:
+        """Get users in id order after a cursor, plus the next page's cursor."""
+        return keyset_page(db.query(User), [(User.id, False)], cursor, limit, key=lambda u: (u.id,))
+    
     def create(self, db: Session, obj_in: UserCreate) -> User:
         """Create new user."""
         db_obj = User(
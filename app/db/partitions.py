@@ -0,0 +1,166 @@
+"""Monthly RANGE partitioning of the transaction tables on MySQL.
+
+``transactions`` and ``transaction_items`` are partitioned by
+``RANGE COLUMNS(transaction_date)``, one partition per month named
+``pYYYYMM`` plus a ``pmax`` catch-all, so both tables prune on the same date
+range. Items carry a copy of their transaction's date for that purpose.
+
+MySQL requires the partitioning column in every unique key and does not
+allow foreign keys on partitioned tables, so partitioning a table drops its
+foreign keys and widens its primary key (and the transaction code key) with
+``transaction_date``. The widened code key no longer keeps codes unique;
+the unpartitioned ``transaction_codes`` table does.
+
+Old months leave the hot tables through ``app.crud.archive`` only, which
+records each one in ``archive_segments``; ``drop_partitions_before`` then
+releases the emptied partitions and refuses months that were not archived.
+"""
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+PARTITIONED_TABLES = ("transactions", "transaction_items")
+PARTITION_COLUMN = "transaction_date"
+MAX_PARTITION = "pmax"
+
+
+def supports_partitions(conn: Connection) -> bool:
+    return conn.dialect.name == "mysql"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """The month a ``pYYYYMM`` partition holds; None for ``pmax``."""
+    if name == MAX_PARTITION:
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def _definitions(months: List[date]) -> str:
+    return ", ".join(
+        f"PARTITION {partition_name(month)} VALUES LESS THAN ('{add_months(month, 1).isoformat()}')"
+        for month in months
+    )
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, Optional[date], int]]:
+    """(name, month, estimated rows) of ``table``'s partitions in order; empty if unpartitioned."""
+    rows = conn.execute(text(
+        "SELECT PARTITION_NAME, TABLE_ROWS FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+        "ORDER BY PARTITION_ORDINAL_POSITION"
+    ), {"table": table}).all()
+    return [(name, partition_month(name), int(table_rows or 0)) for name, table_rows in rows]
+
+
+def partition_tables(conn: Connection, last_month: date) -> List[str]:
+    """Partition the transaction tables monthly, from the oldest transaction to ``last_month``.
+
+    Rebuilds both tables; run during a maintenance window. Tables that are
+    already partitioned are left alone. Returns the tables partitioned.
+    """
+    oldest = conn.execute(text(f"SELECT MIN({PARTITION_COLUMN}) FROM transactions")).scalar()
+    first_month = month_start(oldest.date() if oldest else last_month)
+    months = []
+    month = first_month
+    while month <= last_month:
+        months.append(month)
+        month = add_months(month, 1)
+
+    # Foreign keys pointing at a table block partitioning it just like its own
+    inspector = inspect(conn)
+    for table in inspector.get_table_names():
+        for fk in inspector.get_foreign_keys(table):
+            if table in PARTITIONED_TABLES or fk["referred_table"] in PARTITIONED_TABLES:
+                conn.execute(text(f"ALTER TABLE {table} DROP FOREIGN KEY {fk['name']}"))
+
+    partitioned = []
+    for table in PARTITIONED_TABLES:
+        if list_partitions(conn, table):
+            continue
+        conn.execute(text(
+            f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, {PARTITION_COLUMN})"
+        ))
+        if table == "transactions":
+            conn.execute(text(
+                "ALTER TABLE transactions DROP INDEX ix_transactions_transaction_code, "
+                f"ADD UNIQUE INDEX ix_transactions_transaction_code (transaction_code, {PARTITION_COLUMN})"
+            ))
+        conn.execute(text(
+            f"ALTER TABLE {table} PARTITION BY RANGE COLUMNS({PARTITION_COLUMN}) "
+            f"({_definitions(months)}, PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE))"
+        ))
+        partitioned.append(table)
+    return partitioned
+
+
+def ensure_future_partitions(conn: Connection, last_month: date) -> List[str]:
+    """Split ``pmax`` so every month up to ``last_month`` has its own partition.
+
+    Returns the names of the partitions created.
+    """
+    created = []
+    for table in PARTITIONED_TABLES:
+        months = [month for _, month, _ in list_partitions(conn, table) if month]
+        if not months:
+            continue
+        new_months = []
+        month = add_months(max(months), 1)
+        while month <= last_month:
+            new_months.append(month)
+            month = add_months(month, 1)
+        if not new_months:
+            continue
+        conn.execute(text(
+            f"ALTER TABLE {table} REORGANIZE PARTITION {MAX_PARTITION} INTO "
+            f"({_definitions(new_months)}, PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE))"
+        ))
+        created.extend(f"{table}.{partition_name(month)}" for month in new_months)
+    return created
+
+
+def _partitions_before(conn: Connection, table: str, cutoff: date) -> List[str]:
+    return [
+        name for name, month, _ in list_partitions(conn, table)
+        if month is not None and month < month_start(cutoff)
+    ]
+
+
+def drop_partitions_before(conn: Connection, cutoff: date) -> List[str]:
+    """Drop the monthly partitions entirely before ``cutoff``; returns their names.
+
+    Raises ValueError if any of those months is not recorded in
+    ``archive_segments``: its rows would be lost without a trace, and a later
+    rollup rebuild would wipe its daily rollups.
+    """
+    newest = conn.execute(text("SELECT MAX(month) FROM archive_segments")).scalar()
+    archived_until = add_months(newest, 1) if newest else None
+    dropped = []
+    for table in reversed(PARTITIONED_TABLES):
+        names = _partitions_before(conn, table, cutoff)
+        unarchived = [
+            name for name in names if archived_until is None or partition_month(name) >= archived_until
+        ]
+        if unarchived:
+            raise ValueError(
+                f"{table} partitions {', '.join(unarchived)} are not archived; "
+                "run archive_transactions.py for those months first"
+            )
+        if names:
+            conn.execute(text(f"ALTER TABLE {table} DROP PARTITION {', '.join(names)}"))
+            dropped.extend(f"{table}.{name}" for name in names)
+    return dropped
@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.orm import Session
+
+# Rows per statement, well inside SQLite's bind parameter limit
+_MAX_ROWS = 1000
+
+
+def upsert(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    increment: Sequence[str] = (),
+    minimum: Sequence[str] = (),
+    replace: Sequence[str] = (),
+    maximum: Sequence[str] = (),
+) -> None:
+    """Insert rows, merging into rows that already exist.
+
+    ``increment`` columns are added onto the stored value, ``minimum`` and
+    ``maximum`` columns keep the smaller or larger of the stored and incoming
+    value and ``replace`` columns take the incoming value. Replacing also refreshes columns with an
+    SQL ``onupdate`` default, such as ``updated_at``, as an ORM update would.
+
+    Uses ``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL and
+    ``INSERT ... ON CONFLICT DO UPDATE`` on PostgreSQL/SQLite, so each
+    ``_MAX_ROWS`` rows are a single statement. ``index_elements`` must match a
+    unique constraint.
+    """
+    if not rows:
+        return
+    if len(rows) > _MAX_ROWS:
+        for offset in range(0, len(rows), _MAX_ROWS):
+            upsert(
+                db, model, rows[offset:offset + _MAX_ROWS], index_elements,
+                increment, minimum, replace, maximum
+            )
+        return
+
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    touched = _onupdate_values(table, rows[0]) if replace else {}
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        set_ = {col: table.c[col] + stmt.inserted[col] for col in increment}
+        set_.update({col: func.least(table.c[col], stmt.inserted[col]) for col in minimum})
+        set_.update({col: func.greatest(table.c[col], stmt.inserted[col]) for col in maximum})
+        set_.update({col: stmt.inserted[col] for col in replace})
+        set_.update(touched)
+        if set_:
+            stmt = stmt.on_duplicate_key_update(set_)
+        else:
+            stmt = stmt.prefix_with("IGNORE")
+        db.execute(stmt)
+        return
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        least = func.least if dialect == "postgresql" else func.min
+        greatest = func.greatest if dialect == "postgresql" else func.max
+        set_ = {col: table.c[col] + stmt.excluded[col] for col in increment}
+        set_.update({col: least(table.c[col], stmt.excluded[col]) for col in minimum})
+        set_.update({col: greatest(table.c[col], stmt.excluded[col]) for col in maximum})
+        set_.update({col: stmt.excluded[col] for col in replace})
+        set_.update(touched)
+        if set_:
+            stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+        db.execute(stmt)
+        return
+
+    # Generic fallback: one lookup per row, then update or insert
+    for row in rows:
+        key = and_(*[table.c[col] == row[col] for col in index_elements])
+        if db.execute(select(table.c[index_elements[0]]).where(key)).first() is None:
+            db.execute(table.insert().values(row))
+        elif increment or minimum or replace or maximum:
+            values = {col: table.c[col] + row[col] for col in increment}
+            values.update({
+                col: case((table.c[col] > row[col], row[col]), else_=table.c[col])
+                for col in minimum
+            })
+            values.update({
+                col: case((table.c[col] < row[col], row[col]), else_=table.c[col])
+                for col in maximum
+            })
+            values.update({col: row[col] for col in replace})
+            values.update(touched)
+            db.execute(update(table).where(key).values(values))
+
+
+def _onupdate_values(table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """SQL ``onupdate`` defaults of the columns the rows do not set themselves."""
+    return {
+        column.name: column.onupdate.arg
+        for column in table.columns
+        if column.onupdate is not None
+        and column.onupdate.is_clause_element
+        and column.name not in row
+    }
@@ -0,0 +1,74 @@
+"""
+Commit-ordered change tracking for the transactions table.
+
+Every write to ``transactions`` bumps the ``data_versions`` row for
+``TRANSACTIONS`` and stamps the new value into ``change_seq`` of the rows it
+writes. The bump is an UPDATE of one row, whose lock is held until the
+writer commits, so values are handed out in commit order: once a reader sees
+a row with ``change_seq = n``, every row with a smaller value is committed
+too. Readers therefore catch up exactly with ``change_seq > last seen`` and
+can skip the query altogether while the version has not moved.
+"""
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.retail import DataVersion, Transaction
+
+TRANSACTIONS = "transactions"
+# Transactions version the customer RFM segments were last refreshed up to
+CUSTOMER_SEGMENTS = "customer_segments"
+# Bumped by reference data upserts, which can remap products and stores
+REFERENCE = "reference"
+
+# Imported rows published per commit
+_PUBLISH_BATCH = 5000
+
+
+def current_version(db: Session, name: str = TRANSACTIONS) -> int:
+    """The last committed version of ``name`` (0 before the first write)."""
+    return stored_version(db, name) or 0
+
+
+def stored_version(db: Session, name: str) -> Optional[int]:
+    """The last committed version of ``name``, None if it was never written."""
+    return db.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar()
+
+
+def set_version(db: Session, name: str, version: int) -> None:
+    """Record ``version`` for ``name`` inside the caller's transaction."""
+    upsert(db, DataVersion, [{"name": name, "version": version}], index_elements=("name",), replace=("version",))
+
+
+def bump_version(db: Session, name: str = TRANSACTIONS) -> int:
+    """Take the next version of ``name`` inside the caller's transaction.
+
+    Call it as late as possible before committing: concurrent writers wait on
+    the counter row until this transaction ends.
+    """
+    bump = update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1)
+    if db.execute(bump).rowcount == 0:
+        upsert(db, DataVersion, [{"name": name, "version": 0}], index_elements=("name",))
+        db.execute(bump)
+    return db.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar_one()
+
+
+def publish_unstamped(db: Session) -> int:
+    """Stamp rows bulk loaders left without ``change_seq``; return how many.
+
+    Loaders write headers and items in separate commits, so their rows stay
+    invisible to change readers until the whole load is in.
+    """
+    published = 0
+    while True:
+        ids = db.execute(
+            select(Transaction.id).where(Transaction.change_seq.is_(None))
+            .order_by(Transaction.id).limit(_PUBLISH_BATCH)
+        ).scalars().all()
+        if not ids:
+            return published
+        db.execute(update(Transaction).where(Transaction.id.in_(ids)).values(change_seq=bump_version(db)))
+        db.commit()
+        published += len(ids)
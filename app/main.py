@@ -1,7 +1,19 @@
-from fastapi import FastAPI
+import logging
+from datetime import date
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.v1 import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.crud.archive import ArchivedRangeError
+from app.crud.group_commit import transaction_group_commit
+from app.db.base import engine
+from app.db.partitions import add_months, ensure_future_partitions, month_start, supports_partitions
+
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -10,6 +22,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse,
 )
 
 # Set up CORS
@@ -20,12 +33,48 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
+    )
+
+# Compress large responses with gzip or brotli
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
     )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(ArchivedRangeError)
+async def archived_range(request: Request, exc: ArchivedRangeError):
+    """Raw-row queries over archived months are bad requests, not server errors."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.on_event("startup")
+def extend_transaction_partitions():
+    """Create the coming months' transaction partitions if the tables are partitioned."""
+    last_month = add_months(month_start(date.today()), settings.PARTITION_MONTHS_AHEAD)
+    try:
+        with engine.begin() as conn:
+            if supports_partitions(conn):
+                for name in ensure_future_partitions(conn, last_month):
+                    logger.info(f"Created partition {name}")
+    except Exception as e:
+        # Another worker may be extending them at the same time
+        logger.warning(f"Could not extend transaction partitions: {e}")
+
+
+@app.on_event("shutdown")
+def flush_group_commit():
+    """Commit transactions still queued for group commit."""
+    transaction_group_commit.close()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Float, Date, DateTime, ForeignKey, Text, Boolean,
+    Index, UniqueConstraint
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -142,32 +145,76 @@ class Transaction(Base):
     store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
     transaction_date = Column(DateTime(timezone=True), nullable=False)
+    date_key = Column(Integer, index=True)  # YYYYMMDD business date, see calendar_days
     total_amount = Column(Float, nullable=False)
     discount_amount = Column(Float, default=0.0)
     tax_amount = Column(Float, default=0.0)
     payment_method = Column(String(50))
     status = Column(String(20), default='completed')  # completed, cancelled, refunded
+    # data_versions value of the commit that wrote the row, in commit order;
+    # NULL until bulk imports publish their rows (see app.db.versions)
+    change_seq = Column(BigInteger, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Covers the analytics filter (status, date range) plus the columns
+        # the aggregates read, so those scans never touch the clustered rows
+        Index(
+            "ix_transactions_status_date_covering",
+            "status", "transaction_date", "store_id", "customer_id", "total_amount"
+        ),
+        # Keyset pagination of recent transactions, newest first
+        Index("ix_transactions_date_id", "transaction_date", "id"),
+    )
+    
     # Relationships
     store = relationship("Store", back_populates="transactions")
     customer = relationship("Customer", back_populates="transactions")
     items = relationship("TransactionItem", back_populates="transaction")
 
 
+class TransactionCode(Base):
+    """Global uniqueness of transaction codes, and the code -> id lookup.
+    
+    Partitioning ``transactions`` by date widens its code key to
+    (transaction_code, transaction_date), which no longer stops a code being
+    stored twice, so every writer also inserts the code here in the same
+    database transaction. Rows outlive archiving, so archived codes stay taken.
+    """
+    __tablename__ = "transaction_codes"
+    
+    transaction_code = Column(String(100), primary_key=True)
+    transaction_id = Column(Integer, nullable=False)
+    transaction_date = Column(DateTime(timezone=True), nullable=False)
+
+
 class TransactionItem(Base):
     __tablename__ = "transaction_items"
     
     id = Column(Integer, primary_key=True, index=True)
     transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    # Copy of the transaction's date, so items partition (and prune) with it
+    transaction_date = Column(DateTime(timezone=True), nullable=False)
     quantity = Column(Float, nullable=False)
     unit_price = Column(Float, nullable=False)
     total_price = Column(Float, nullable=False)
     discount_amount = Column(Float, default=0.0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        # Item joins run from either side, so cover both directions
+        Index(
+            "ix_transaction_items_tx_product_covering",
+            "transaction_id", "product_id", "quantity", "total_price"
+        ),
+        Index(
+            "ix_transaction_items_product_tx_covering",
+            "product_id", "transaction_id", "quantity", "total_price"
+        ),
+    )
+    
     # Relationships
     transaction = relationship("Transaction", back_populates="items")
     product = relationship("Product", back_populates="transaction_items")
@@ -186,4 +233,211 @@ class Inventory(Base):
     
     # Relationships
     store = relationship("Store")
-    product = relationship("Product")
\ No newline at end of file
+    product = relationship("Product")
+
+
+class DailyStoreSales(Base):
+    """Store x day rollup of completed transaction headers."""
+    __tablename__ = "daily_store_sales"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sales_date = Column(Date, nullable=False, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    total_sales = Column(Float, nullable=False, default=0.0)
+    total_transactions = Column(Integer, nullable=False, default=0)
+    total_items = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("sales_date", "store_id", name="uq_daily_store_sales"),
+    )
+    
+    # Relationships
+    store = relationship("Store")
+
+
+class DailyProductSales(Base):
+    """Store x product x day rollup of completed transaction items."""
+    __tablename__ = "daily_product_sales"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sales_date = Column(Date, nullable=False, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    total_sales = Column(Float, nullable=False, default=0.0)
+    total_quantity = Column(Float, nullable=False, default=0.0)
+    total_transactions = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("sales_date", "store_id", "product_id", name="uq_daily_product_sales"),
+    )
+    
+    # Relationships
+    store = relationship("Store")
+    product = relationship("Product")
+
+
+class DailyGroupSales(Base):
+    """Store x brand/category x day rollup, so basket counts stay distinct per group."""
+    __tablename__ = "daily_group_sales"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sales_date = Column(Date, nullable=False, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    group_type = Column(String(20), nullable=False)  # brand, category
+    group_id = Column(Integer, nullable=False)
+    total_sales = Column(Float, nullable=False, default=0.0)
+    total_quantity = Column(Float, nullable=False, default=0.0)
+    total_transactions = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "sales_date", "store_id", "group_type", "group_id", name="uq_daily_group_sales"
+        ),
+    )
+
+
+class DailySketchRegister(Base):
+    """HyperLogLog registers of distinct customers/products per day.
+    
+    Registers store 2^-rank, so merging any set of days is MIN(weight) per
+    register; registers that were never hit have no row.
+    """
+    __tablename__ = "daily_sketch_registers"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sales_date = Column(Date, nullable=False)
+    sketch = Column(String(20), nullable=False)  # customer, product
+    register_index = Column(Integer, nullable=False)
+    weight = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "sales_date", "sketch", "register_index", name="uq_daily_sketch_registers"
+        ),
+    )
+
+
+class DailyBasketBucket(Base):
+    """Per store and day quantile sketch of transaction amounts.
+    
+    Each row counts the transactions whose amount falls in one log-scale
+    bucket (see ``app.core.sketches.quantile_bucket``), so any date range
+    merges by summing counts per bucket.
+    """
+    __tablename__ = "daily_basket_buckets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sales_date = Column(Date, nullable=False, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    bucket_index = Column(Integer, nullable=False)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "sales_date", "store_id", "bucket_index", name="uq_daily_basket_buckets"
+        ),
+    )
+
+
+class CustomerSegment(Base):
+    """Precomputed RFM scores and segment of a customer, refreshed in batch by ``app.crud.rfm``."""
+    __tablename__ = "customer_segments"
+    
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True, autoincrement=False)
+    frequency = Column(Integer, nullable=False, default=0)
+    monetary = Column(Float, nullable=False, default=0.0)
+    first_purchase_date = Column(Date)
+    last_purchase_date = Column(Date)
+    r_score = Column(Integer, nullable=False, default=0)  # 1-5, 0 without purchases
+    f_score = Column(Integer, nullable=False, default=0)
+    m_score = Column(Integer, nullable=False, default=0)
+    segment = Column(String(30), nullable=False)
+    clv = Column(Float, nullable=False, default=0.0)
+    loyalty_score = Column(Integer, nullable=False, default=0)  # 0-100
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Serve the ranked listing, with and without a segment filter, in index order
+        Index("ix_customer_segments_loyalty", "loyalty_score", "customer_id"),
+        Index("ix_customer_segments_segment_loyalty", "segment", "loyalty_score", "customer_id"),
+    )
+    
+    # Relationships
+    customer = relationship("Customer")
+
+
+class ImportCheckpoint(Base):
+    """Progress of one POS history import file (see ``import_pos_history.py``).
+    
+    Updated in the same database transaction as each loaded chunk, so a
+    resumed import never loads a row twice.
+    """
+    __tablename__ = "import_checkpoints"
+    
+    source_key = Column(String(40), primary_key=True)  # sha1 of the absolute path
+    source = Column(String(500), nullable=False)
+    rows_read = Column(Integer, nullable=False, default=0)
+    first_day = Column(Date)  # business days loaded so far, for the rollup rebuild
+    last_day = Column(Date)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ArchiveSegment(Base):
+    """Manifest entry for one month of transactions moved to a compressed file.
+    
+    Written by ``app.crud.archive`` in the same database transaction that
+    deletes the archived rows from the hot tables.
+    """
+    __tablename__ = "archive_segments"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    month = Column(Date, nullable=False, index=True)  # first day of the transaction_date month
+    path = Column(String(500), unique=True, nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+    item_count = Column(Integer, nullable=False)
+    total_sales = Column(Float, nullable=False)  # completed transactions only
+    first_transaction_id = Column(Integer, nullable=False)
+    last_transaction_id = Column(Integer, nullable=False)
+    file_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ArchivedCustomerTotal(Base):
+    """Per-customer purchase totals of the archived completed transactions, for RFM."""
+    __tablename__ = "archived_customer_totals"
+    
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True, autoincrement=False)
+    frequency = Column(Integer, nullable=False)
+    monetary = Column(Float, nullable=False)
+    first_date_key = Column(Integer, nullable=False)
+    last_date_key = Column(Integer, nullable=False)
+
+
+class DataVersion(Base):
+    """Commit counter per data set, bumped by every write to it (see app.db.versions)."""
+    __tablename__ = "data_versions"
+    
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class CalendarDay(Base):
+    """Calendar dimension keyed by YYYYMMDD business date."""
+    __tablename__ = "calendar_days"
+    
+    date_key = Column(Integer, primary_key=True, autoincrement=False)
+    calendar_date = Column(Date, unique=True, nullable=False)
+    day_of_week = Column(Integer, nullable=False)  # ISO, Monday = 1
+    iso_year = Column(Integer, nullable=False)
+    iso_week = Column(Integer, nullable=False)
+    week_key = Column(Integer, nullable=False, index=True)  # YYYYWW (ISO)
+    week_start = Column(Date, nullable=False)
+    month = Column(Integer, nullable=False)
+    month_key = Column(Integer, nullable=False, index=True)  # YYYYMM
+    month_start = Column(Date, nullable=False)
+    quarter = Column(Integer, nullable=False)
+    quarter_key = Column(Integer, nullable=False, index=True)  # YYYYQ
+    quarter_start = Column(Date, nullable=False)
+    year = Column(Integer, nullable=False, index=True)
+    year_start = Column(Date, nullable=False)
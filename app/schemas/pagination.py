@@ -0,0 +1,11 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list."""
+    items: List[T]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; None on the last page
@@ -0,0 +1,19 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class CampaignSearchRequest(BaseModel):
+    query: Optional[str] = ""
+    filters: Optional[Dict[str, Any]] = {}
+    limit: Optional[int] = 10
+    offset: Optional[int] = 0
+
+class AwardPredictionRequest(BaseModel):
+    campaign_text: str
+
+class PHAwardsResponse(BaseModel):
+    success: bool
+    data: Any
+    timestamp: str
+    message: Optional[str] = None
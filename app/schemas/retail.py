@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -236,6 +236,40 @@ class Transaction(TransactionBase):
         from_attributes = True
 
 
+class BulkUpsertResponse(BaseModel):
+    upserted: int
+    ids: Dict[str, int]  # natural key -> id
+
+
+class BulkTransactionResult(BaseModel):
+    index: int
+    transaction_code: str
+    status: str  # created, failed
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkTransactionResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkTransactionResult]
+
+
+class IngestError(BaseModel):
+    line: int
+    transaction_code: Optional[str] = None
+    error: str
+
+
+class StreamIngestResponse(BaseModel):
+    lines: int
+    created: int
+    failed: int
+    batches: int
+    errors: List[IngestError]
+    errors_truncated: bool = False
+
+
 # Analytics response schemas
 class SalesByRegion(BaseModel):
     region_code: str
@@ -280,6 +314,9 @@ class StorePerformance(BaseModel):
     total_sales: float
     total_transactions: int
     avg_basket_size: float
+    p50_basket_size: Optional[float] = None
+    p90_basket_size: Optional[float] = None
+    p99_basket_size: Optional[float] = None
     sales_growth: Optional[float] = None
 
 
@@ -299,12 +336,49 @@ class SalesTrend(BaseModel):
     avg_basket_size: float
 
 
+class RetailDashboard(BaseModel):
+    sales_by_region: List[SalesByRegion]
+    sales_by_brand: List[SalesByBrand]
+    sales_by_category: List[SalesByCategory]
+    top_selling_products: List[TopSellingProduct]
+    summary: TransactionSummary
+
+
+class AnalyticsCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    size: int
+    maxsize: int
+    ttl: float
+    data_version: int
+
+
+class GroupCommitStats(BaseModel):
+    enabled: bool
+    queue_depth: int
+    max_queue_depth: int
+    batches: int
+    failed_batches: int
+    records: int
+    avg_batch_size: float
+    max_batch_size: int
+    last_flush_ms: float
+    avg_flush_ms: float
+    max_flush_ms: float
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
 class RFMSegment(BaseModel):
     customer_id: str
     customer_name: str
-    recency: int
+    recency: Optional[int] = None  # days since last purchase
     frequency: int
     monetary: float
     segment: str
     clv: float
-    loyalty_score: int
\ No newline at end of file
+    loyalty_score: int
+    r_score: Optional[int] = None
+    f_score: Optional[int] = None
+    m_score: Optional[int] = None
\ No newline at end of file
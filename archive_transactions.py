@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Move months of transactions older than the archive horizon to compressed files
+
+Each month becomes one .npz column file in --dir, listed in archive_segments,
+and its rows are deleted from transactions and transaction_items. Daily
+rollups keep covering archived months, so day-aligned analytics still see
+them. The API never reads the files: queries that need raw rows of an
+archived month (partial days, exact=true, engine=columnar) answer 400. Read
+archived months offline with app.crud.archive.load_segment.
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.core.config import settings
+from app.crud.archive import horizon_cutoff, transaction_archive
+from app.db.base import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old retail transactions")
+    parser.add_argument(
+        "--before", type=date.fromisoformat,
+        help="Archive the months entirely before this date (YYYY-MM-DD); "
+             f"default keeps ARCHIVE_HORIZON_MONTHS={settings.ARCHIVE_HORIZON_MONTHS} months hot"
+    )
+    parser.add_argument("--dir", default=settings.ARCHIVE_DIR, help="Directory for the archive files")
+    parser.add_argument("--list", action="store_true", help="List archived months and exit")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        if args.list:
+            segments = transaction_archive.segments(db)
+            print(f"📊 {len(segments)} archived segment(s)")
+            for s in segments:
+                print(
+                    f"  {s.month:%Y-%m}  {s.transaction_count:>9,} tx  {s.item_count:>10,} items  "
+                    f"{s.total_sales:>16,.2f}  {s.file_bytes / 1e6:8.1f} MB  {s.path}"
+                )
+            return
+        
+        cutoff = args.before or horizon_cutoff()
+        print(f"Archiving transactions before {cutoff} to {args.dir}...")
+        segments = transaction_archive.archive_before(db, cutoff, args.dir)
+        for s in segments:
+            print(f"  📥 {s.month:%Y-%m}: {s.transaction_count:,} transactions -> {s.path}")
+        print(f"✅ Archived {len(segments)} month(s)")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error archiving transactions: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+    
+    if segments:
+        print(
+            "ℹ️  Run `python refresh_customer_segments.py` for RFM to pick up the archived totals"
+            " and, on partitioned MySQL, `python manage_partitions.py drop"
+            f" --before {cutoff}` to release the emptied partitions"
+        )
+
+
+if __name__ == "__main__":
+    main()
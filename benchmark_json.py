@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding of large responses
+
+Compares FastAPI's default encoding (response model validation, conversion to
+JSON-compatible objects, json.dumps) with the FAST_JSON_RESPONSES paths: the
+same conversion rendered by orjson, and the schemas' compiled serializers.
+Payloads are built in memory, so no database is needed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, List, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import FastJSONResponse, orjson
+from app.crud.profiles import analytics_transaction_profile, transaction_profile
+from app.schemas import analytics as analytics_schemas
+from app.schemas import retail as schemas
+from app.schemas.ph_awards import PHAwardsResponse
+
+
+def retail_transactions(rows: int) -> List[schemas.Transaction]:
+    """Transactions shaped like /retail/transactions with every relation expanded."""
+    now = datetime(2024, 6, 1, 12, 0)
+    region = schemas.Region(id=1, code="NCR", name="National Capital Region", created_at=now)
+    province = schemas.Province(id=1, code="MNL", name="Metro Manila", region_id=1, created_at=now, region=region)
+    city = schemas.City(id=1, code="MKT", name="Makati", province_id=1, created_at=now, province=province)
+    stores = [
+        schemas.Store(
+            id=i, code=f"S{i:03d}", name=f"Store {i}", address=f"{i} Ayala Ave", latitude=14.55, longitude=121.02,
+            region_id=1, city_id=1, created_at=now, region=region, city=city
+        ) for i in range(1, 21)
+    ]
+    brand = schemas.Brand(id=1, code="ALS", name="Alaska", manufacturer="Alaska Milk Corp", created_at=now)
+    category = schemas.Category(id=1, code="DAI", name="Dairy", created_at=now)
+    products = [
+        schemas.Product(
+            id=i, sku=f"SKU{i:05d}", name=f"Product {i}", size="1L", unit="pc", brand_id=1, category_id=1,
+            cost_price=40.0, selling_price=55.5, created_at=now, brand=brand, category=category
+        ) for i in range(1, 201)
+    ]
+    customers = [
+        schemas.Customer(id=i, customer_code=f"C{i:06d}", name=f"Customer {i}", created_at=now)
+        for i in range(1, 501)
+    ]
+    transactions = []
+    for i in range(rows):
+        items = [
+            schemas.TransactionItem(
+                id=i * 3 + j, transaction_id=i, product_id=products[(i + j) % 200].id, quantity=2.0,
+                unit_price=55.5, total_price=111.0, created_at=now, product=products[(i + j) % 200]
+            ) for j in range(3)
+        ]
+        transactions.append(schemas.Transaction(
+            id=i, transaction_code=f"TX{i:08d}", store_id=stores[i % 20].id, customer_id=customers[i % 500].id,
+            transaction_date=now - timedelta(minutes=i), total_amount=333.0, tax_amount=35.68,
+            payment_method="cash", created_at=now, store=stores[i % 20], customer=customers[i % 500], items=items
+        ))
+    return transactions
+
+
+def analytics_transactions(rows: int) -> List[analytics_schemas.TransactionResponse]:
+    return [
+        analytics_schemas.TransactionResponse(
+            id=i, order_id=f"CA-2024-{i:06d}", order_date=date(2024, 1, 1) + timedelta(days=i % 365),
+            customer_name=f"Customer {i % 800}", product_name=f"Product {i % 1500}", category="Technology",
+            sales=261.96, profit=41.91, quantity=2, region="South", city="Henderson"
+        ) for i in range(rows)
+    ]
+
+
+def ph_awards_search(rows: int) -> PHAwardsResponse:
+    campaigns = [
+        {
+            "id": i, "campaign_name": f"Campaign {i}", "brand": f"Brand {i % 50}", "year": 2020 + i % 5,
+            "award_show": "Kidlat", "won_award": i % 3 == 0, "overall_ces_score": 71.5 + i % 20,
+            "is_csr_campaign": i % 2 == 0, "uses_local_culture": True, "targets_youth": False,
+            "has_environmental_angle": False, "is_purpose_driven": True, "description": "A" * 200
+        } for i in range(rows)
+    ]
+    return PHAwardsResponse(
+        success=True,
+        data={"campaigns": campaigns, "pagination": {"total": rows, "limit": rows, "offset": 0, "has_more": False}},
+        timestamp=datetime(2024, 6, 1).isoformat()
+    )
+
+
+def fastapi_encoder(response_model: Any, response_class) -> Callable[[Any], bytes]:
+    """Encode the way a route with ``response_model`` does."""
+    field = create_response_field(name="response", type_=response_model)
+
+    def encode(content: Any) -> bytes:
+        jsonable = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=False))
+        return response_class(jsonable).body
+    return encode
+
+
+def measure(encode: Callable[[Any], bytes], content: Any, repeat: int) -> Tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode(content)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of large responses")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per payload (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per encoder; the best is reported")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("⚠️ orjson is not installed; the orjson path falls back to json.dumps")
+
+    payloads = [
+        ("/retail/transactions", List[schemas.Transaction], retail_transactions(args.rows),
+         transaction_profile.dump_json),
+        ("/analytics/transactions", List[analytics_schemas.TransactionResponse], analytics_transactions(args.rows),
+         analytics_transaction_profile.dump_json),
+        ("/ph-awards/campaigns/search", PHAwardsResponse, ph_awards_search(args.rows),
+         lambda model: model.model_dump_json().encode()),
+    ]
+
+    print(f"📊 Encoding {args.rows} rows, best of {args.repeat} runs\n")
+    print(f"{'Payload':<30} {'Encoder':<22} {'ms':>8} {'MB/s':>9} {'Speedup':>8}")
+    failed = False
+    for name, response_model, content, compiled in payloads:
+        encoders = [
+            ("FastAPI default", fastapi_encoder(response_model, JSONResponse)),
+            ("orjson response class", fastapi_encoder(response_model, FastJSONResponse)),
+            ("compiled serializer", compiled),
+        ]
+        baseline, expected = None, None
+        for label, encode in encoders:
+            seconds, body = measure(encode, content, args.repeat)
+            baseline = baseline or seconds
+            if expected is None:
+                expected = json.loads(body)
+            elif json.loads(body) != expected:
+                print(f"❌ {name}: {label} output differs from FastAPI's")
+                failed = True
+            print(
+                f"{name:<30} {label:<22} {seconds * 1000:>8.1f} "
+                f"{len(body) / seconds / 1e6:>9.1f} {baseline / seconds:>7.1f}x"
+            )
+        print()
+
+    if failed:
+        sys.exit(1)
+    print("✅ All encoders produced the same JSON")
+
+
+if __name__ == "__main__":
+    main()
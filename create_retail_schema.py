@@ -18,8 +18,10 @@ from app.db.base import Base
 from app.models.user import User  # Import existing models first
 from app.models.retail import (  # Then import new models
     Region, Province, City, Store, Brand, Category, Product, 
-    Customer, Transaction, TransactionItem, Inventory
+    Customer, Transaction, TransactionCode, TransactionItem, Inventory
 )
+from app.crud.retail import sales_rollup
+from app.db.versions import publish_unstamped
 
 def create_tables():
     """Create all tables"""
@@ -323,6 +325,11 @@ def seed_sample_transactions():
                 )
                 db.add(transaction)
                 db.flush()  # Get transaction ID
+                db.add(TransactionCode(
+                    transaction_code=transaction_code,
+                    transaction_id=transaction.id,
+                    transaction_date=transaction.transaction_date
+                ))
                 
                 # Add transaction items
                 num_items = random.randint(1, 5)
@@ -337,6 +344,7 @@ def seed_sample_transactions():
                     
                     item = TransactionItem(
                         transaction_id=transaction.id,
+                        transaction_date=transaction.transaction_date,
                         product_id=product.id,
                         quantity=quantity,
                         unit_price=unit_price,
@@ -348,6 +356,7 @@ def seed_sample_transactions():
                 transaction.total_amount = total_amount
         
         db.commit()
+        publish_unstamped(db)
         print(f"✅ {transaction_count} sample transactions seeded successfully!")
         
     except Exception as e:
@@ -357,6 +366,24 @@ def seed_sample_transactions():
     finally:
         db.close()
 
+def build_sales_rollups():
+    """Build daily sales rollups from the seeded transactions"""
+    print("Building daily sales rollups...")
+    engine = create_engine(settings.DATABASE_URL)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    
+    try:
+        sales_rollup.rebuild(db)
+        print("✅ Sales rollups built successfully!")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error building sales rollups: {e}")
+        raise
+    finally:
+        db.close()
+
 def main():
     """Main setup function"""
     print("🚀 Setting up Scout Analytics retail database...")
@@ -377,6 +404,9 @@ def main():
         # Step 5: Seed sample transactions
         seed_sample_transactions()
         
+        # Step 6: Build sales rollups for the seeded history
+        build_sales_rollups()
+        
         print("🎉 Scout Analytics retail database setup completed successfully!")
         print("\n📊 Database contains:")
         print("  ✅ Philippine regional geography")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Run EXPLAIN on every retail analytics query and report which indexes it uses
+"""
+import argparse
+import re
+import sys
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import event
+
+from app.db.base import SessionLocal, engine
+from app.crud.retail import CRUDAnalytics
+
+# Tables whose full scans make the analytics endpoints slow
+HOT_TABLES = ("transactions", "transaction_items")
+
+_PG_ACCESS = re.compile(
+    r"(Index Only Scan|Index Scan|Bitmap Index Scan)(?: Backward)? using (\S+)(?: on (\S+))?"
+    r"|Seq Scan on (\S+)"
+)
+_SQLITE_ACCESS = re.compile(r"^(SCAN|SEARCH) (\S+)(?: USING (COVERING INDEX|INDEX) (\S+)| USING (INTEGER PRIMARY KEY))?")
+
+
+def capture_statements(call):
+    """Run ``call`` and return the (statement, parameters) of every SELECT it issued."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(db, statement, parameters):
+    """Return (table, access, index) tuples from the database's query plan."""
+    conn = db.connection()
+    dialect = conn.dialect.name
+
+    if dialect == "mysql":
+        result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        columns = list(result.keys())
+        plan = []
+        for row in result:
+            row = dict(zip(columns, row))
+            extra = row.get("Extra") or ""
+            if row.get("key"):
+                access = "covering index" if "Using index" in extra else "index"
+            else:
+                access = "full scan" if row.get("type") == "ALL" else (row.get("type") or extra)
+            if row.get("partitions"):
+                # Partitions left after pruning on the date range
+                access += f" [partitions {row['partitions']}]"
+            plan.append((row.get("table"), access, row.get("key")))
+        return plan
+
+    if dialect == "postgresql":
+        plan = []
+        for (line,) in conn.exec_driver_sql(f"EXPLAIN {statement}", parameters):
+            match = _PG_ACCESS.search(line)
+            if not match:
+                continue
+            if match.group(4):
+                plan.append((match.group(4), "full scan", None))
+            else:
+                access = "covering index" if match.group(1) == "Index Only Scan" else "index"
+                plan.append((match.group(3), access, match.group(2)))
+        return plan
+
+    if dialect == "sqlite":
+        plan = []
+        for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            match = _SQLITE_ACCESS.match(row[-1])
+            if not match:
+                continue
+            verb, table, using, index, primary_key = match.groups()
+            if primary_key:
+                access, index = "index", "PRIMARY"
+            elif using == "COVERING INDEX":
+                access = "covering index"
+            elif using:
+                access = "index"
+            else:
+                access = "full scan" if verb == "SCAN" else "search"
+            plan.append((table, access, index))
+        return plan
+
+    raise ValueError(f"EXPLAIN is not supported for the {dialect} dialect")
+
+
+def analytics_calls(analytics, start, end):
+    """The analytics queries to explain, by label."""
+    calls = [
+        ("sales_by_region", lambda db: analytics.get_sales_by_region(db, start, end)),
+        ("sales_by_brand", lambda db: analytics.get_sales_by_brand(db, start, end)),
+        ("sales_by_category", lambda db: analytics.get_sales_by_category(db, start, end)),
+        ("top_selling_products", lambda db: analytics.get_top_selling_products(db, start, end)),
+        ("store_performance", lambda db: analytics.get_store_performance(db, start, end)),
+        ("transaction_summary", lambda db: analytics.get_transaction_summary(db, start, end)),
+        ("transaction_summary_exact",
+         lambda db: analytics.get_transaction_summary(db, start, end, exact=True)),
+        ("dashboard", lambda db: analytics.get_dashboard(db, start, end)),
+    ]
+    for granularity in ("day", "week", "month"):
+        calls.append((
+            f"sales_trends_{granularity}",
+            lambda db, g=granularity: analytics.get_sales_trends(db, start, end, g)
+        ))
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report index usage of the retail analytics queries")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Start of the analysis window")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="End of the analysis window")
+    args = parser.parse_args()
+
+    today = datetime.combine(datetime.now().date(), time.min)
+    if args.start or args.end:
+        windows = [("requested window", args.start or today - timedelta(days=30), args.end or datetime.now())]
+    else:
+        # Whole days are answered from the rollups, partial days from raw transactions
+        windows = [
+            ("day-aligned (rollups)", today - timedelta(days=30), today),
+            ("partial-day (raw)", today - timedelta(days=30, hours=-9), today - timedelta(hours=3)),
+        ]
+
+    analytics = CRUDAnalytics()
+    db = SessionLocal()
+    full_scans = 0
+    try:
+        for window_label, start, end in windows:
+            print(f"\n🔍 {window_label}: {start} to {end}")
+            for label, call in analytics_calls(analytics, start, end):
+                statements = capture_statements(lambda: call(db))
+                print(f"\n  {label} ({len(statements)} statement{'s' if len(statements) != 1 else ''})")
+                for statement, parameters in statements:
+                    for table, access, index in explain(db, statement, parameters):
+                        if access.startswith("full scan") and table in HOT_TABLES:
+                            full_scans += 1
+                            print(f"    ⚠️  {table}: {access}")
+                        else:
+                            print(f"    ✅ {table}: {access}{f' {index}' if index else ''}")
+    except Exception as e:
+        print(f"❌ Error explaining analytics queries: {e}")
+        sys.exit(1)
+    finally:
+        db.rollback()
+        db.close()
+
+    if full_scans:
+        print(f"\n⚠️  {full_scans} full scan(s) of transaction tables; run `alembic upgrade head`")
+    else:
+        print("\n✅ No analytics query scans the transaction tables")
+
+
+if __name__ == "__main__":
+    main()
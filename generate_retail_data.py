@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Generate a deterministic synthetic retail history for performance testing
+
+Reference data (brands, categories, products, stores, customers) is upserted
+under SYN- codes, then worker processes generate the days of transactions
+and line items in parallel. Every day draws from its own random stream keyed
+by --seed and the date, so the same arguments always produce the same rows
+whatever the number of workers.
+
+Daily volume per store follows the store's size, the weekday, paydays (the
+15th and month end), a December peak and yearly growth. Shoppers pick
+products by a Zipf-like popularity and members by a skewed activity level.
+
+By default rows are bulk inserted with precomputed ids, so point it at a
+dedicated performance database rather than one taking live writes. With
+--out, each chunk of days is written as a CSV pair in the
+import_pos_history.py format instead.
+
+The defaults (200 stores x 730 days x ~28 transactions x ~2.6 items) produce
+about 4M transactions and 10M+ line items.
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.calendar import date_key
+from app.core.config import settings
+from app.crud.retail import (
+    brand, calendar, category, city, customer, product, province, region, sales_rollup, store
+)
+from app.db.bulk import bulk_insert, loader_engine
+from app.db.versions import publish_unstamped
+from app.models.retail import City, Province, Transaction, TransactionCode, TransactionItem
+from app.schemas.retail import (
+    BrandCreate, CategoryCreate, CityCreate, CustomerCreate, ProductCreate, ProvinceCreate,
+    RegionCreate, StoreCreate
+)
+
+PAYMENT_METHODS = ("cash", "gcash", "credit_card", "debit_card", "paymaya")
+PAYMENT_SHARES = (0.55, 0.2, 0.1, 0.1, 0.05)
+STATUSES = ("completed", "cancelled", "refunded")
+STATUS_SHARES = (0.97, 0.02, 0.01)
+# Opening hours 7:00-21:59 with lunch and after-work peaks
+HOURS = np.arange(7, 22)
+HOUR_WEIGHTS = np.array([2, 4, 5, 6, 9, 9, 6, 5, 5, 6, 8, 9, 7, 5, 3], dtype=np.float64)
+WEEKDAY_FACTORS = (0.9, 0.9, 0.95, 1.0, 1.1, 1.3, 1.2)  # Monday first
+WALK_IN_SHARE = 0.35
+VAT_RATE = 0.12  # prices are VAT inclusive
+ZIPF_EXPONENT = 1.07
+EXTRA_UNITS = 0.35  # mean units bought beyond the first, per line
+
+# Per worker process: session factory (None when writing CSV) and the reference arrays
+_session_factory: Optional[sessionmaker] = None
+_reference: Dict[str, Any] = {}
+
+
+def _day_rng(seed: int, day: date) -> np.random.Generator:
+    return np.random.default_rng([seed, day.toordinal()])
+
+
+def _day_factor(day: date, start: date, growth: float) -> float:
+    """Expected volume of ``day`` relative to an ordinary weekday at ``start``."""
+    factor = WEEKDAY_FACTORS[day.weekday()]
+    if day.day in (15, 16) or (day + timedelta(days=1)).month != day.month or day.day == 1:
+        factor *= 1.15  # paydays
+    # Gentle yearly wave peaking mid-December, plus the Christmas rush
+    factor *= 1 + 0.1 * math.cos(2 * math.pi * (day.timetuple().tm_yday - 350) / 365.25)
+    if day.month == 12 and day.day >= 10:
+        factor *= 1.25
+    return factor * (1 + growth) ** ((day - start).days / 365.25)
+
+
+def _day_shape(rng: np.random.Generator, day: date, options: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Transactions per store and items per transaction; the first draws of a day's stream."""
+    expected = _reference["store_weights"] * options["daily_transactions"] * _day_factor(
+        day, options["start"], options["growth"]
+    )
+    store_counts = rng.poisson(expected)
+    baskets = 1 + rng.poisson(options["avg_basket"] - 1, int(store_counts.sum()))
+    return store_counts, baskets
+
+
+def _weights(values: np.ndarray) -> np.ndarray:
+    return values / values.sum()
+
+
+def _init_worker(database_url: Optional[str], reference: Dict[str, Any]):
+    global _session_factory
+    _reference.update(reference)
+    if database_url:
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=loader_engine(database_url))
+
+
+def _generate_day(day: date, options: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    ref = _reference
+    rng = _day_rng(options["seed"], day)
+    store_counts, baskets = _day_shape(rng, day, options)
+    n = baskets.size
+
+    seconds = rng.choice(HOURS, n, p=_weights(HOUR_WEIGHTS)) * 3600 + rng.integers(0, 3600, n)
+    stores = np.repeat(np.arange(store_counts.size), store_counts)
+    order = np.argsort(seconds, kind="stable")  # ids follow the clock
+    seconds, stores, baskets = seconds[order], stores[order], baskets[order]
+
+    members = rng.random(n) >= WALK_IN_SHARE
+    customers = np.where(members, rng.choice(ref["customer_weights"].size, n, p=ref["customer_weights"]), -1)
+    payments = rng.choice(len(PAYMENT_METHODS), n, p=PAYMENT_SHARES)
+    statuses = rng.choice(len(STATUSES), n, p=STATUS_SHARES)
+
+    item_tx = np.repeat(np.arange(n), baskets)
+    products = rng.choice(ref["product_weights"].size, item_tx.size, p=ref["product_weights"])
+    quantities = 1 + rng.poisson(EXTRA_UNITS, item_tx.size)
+    unit_prices = ref["product_prices"][products]
+    item_totals = np.round(quantities * unit_prices, 2)
+    totals = np.round(np.bincount(item_tx, weights=item_totals, minlength=n), 2)
+
+    return {
+        "times": np.datetime64(day, "s") + seconds.astype("timedelta64[s]"),
+        "stores": stores, "customers": customers, "payments": payments, "statuses": statuses,
+        "totals": totals, "taxes": np.round(totals * VAT_RATE / (1 + VAT_RATE), 2),
+        "item_tx": item_tx, "products": products, "quantities": quantities,
+        "unit_prices": unit_prices, "item_totals": item_totals,
+    }
+
+
+def _transaction_code(seed: int, day: date, index: int) -> str:
+    return f"SYN{seed}-{day:%Y%m%d}-{index:06d}"
+
+
+def _insert_day(day: date, rows: Dict[str, np.ndarray], tx_start: int, item_start: int, seed: int) -> None:
+    ref = _reference
+    times = rows["times"].astype(datetime).tolist()
+    key = date_key(day)
+    transactions = [
+        {
+            "id": tx_start + i,
+            "transaction_code": _transaction_code(seed, day, i),
+            "store_id": int(ref["store_ids"][s]),
+            "customer_id": int(ref["customer_ids"][c]) if c >= 0 else None,
+            "transaction_date": times[i],
+            "date_key": key,
+            "total_amount": float(total),
+            "discount_amount": 0.0,
+            "tax_amount": float(tax),
+            "payment_method": PAYMENT_METHODS[p],
+            "status": STATUSES[st],
+        }
+        for i, (s, c, total, tax, p, st) in enumerate(zip(
+            rows["stores"].tolist(), rows["customers"].tolist(), rows["totals"].tolist(),
+            rows["taxes"].tolist(), rows["payments"].tolist(), rows["statuses"].tolist()
+        ))
+    ]
+    items = [
+        {
+            "id": item_start + j,
+            "transaction_id": tx_start + t,
+            "transaction_date": times[t],
+            "product_id": int(ref["product_ids"][p]),
+            "quantity": float(q),
+            "unit_price": float(u),
+            "total_price": float(total),
+            "discount_amount": 0.0,
+        }
+        for j, (t, p, q, u, total) in enumerate(zip(
+            rows["item_tx"].tolist(), rows["products"].tolist(), rows["quantities"].tolist(),
+            rows["unit_prices"].tolist(), rows["item_totals"].tolist()
+        ))
+    ]
+    with _session_factory() as db:
+        bulk_insert(db, Transaction.__table__, transactions)
+        bulk_insert(db, TransactionCode.__table__, [
+            {
+                "transaction_code": t["transaction_code"],
+                "transaction_id": t["id"],
+                "transaction_date": t["transaction_date"],
+            }
+            for t in transactions
+        ])
+        bulk_insert(db, TransactionItem.__table__, items)
+        db.commit()
+
+
+def _write_days(days: List[Tuple[date, Dict[str, np.ndarray]]], out: str, seed: int) -> None:
+    ref = _reference
+    name = os.path.join(out, f"synthetic_{seed}_{days[0][0]:%Y%m%d}")
+    with open(f"{name}_transactions.csv", "w", newline="", encoding="utf-8") as tx_file, \
+            open(f"{name}_items.csv", "w", newline="", encoding="utf-8") as item_file:
+        tx_writer, item_writer = csv.writer(tx_file), csv.writer(item_file)
+        tx_writer.writerow([
+            "transaction_code", "store_code", "customer_code", "transaction_date", "total_amount",
+            "discount_amount", "tax_amount", "payment_method", "status"
+        ])
+        item_writer.writerow([
+            "transaction_code", "sku", "quantity", "unit_price", "total_price", "discount_amount"
+        ])
+        for day, rows in days:
+            codes = [_transaction_code(seed, day, i) for i in range(rows["totals"].size)]
+            for code, time_, s, c, total, tax, p, st in zip(
+                codes, rows["times"].astype(datetime).tolist(), rows["stores"].tolist(),
+                rows["customers"].tolist(), rows["totals"].tolist(), rows["taxes"].tolist(),
+                rows["payments"].tolist(), rows["statuses"].tolist()
+            ):
+                tx_writer.writerow([
+                    code, ref["store_codes"][s], ref["customer_codes"][c] if c >= 0 else "",
+                    time_.isoformat(sep=" "), total, 0, tax, PAYMENT_METHODS[p], STATUSES[st]
+                ])
+            for t, p, q, u, total in zip(
+                rows["item_tx"].tolist(), rows["products"].tolist(), rows["quantities"].tolist(),
+                rows["unit_prices"].tolist(), rows["item_totals"].tolist()
+            ):
+                item_writer.writerow([codes[t], ref["skus"][p], q, u, total, 0])
+
+
+def generate_days(
+    days: List[Tuple[date, int, int]], options: Dict[str, Any], out: Optional[str]
+) -> Dict[str, int]:
+    """Worker entry point: generate (day, first transaction id, first item id) entries."""
+    generated = []
+    stats = {"transactions": 0, "items": 0}
+    for day, tx_start, item_start in days:
+        rows = _generate_day(day, options)
+        stats["transactions"] += rows["totals"].size
+        stats["items"] += rows["item_totals"].size
+        if out:
+            generated.append((day, rows))
+        else:
+            _insert_day(day, rows, tx_start, item_start, options["seed"])
+    if out:
+        _write_days(generated, out, options["seed"])
+    return stats
+
+
+def seed_reference(db, args) -> Dict[str, Any]:
+    """Upsert the SYN- reference data and return the arrays the workers draw from."""
+    rng = np.random.default_rng([args.seed, 0])
+
+    cities = db.execute(
+        select(City.id, Province.region_id).join(Province, City.province_id == Province.id).order_by(City.id)
+    ).all()
+    if not cities:
+        region_id = region.upsert(db, RegionCreate(code="SYN", name="Synthetic Region")).id
+        province_id = province.upsert(
+            db, ProvinceCreate(code="SYN", name="Synthetic Province", region_id=region_id)
+        ).id
+        city_id = city.upsert(db, CityCreate(code="SYN", name="Synthetic City", province_id=province_id)).id
+        cities = [(city_id, region_id)]
+
+    brand_ids = brand.upsert_many(db, [
+        BrandCreate(code=f"SYN-B{i:04d}", name=f"Synthetic Brand {i}") for i in range(args.brands)
+    ])
+    category_ids = category.upsert_many(db, [
+        CategoryCreate(code=f"SYN-CAT{i:04d}", name=f"Synthetic Category {i}") for i in range(args.categories)
+    ])
+    brand_of = rng.integers(0, args.brands, args.products)
+    category_of = rng.integers(0, args.categories, args.products)
+    prices = np.clip(np.round(rng.lognormal(math.log(60), 0.8, args.products) * 4) / 4, 5, 2000)
+    margins = rng.uniform(0.6, 0.85, args.products)
+    skus = [f"SYN-P{i:06d}" for i in range(args.products)]
+    product_ids = product.upsert_many(db, [
+        ProductCreate(
+            sku=sku, name=f"Synthetic Product {i}", brand_id=brand_ids[f"SYN-B{brand_of[i]:04d}"],
+            category_id=category_ids[f"SYN-CAT{category_of[i]:04d}"],
+            cost_price=round(float(prices[i] * margins[i]), 2), selling_price=float(prices[i])
+        ) for i, sku in enumerate(skus)
+    ])
+
+    city_of = rng.integers(0, len(cities), args.stores)
+    store_codes = [f"SYN-S{i:05d}" for i in range(args.stores)]
+    store_ids = store.upsert_many(db, [
+        StoreCreate(
+            code=code, name=f"Synthetic Store {i}",
+            city_id=cities[city_of[i]][0], region_id=cities[city_of[i]][1]
+        ) for i, code in enumerate(store_codes)
+    ])
+    customer_codes = [f"SYN-C{i:07d}" for i in range(args.customers)]
+    customer_ids = customer.upsert_many(db, [
+        CustomerCreate(customer_code=code, name=f"Synthetic Customer {i}")
+        for i, code in enumerate(customer_codes)
+    ])
+
+    store_sizes = rng.lognormal(0, 0.5, args.stores)
+    popularity = 1 / rng.permutation(np.arange(1, args.products + 1)) ** ZIPF_EXPONENT
+    return {
+        "store_ids": np.array([store_ids[code] for code in store_codes], dtype=np.int64),
+        "store_codes": store_codes,
+        "store_weights": store_sizes / store_sizes.mean(),
+        "product_ids": np.array([product_ids[sku] for sku in skus], dtype=np.int64),
+        "skus": skus,
+        "product_prices": prices,
+        "product_weights": _weights(popularity),
+        "customer_ids": np.array([customer_ids[code] for code in customer_codes], dtype=np.int64),
+        "customer_codes": customer_codes,
+        "customer_weights": _weights(rng.lognormal(0, 1, args.customers)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic retail transactions")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed; same arguments, same data")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day (default: --days before today)")
+    parser.add_argument("--days", type=int, default=730, help="Days of history")
+    parser.add_argument("--stores", type=int, default=200)
+    parser.add_argument("--customers", type=int, default=200000)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--brands", type=int, default=60)
+    parser.add_argument("--categories", type=int, default=25)
+    parser.add_argument(
+        "--daily-transactions", type=float, default=28, help="Mean transactions per store on an ordinary day"
+    )
+    parser.add_argument("--avg-basket", type=float, default=2.6, help="Mean line items per transaction")
+    parser.add_argument("--growth", type=float, default=0.08, help="Yearly volume growth")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel worker processes")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Days per worker task (and CSV file pair)")
+    parser.add_argument("--out", help="Write CSV pairs for import_pos_history.py here instead of inserting")
+    parser.add_argument("--skip-rollups", action="store_true", help="Do not rebuild sales rollups afterwards")
+    args = parser.parse_args()
+
+    if args.avg_basket < 1:
+        print("❌ --avg-basket must be at least 1")
+        sys.exit(1)
+    start = args.start or date.today() - timedelta(days=args.days)
+    end = start + timedelta(days=args.days - 1)
+    engine = loader_engine(settings.DATABASE_URL)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with Session() as db:
+        if not args.out and db.query(TransactionCode.transaction_id).filter(
+            TransactionCode.transaction_code.like(f"SYN{args.seed}-%")
+        ).first():
+            print(f"❌ Synthetic transactions for seed {args.seed} are already loaded; pick another --seed")
+            sys.exit(1)
+        print(f"Seeding reference data ({args.stores} stores, {args.products} products, {args.customers} customers)...")
+        reference = seed_reference(db, args)
+        if not args.out:
+            calendar.ensure_range(db, start, end)
+        tx_start = (db.query(func.max(Transaction.id)).scalar() or 0) + 1
+        item_start = (db.query(func.max(TransactionItem.id)).scalar() or 0) + 1
+
+    # Plan each day's id ranges from the first draws of its stream
+    _reference.update(reference)
+    options = {
+        "seed": args.seed, "start": start, "daily_transactions": args.daily_transactions,
+        "avg_basket": args.avg_basket, "growth": args.growth,
+    }
+    plan: List[Tuple[date, int, int]] = []
+    for offset in range(args.days):
+        day = start + timedelta(days=offset)
+        _, baskets = _day_shape(_day_rng(args.seed, day), day, options)
+        plan.append((day, tx_start, item_start))
+        tx_start += baskets.size
+        item_start += int(baskets.sum())
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    print(f"📥 Generating {start} to {end} with {args.workers} worker(s)...")
+    started = datetime.now()
+    totals = {"transactions": 0, "items": 0}
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker,
+        initargs=(None if args.out else settings.DATABASE_URL, reference)
+    ) as pool:
+        futures = {
+            pool.submit(generate_days, plan[offset:offset + args.chunk_days], options, args.out): plan[offset][0]
+            for offset in range(0, len(plan), args.chunk_days)
+        }
+        try:
+            for future in as_completed(futures):
+                stats = future.result()
+                totals["transactions"] += stats["transactions"]
+                totals["items"] += stats["items"]
+                print(
+                    f"  ✅ {futures[future]} (+{args.chunk_days - 1}d): "
+                    f"{stats['transactions']:,} transactions, {stats['items']:,} items"
+                )
+        except Exception as e:
+            for pending in futures:
+                pending.cancel()
+            print(f"❌ Generation failed: {e}")
+            sys.exit(1)
+
+    elapsed = max((datetime.now() - started).total_seconds(), 1e-6)
+    rows = totals["transactions"] + totals["items"]
+    print(
+        f"📊 Generated {totals['transactions']:,} transactions and {totals['items']:,} items "
+        f"in {elapsed:,.0f}s ({rows / elapsed * 60:,.0f} rows/min)"
+    )
+
+    if args.out:
+        print(f"ℹ️  Load with: python import_pos_history.py {os.path.join(args.out, '*_transactions.csv')}")
+        return
+    if engine.dialect.name == "postgresql":
+        # Explicit ids do not advance the serial sequences
+        with engine.begin() as conn:
+            for table in ("transactions", "transaction_items"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                ))
+    with Session() as db:
+        published = publish_unstamped(db)
+    print(f"✅ Published {published:,} transactions to the analytics engines")
+    if args.skip_rollups:
+        print(f"ℹ️  Rebuild rollups with: python rebuild_sales_rollup.py --start {start} --end {end}")
+    else:
+        print(f"Rebuilding sales rollups for {start} to {end}...")
+        with Session() as db:
+            sales_rollup.rebuild(db, start_day=start, end_day=end)
+        print("✅ Sales rollups rebuilt")
+
+
+if __name__ == "__main__":
+    main()
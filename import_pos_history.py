@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Import historical POS transactions and line items from CSV files
+
+Each ``<name>_transactions.csv`` is loaded together with its sibling
+``<name>_items.csv`` (if present) by one worker process, so files load in
+parallel. Rows are loaded in chunks that commit together with the file's
+checkpoint, and an interrupted import picks up where it stopped. MySQL loads
+through LOAD DATA LOCAL INFILE; other databases use executemany. Loaded rows
+are published to the columnar engine (stamped with a ``change_seq``) once
+every file is in.
+
+Transaction columns: transaction_code, store_code, customer_code,
+transaction_date, total_amount, discount_amount, tax_amount, payment_method,
+status
+
+Item columns: transaction_code, sku, quantity, unit_price, total_price,
+discount_amount
+"""
+import argparse
+import csv
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.calendar import business_date, calendar_row, date_key
+from app.core.config import settings
+from app.db.bulk import bulk_insert, loader_engine
+from app.db.upsert import upsert
+from app.db.versions import publish_unstamped
+from app.models.retail import (
+    Store, Product, Customer, Transaction, TransactionCode, TransactionItem, CalendarDay, ImportCheckpoint
+)
+from app.crud.retail import sales_rollup
+
+TRANSACTIONS_SUFFIX = "_transactions.csv"
+ITEMS_SUFFIX = "_items.csv"
+LOOKUP_BATCH = 1000
+
+# Per worker process: session factory and code -> id maps
+_session_factory: Optional[sessionmaker] = None
+_store_ids: Dict[str, int] = {}
+_customer_ids: Dict[str, int] = {}
+_product_ids: Dict[str, int] = {}
+
+
+def _init_worker(database_url: str):
+    """Open the worker's own engine and load the reference code maps once."""
+    global _session_factory
+    _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=loader_engine(database_url))
+    with _session_factory() as db:
+        _store_ids.update(db.execute(select(Store.code, Store.id)).all())
+        _customer_ids.update(db.execute(select(Customer.customer_code, Customer.id)).all())
+        _product_ids.update(db.execute(select(Product.sku, Product.id)).all())
+
+
+def _transactions_by_code(db: Session, codes: Iterable[str]) -> Dict[str, Tuple[int, datetime]]:
+    """Map existing transaction codes to (id, transaction_date), archived ones included."""
+    codes = list(codes)
+    found: Dict[str, Tuple[int, datetime]] = {}
+    for offset in range(0, len(codes), LOOKUP_BATCH):
+        found.update(
+            (code, (id_, transaction_date)) for code, id_, transaction_date in db.execute(
+                select(
+                    TransactionCode.transaction_code, TransactionCode.transaction_id,
+                    TransactionCode.transaction_date
+                ).where(TransactionCode.transaction_code.in_(codes[offset:offset + LOOKUP_BATCH]))
+            )
+        )
+    return found
+
+
+def _claim_codes(db: Session, codes: List[str]) -> None:
+    """Record the codes of just-loaded, still unpublished transactions in transaction_codes.
+
+    A code loaded concurrently by another worker shows up twice and fails the
+    chunk on the primary key; rerunning then rejects it as taken.
+    """
+    for offset in range(0, len(codes), LOOKUP_BATCH):
+        rows = db.execute(
+            select(Transaction.transaction_code, Transaction.id, Transaction.transaction_date).where(and_(
+                Transaction.change_seq.is_(None),
+                Transaction.transaction_code.in_(codes[offset:offset + LOOKUP_BATCH])
+            ))
+        ).all()
+        db.execute(insert(TransactionCode), [
+            {"transaction_code": code, "transaction_id": id_, "transaction_date": transaction_date}
+            for code, id_, transaction_date in rows
+        ])
+
+
+def _load_transactions(db: Session, rows: List[Dict[str, str]]) -> Tuple[int, int, List[date]]:
+    """Load one chunk of transaction rows; return (loaded, rejected, business days)."""
+    taken = set(_transactions_by_code(db, [row.get("transaction_code", "") for row in rows]))
+    records: List[Dict[str, Any]] = []
+    days: Dict[int, date] = {}
+    rejected = 0
+    for row in rows:
+        code = row.get("transaction_code")
+        store_id = _store_ids.get(row.get("store_code"))
+        customer_code = row.get("customer_code") or None
+        customer_id = _customer_ids.get(customer_code) if customer_code else None
+        if not code or code in taken or store_id is None or (customer_code and customer_id is None):
+            rejected += 1
+            continue
+        try:
+            transaction_date = datetime.fromisoformat(row["transaction_date"])
+            total_amount = float(row["total_amount"])
+            discount_amount = float(row.get("discount_amount") or 0)
+            tax_amount = float(row.get("tax_amount") or 0)
+        except (KeyError, ValueError):
+            rejected += 1
+            continue
+
+        taken.add(code)
+        day = business_date(transaction_date)
+        days[date_key(day)] = day
+        records.append({
+            "transaction_code": code,
+            "store_id": store_id,
+            "customer_id": customer_id,
+            "transaction_date": transaction_date,
+            "date_key": date_key(day),
+            "total_amount": total_amount,
+            "discount_amount": discount_amount,
+            "tax_amount": tax_amount,
+            "payment_method": row.get("payment_method") or None,
+            "status": row.get("status") or "completed",
+        })
+
+    upsert(db, CalendarDay, [calendar_row(day) for day in days.values()], index_elements=("date_key",))
+    bulk_insert(db, Transaction.__table__, records)
+    if records:
+        _claim_codes(db, [record["transaction_code"] for record in records])
+    return len(records), rejected, list(days.values())
+
+
+def _load_items(db: Session, rows: List[Dict[str, str]]) -> Tuple[int, int, List[date]]:
+    """Load one chunk of item rows; return (loaded, rejected, no days)."""
+    transactions = _transactions_by_code(db, {row.get("transaction_code", "") for row in rows})
+    records: List[Dict[str, Any]] = []
+    rejected = 0
+    for row in rows:
+        transaction = transactions.get(row.get("transaction_code"))
+        product_id = _product_ids.get(row.get("sku"))
+        if transaction is None or product_id is None:
+            rejected += 1
+            continue
+        try:
+            quantity = float(row["quantity"])
+            unit_price = float(row["unit_price"])
+            total_price = float(row.get("total_price") or quantity * unit_price)
+            discount_amount = float(row.get("discount_amount") or 0)
+        except (KeyError, ValueError):
+            rejected += 1
+            continue
+        records.append({
+            "transaction_id": transaction[0],
+            "transaction_date": transaction[1],
+            "product_id": product_id,
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "total_price": total_price,
+            "discount_amount": discount_amount,
+        })
+
+    bulk_insert(db, TransactionItem.__table__, records)
+    return len(records), rejected, []
+
+
+def _import_csv(
+    db: Session,
+    path: str,
+    chunk_rows: int,
+    load_chunk: Callable[[Session, List[Dict[str, str]]], Tuple[int, int, List[date]]],
+) -> Dict[str, Any]:
+    """Load ``path`` chunk by chunk, resuming after the rows already checkpointed."""
+    source = os.path.abspath(path)
+    source_key = hashlib.sha1(source.encode()).hexdigest()
+    checkpoint = db.get(ImportCheckpoint, source_key)
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint(
+            source_key=source_key, source=source[-500:], rows_read=0, completed=False
+        )
+        db.add(checkpoint)
+        db.commit()
+
+    stats = {"loaded": 0, "rejected": 0, "resumed_at": checkpoint.rows_read}
+    if not checkpoint.completed:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for _ in islice(reader, checkpoint.rows_read):
+                pass
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    break
+                loaded, rejected, days = load_chunk(db, rows)
+                checkpoint.rows_read += len(rows)
+                if days:
+                    first, last = min(days), max(days)
+                    checkpoint.first_day = min(first, checkpoint.first_day or first)
+                    checkpoint.last_day = max(last, checkpoint.last_day or last)
+                db.commit()  # the chunk and its checkpoint land together
+                stats["loaded"] += loaded
+                stats["rejected"] += rejected
+        checkpoint.completed = True
+        db.commit()
+
+    # Days loaded by earlier, interrupted runs still need their rollups rebuilt
+    stats["days"] = [d for d in (checkpoint.first_day, checkpoint.last_day) if d]
+    return stats
+
+
+def import_file_pair(transactions_path: str, items_path: Optional[str], chunk_rows: int) -> Dict[str, Any]:
+    """Worker entry point: load a transactions file, then its items file."""
+    with _session_factory() as db:
+        transactions = _import_csv(db, transactions_path, chunk_rows, _load_transactions)
+        items = _import_csv(db, items_path, chunk_rows, _load_items) if items_path else None
+    return {"transactions": transactions, "items": items}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import historical POS transactions from CSV files")
+    parser.add_argument("files", nargs="+", help=f"Transaction files named <name>{TRANSACTIONS_SUFFIX}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel worker processes")
+    parser.add_argument("--chunk-rows", type=int, default=50000, help="CSV rows per load and checkpoint")
+    parser.add_argument("--skip-rollups", action="store_true", help="Do not rebuild sales rollups afterwards")
+    args = parser.parse_args()
+
+    pairs = []
+    for path in args.files:
+        if not path.endswith(TRANSACTIONS_SUFFIX):
+            print(f"❌ {path}: expected a file named <name>{TRANSACTIONS_SUFFIX}")
+            sys.exit(1)
+        items_path = path[:-len(TRANSACTIONS_SUFFIX)] + ITEMS_SUFFIX
+        pairs.append((path, items_path if os.path.exists(items_path) else None))
+
+    engine = create_engine(settings.DATABASE_URL)
+    ImportCheckpoint.__table__.create(bind=engine, checkfirst=True)
+
+    print(f"📥 Importing {len(pairs)} file(s) with {args.workers} worker(s)...")
+    started = datetime.now()
+    days: List[date] = []
+    totals = {"transactions": 0, "items": 0, "rejected": 0}
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(settings.DATABASE_URL,)
+    ) as pool:
+        futures = {
+            pool.submit(import_file_pair, transactions_path, items_path, args.chunk_rows): transactions_path
+            for transactions_path, items_path in pairs
+        }
+        for future in as_completed(futures):
+            name = os.path.basename(futures[future])
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e} (rerun to resume)")
+                continue
+
+            transactions, items = result["transactions"], result["items"] or {"loaded": 0, "rejected": 0}
+            rejected = transactions["rejected"] + items["rejected"]
+            totals["transactions"] += transactions["loaded"]
+            totals["items"] += items["loaded"]
+            totals["rejected"] += rejected
+            days.extend(transactions["days"])
+            resumed = f", resumed at row {transactions['resumed_at']}" if transactions["resumed_at"] else ""
+            print(
+                f"✅ {name}: {transactions['loaded']} transactions, {items['loaded']} items, "
+                f"{rejected} rejected{resumed}"
+            )
+
+    elapsed = max((datetime.now() - started).total_seconds(), 1e-6)
+    rows = totals["transactions"] + totals["items"]
+    print(
+        f"📊 Loaded {totals['transactions']} transactions and {totals['items']} items "
+        f"({rows / elapsed * 60:,.0f} rows/min), rejected {totals['rejected']}"
+    )
+
+    if failed:
+        print("ℹ️  Loaded rows stay unpublished to the analytics engines until a rerun completes")
+    else:
+        with sessionmaker(bind=engine)() as db:
+            published = publish_unstamped(db)
+        print(f"✅ Published {published} transactions to the analytics engines")
+
+    if days and args.skip_rollups:
+        print(f"ℹ️  Rebuild rollups with: python rebuild_sales_rollup.py --start {min(days)} --end {max(days)}")
+    elif days:
+        print(f"Rebuilding sales rollups for {min(days)} to {max(days)}...")
+        with sessionmaker(bind=engine)() as db:
+            sales_rollup.rebuild(db, start_day=min(days), end_day=max(days))
+        print("✅ Sales rollups rebuilt")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Manage the monthly partitions of the transaction tables (MySQL)
+
+  status   list partitions and their estimated row counts
+  init     partition the tables by month (rebuilds them; run in a maintenance window)
+  extend   create partitions for the coming months
+  drop     drop the emptied partitions of months archived before --before
+  archive  archive the months before --before to files, then drop their partitions
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.core.config import settings
+from app.crud.archive import transaction_archive
+from app.db.base import SessionLocal, engine
+from app.db.partitions import (
+    PARTITIONED_TABLES, add_months, drop_partitions_before, ensure_future_partitions, list_partitions,
+    month_start, partition_tables, supports_partitions
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage monthly transaction partitions")
+    parser.add_argument("command", choices=["status", "init", "extend", "drop", "archive"])
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD,
+        help="Future months to create partitions for (init, extend)"
+    )
+    parser.add_argument(
+        "--before", type=date.fromisoformat,
+        help="Drop or archive the months entirely before this date (YYYY-MM-DD)"
+    )
+    parser.add_argument("--dir", default=settings.ARCHIVE_DIR, help="Directory for the archive files (archive)")
+    args = parser.parse_args()
+
+    if args.command in ("drop", "archive") and not args.before:
+        print(f"❌ {args.command} needs --before")
+        sys.exit(1)
+    last_month = add_months(month_start(date.today()), args.months_ahead)
+
+    try:
+        with engine.begin() as conn:
+            if not supports_partitions(conn):
+                print(f"ℹ️  Partitioning is only supported on MySQL, not {conn.dialect.name}")
+                sys.exit(1)
+
+            if args.command == "status":
+                for table in PARTITIONED_TABLES:
+                    partitions = list_partitions(conn, table)
+                    print(f"\n📊 {table}: {len(partitions) or 'not'} partition(s)")
+                    for name, month, rows in partitions:
+                        print(f"  {name:8} {month or 'future':10} ~{rows:,} rows")
+            elif args.command == "init":
+                print(f"Partitioning {', '.join(PARTITIONED_TABLES)} through {last_month:%Y-%m}...")
+                partitioned = partition_tables(conn, last_month)
+                print(f"✅ Partitioned: {', '.join(partitioned) or 'already partitioned'}")
+            elif args.command == "extend":
+                created = ensure_future_partitions(conn, last_month)
+                print(f"✅ Created {len(created)} partition(s) through {last_month:%Y-%m}")
+            else:
+                if args.command == "archive":
+                    # Through the cold archive, so every month is recorded in archive_segments
+                    with SessionLocal() as db:
+                        for s in transaction_archive.archive_before(db, args.before, args.dir):
+                            print(f"  📥 {s.month:%Y-%m}: {s.transaction_count:,} transactions -> {s.path}")
+                dropped = drop_partitions_before(conn, args.before)
+                print(f"✅ Dropped {len(dropped)} partition(s): {', '.join(dropped) or 'none'}")
+    except Exception as e:
+        print(f"❌ Error managing partitions: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
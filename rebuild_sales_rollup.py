@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily sales rollup tables from raw retail transactions
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.db.base import SessionLocal
+from app.crud.retail import sales_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily sales rollups")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    
+    scope = f"{args.start or 'beginning'} to {args.end or 'today'}"
+    print(f"Rebuilding daily sales rollups from {scope}...")
+    db = SessionLocal()
+    try:
+        sales_rollup.rebuild(db, start_day=args.start, end_day=args.end)
+        print("✅ Sales rollups rebuilt successfully!")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding sales rollups: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Refresh the precomputed customer RFM segments
+"""
+import argparse
+import sys
+
+from app.db.base import SessionLocal
+from app.crud.rfm import customer_segment
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh customer RFM segments")
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Re-aggregate every customer instead of only those with new purchases"
+    )
+    args = parser.parse_args()
+    
+    print(f"Refreshing customer RFM segments ({'full' if args.full else 'incremental'})...")
+    db = SessionLocal()
+    try:
+        refreshed = customer_segment.refresh(db, full=args.full)
+        print(f"✅ Re-aggregated {refreshed} customers and rescored all segments")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error refreshing customer segments: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Settings and the engine are read at import time, so point them at a
+# scratch SQLite database before anything from ``app`` is imported
+_DB_DIR = tempfile.mkdtemp(prefix="gagambi-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["ENVIRONMENT"] = "test"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import retail as crud
+from app.crud.archive import transaction_archive
+from app.crud.columnar import columnar_analytics
+from app.db.base import Base, SessionLocal, engine, get_db
+from app.main import app
+from app.models import analytics
+from app.models import retail as models
+from app.schemas.retail import TransactionCreate, TransactionItemCreate
+
+API = "/api/v1"
+# Seeded transactions fall in the 60 days from here
+BASE_DATE = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    """A session on an empty, freshly created schema."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # Per-process state that would otherwise outlive the tables it mirrors
+    crud.calendar._known_keys.clear()
+    crud.analytics.clear()
+    crud.reference_payloads.clear()
+    session = SessionLocal()
+    columnar_analytics.reload(session)
+    transaction_archive.archived_until(session, cached=False)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def retail(db):
+    """Reference data: one region, three stores, five products, ten customers."""
+    region = models.Region(code="NCR", name="National Capital Region")
+    db.add(region)
+    db.flush()
+    province = models.Province(code="MNL", name="Metro Manila", region_id=region.id)
+    db.add(province)
+    db.flush()
+    city = models.City(code="MKT", name="Makati", province_id=province.id)
+    brand = models.Brand(code="BR1", name="Brand One")
+    category = models.Category(code="CAT1", name="Category One")
+    db.add_all([city, brand, category])
+    db.flush()
+    stores = [
+        models.Store(code=f"ST{i}", name=f"Store {i}", region_id=region.id, city_id=city.id)
+        for i in range(3)
+    ]
+    products = [
+        models.Product(
+            sku=f"SKU{i}", name=f"Product {i}", brand_id=brand.id, category_id=category.id,
+            selling_price=10.0 + i
+        )
+        for i in range(5)
+    ]
+    customers = [models.Customer(customer_code=f"CUST{i}", name=f"Customer {i}") for i in range(10)]
+    db.add_all(stores + products + customers)
+    db.commit()
+    return {"stores": stores, "products": products, "customers": customers}
+
+
+def make_transactions(retail, count, seed=0, start=0):
+    """``count`` TransactionCreate records at distinct times, none on a midnight."""
+    rng = random.Random(seed)
+    transactions = []
+    for i in range(start, start + count):
+        items = []
+        for product in rng.sample(retail["products"], rng.randint(1, 3)):
+            quantity = rng.randint(1, 4)
+            items.append(TransactionItemCreate(
+                product_id=product.id, quantity=quantity, unit_price=product.selling_price,
+                total_price=quantity * product.selling_price
+            ))
+        customer = rng.choice(retail["customers"]) if rng.random() > 0.2 else None
+        transactions.append(TransactionCreate(
+            transaction_code=f"TX{i:06d}",
+            store_id=rng.choice(retail["stores"]).id,
+            customer_id=customer.id if customer else None,
+            transaction_date=BASE_DATE + timedelta(hours=rng.randrange(60 * 24), minutes=30, seconds=i),
+            total_amount=sum(item.total_price for item in items),
+            items=items
+        ))
+    return transactions
+
+
+@pytest.fixture
+def transactions(db, retail):
+    """300 committed transactions over the reference data."""
+    result = crud.transaction.create_bulk(db, make_transactions(retail, 300), chunk_size=100)
+    assert result.failed == 0
+    return result
+
+
+@pytest.fixture
+def analytics_db(tmp_path):
+    """The Scout analytics transactions, on their own database."""
+    analytics_engine = create_engine(f"sqlite:///{tmp_path}/analytics.db")
+    analytics.Base.metadata.create_all(analytics_engine)
+    Session = sessionmaker(bind=analytics_engine)
+    session = Session()
+    session.add_all([
+        analytics.Transaction(
+            order_id=f"ORD{i}", order_date=date(2024, 1, 1) + timedelta(days=i % 90),
+            customer_name=f"Customer {i % 7}", category="Furniture" if i % 3 else "Technology",
+            sales=10.0 + i, profit=1.5 * (i % 5), quantity=i % 4 + 1, region="West" if i % 2 else "East",
+            city="Makati"
+        )
+        for i in range(250)
+    ])
+    session.commit()
+
+    def get_analytics_db():
+        request_session = Session()
+        try:
+            yield request_session
+        finally:
+            request_session.close()
+
+    app.dependency_overrides[get_db] = get_analytics_db
+    try:
+        yield session
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
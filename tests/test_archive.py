@@ -0,0 +1,65 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from app.crud import retail as crud
+from app.crud.archive import ArchivedRangeError, load_segment, transaction_archive
+from app.models import retail as models
+from tests.conftest import API
+
+JANUARY = (datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+
+@pytest.fixture
+def archived(db, transactions, tmp_path):
+    """The January transactions moved to an archive file."""
+    before = {
+        "transactions": db.query(models.Transaction.id, models.Transaction.total_amount)
+        .filter(models.Transaction.transaction_date < JANUARY[1]).order_by(models.Transaction.id).all(),
+        "items": db.query(models.TransactionItem.id)
+        .filter(models.TransactionItem.transaction_date < JANUARY[1]).order_by(models.TransactionItem.id).all(),
+        "regions": crud.analytics.get_sales_by_region(db, *JANUARY),
+    }
+    segments = transaction_archive.archive_before(db, date(2024, 2, 1), str(tmp_path))
+    assert [segment.month for segment in segments] == [date(2024, 1, 1)]
+    return segments[0], before
+
+
+def test_archive_file_holds_the_rows_it_replaced(db, archived):
+    segment, before = archived
+
+    columns = load_segment(segment.path)
+
+    assert columns["tx_id"].tolist() == [row.id for row in before["transactions"]]
+    assert np.allclose(columns["tx_amount"], [row.total_amount for row in before["transactions"]])
+    assert columns["item_id"].tolist() == [row.id for row in before["items"]]
+    assert (segment.transaction_count, segment.item_count) == (len(before["transactions"]), len(before["items"]))
+    assert db.query(models.Transaction).filter(models.Transaction.transaction_date < JANUARY[1]).count() == 0
+    assert db.query(models.Transaction).count() == 300 - segment.transaction_count
+
+
+def test_day_aligned_windows_still_cover_archived_months(db, archived):
+    _, before = archived
+
+    assert crud.analytics.get_sales_by_region(db, *JANUARY) == before["regions"]
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/retail/sales/by-region", {"start_date": "2024-01-10T12:00:00", "end_date": "2024-02-10T00:00:00"}),
+    ("/retail/sales/by-region", {"start_date": "2024-01-10T00:00:00", "end_date": "2024-02-10T00:00:00", "engine": "columnar"}),
+    ("/retail/transactions/summary", {"start_date": "2024-01-10T00:00:00", "end_date": "2024-02-10T00:00:00", "exact": True}),
+])
+def test_raw_row_windows_over_archived_months_are_bad_requests(client, db, archived, path, params):
+    response = client.get(f"{API}{path}", params=params)
+
+    assert response.status_code == 400
+    assert "archived" in response.json()["detail"]
+
+
+def test_raw_row_windows_after_the_archive_are_answered(client, db, archived):
+    params = {"start_date": "2024-02-10T12:00:00", "end_date": "2024-02-20T00:00:00", "exact": True}
+
+    assert client.get(f"{API}/retail/transactions/summary", params=params).status_code == 200
+    with pytest.raises(ArchivedRangeError):
+        transaction_archive.check_hot(db, datetime(2024, 1, 31, 23, 0))
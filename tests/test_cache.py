@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+from app.crud import retail as crud
+from tests.conftest import make_transactions
+
+WINDOW = (datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A frozen monotonic clock for the cache and the version poll, moved with ``clock[0] +=``."""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("app.crud.retail.clock.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache():
+    return crud.CachedAnalytics(crud.CRUDAnalytics(), maxsize=16, ttl=300, poll_interval=5)
+
+
+def _add_transaction(db, retail):
+    obj_in = make_transactions(retail, 1, seed=3, start=1000)[0]
+    crud.transaction.create(db, obj_in=obj_in.model_copy(update={"transaction_date": datetime(2024, 1, 15, 12)}))
+
+
+def test_repeated_calls_hit_the_cache(db, transactions, cache, clock):
+    first = cache.get_transaction_summary(db, *WINDOW)
+
+    assert cache.get_transaction_summary(db, *WINDOW) is first
+    assert cache.get_transaction_summary(db, *WINDOW, exact=True) is not first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_writes_from_other_workers_show_after_the_poll_interval(db, retail, transactions, cache, clock):
+    before = cache.get_transaction_summary(db, *WINDOW)
+
+    _add_transaction(db, retail)
+
+    assert cache.get_transaction_summary(db, *WINDOW) is before
+    clock[0] += 5
+    after = cache.get_transaction_summary(db, *WINDOW)
+    assert after.total_transactions == before.total_transactions + 1
+    assert cache.stats()["data_version"] == cache.data_version(db)[0]
+
+
+def test_bump_version_rereads_at_once(db, retail, transactions, cache, clock):
+    before = cache.get_transaction_summary(db, *WINDOW)
+    _add_transaction(db, retail)
+
+    cache.bump_version()
+
+    assert cache.get_transaction_summary(db, *WINDOW).total_transactions == before.total_transactions + 1
+
+
+def test_entries_expire_after_the_ttl(db, transactions, cache, clock):
+    first = cache.get_transaction_summary(db, *WINDOW)
+
+    clock[0] += 299
+    assert cache.get_transaction_summary(db, *WINDOW) is first
+    clock[0] += 2
+    assert cache.get_transaction_summary(db, *WINDOW) is not first
@@ -0,0 +1,51 @@
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.calendar import date_key
+from app.crud import retail as crud
+from app.crud.columnar import _day_keys, _read_columns, columnar_analytics
+from app.models import retail as models
+from app.schemas.retail import CategoryCreate, ProductCreate
+from tests.conftest import API
+
+# Not day-aligned, so the SQL engine joins today's product rows as the
+# columnar one does, rather than the categories the rollups recorded
+WINDOW = (datetime(2024, 1, 1, 0, 0, 1), datetime(2024, 3, 1))
+
+
+def test_day_keys_match_the_calendar():
+    days = [date(2024, 1, 1), date(2024, 2, 29), date(2023, 12, 31), date(1999, 9, 9)]
+    times = np.array([datetime(d.year, d.month, d.day, 23, 59, 59) for d in days], dtype='datetime64[us]')
+
+    assert _day_keys(times).tolist() == [date_key(d) for d in days]
+
+
+def test_columns_read_past_an_undercounted_size(db, transactions):
+    statement = select(models.Transaction.id, models.Transaction.total_amount).order_by(models.Transaction.id)
+
+    columns = _read_columns(db, statement, 7, {"id": np.int64, "amount": np.float64})
+
+    rows = db.execute(statement).all()
+    assert columns["id"].tolist() == [r.id for r in rows]
+    assert columns["amount"].tolist() == [r.total_amount for r in rows]
+
+
+def test_columnar_engine_sees_recategorized_products(client, db, retail, transactions):
+    assert columnar_analytics.get_sales_by_category(db, *WINDOW)
+    product = retail["products"][0]
+    moved_to = crud.category.upsert(db, CategoryCreate(code="CAT2", name="Category Two"))
+    client.post(f"{API}/retail/products", json=ProductCreate(
+        sku=product.sku, name=product.name, brand_id=product.brand_id, category_id=moved_to.id,
+        selling_price=product.selling_price
+    ).model_dump(mode="json"))
+
+    from_columns = columnar_analytics.get_sales_by_category(db, *WINDOW)
+    from_sql = crud.analytics.get_sales_by_category(db, *WINDOW)
+
+    assert {c.category_code for c in from_columns} == {"CAT1", "CAT2"}
+    key = lambda c: c.category_code
+    assert [c.model_dump() for c in sorted(from_columns, key=key)] == [
+        c.model_dump() for c in sorted(from_sql, key=key)
+    ]
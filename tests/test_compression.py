@@ -0,0 +1,59 @@
+import pytest
+
+from app.core import compression
+from tests.conftest import API
+
+LISTING = (f"{API}/retail/transactions", {"days": 100000, "limit": 300})
+
+
+def test_large_responses_are_compressed_in_the_preferred_encoding(client, transactions):
+    path, params = LISTING
+    plain = client.get(path, params=params, headers={"Accept-Encoding": "identity"})
+    gzipped = client.get(path, params=params, headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+    assert gzipped.json() == plain.json()
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+def test_brotli_wins_a_tie_and_follows_q_values(client, transactions):
+    path, params = LISTING
+
+    tie = client.get(path, params=params, headers={"Accept-Encoding": "gzip, br"})
+    weighted = client.get(path, params=params, headers={"Accept-Encoding": "br;q=0.5, gzip"})
+
+    assert tie.headers["content-encoding"] == "br"
+    assert weighted.headers["content-encoding"] == "gzip"
+    assert tie.json() == weighted.json()
+
+
+def test_small_responses_are_sent_as_is(client, db):
+    response = client.get(f"{API}/retail/analytics/cache-stats", headers={"Accept-Encoding": "gzip"})
+
+    assert len(response.content) < 1024
+    assert "content-encoding" not in response.headers
+
+
+def test_reference_lists_are_served_precompressed(client, db, retail):
+    first = client.get(f"{API}/retail/brands", headers={"Accept-Encoding": "gzip"})
+    second = client.get(f"{API}/retail/brands", headers={"Accept-Encoding": "identity"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in second.headers
+    assert first.json() == second.json() == [
+        {**first.json()[0], "code": "BR1", "name": "Brand One"}
+    ]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip;q=0.5, br", "br" if compression.brotli else "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br" if compression.brotli else "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    (None, None),
+])
+def test_preferred_encoding(header, expected):
+    assert compression.preferred_encoding(header) == expected
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.crud import retail as crud
+from app.models import retail as models
+from tests.conftest import make_transactions
+
+# Day-aligned (rollup-backed breakdowns) and not (raw rows)
+WINDOWS = [
+    (datetime(2024, 1, 5), datetime(2024, 2, 21)),
+    (datetime(2024, 1, 5, 0, 0, 1), datetime(2024, 2, 20, 23, 59, 59)),
+]
+BREAKDOWNS = [
+    ("sales_by_region", "get_sales_by_region"),
+    ("sales_by_brand", "get_sales_by_brand"),
+    ("sales_by_category", "get_sales_by_category"),
+]
+
+
+@pytest.fixture
+def spread(db, retail):
+    """The transactions fixture's sales, over two regions, brands and categories."""
+    region = models.Region(code="VIS", name="Visayas")
+    brand = models.Brand(code="BR2", name="Brand Two")
+    category = models.Category(code="CAT2", name="Category Two")
+    db.add_all([region, brand, category])
+    db.flush()
+    retail["stores"][2].region_id = region.id
+    for product in retail["products"][3:]:
+        product.brand_id, product.category_id = brand.id, category.id
+    db.commit()
+    result = crud.transaction.create_bulk(db, make_transactions(retail, 300), chunk_size=100)
+    assert result.failed == 0
+
+
+def _plain(items):
+    return sorted(
+        ({k: round(v, 6) if isinstance(v, float) else v for k, v in item.model_dump().items()} for item in items),
+        key=repr
+    )
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_dashboard_totals_match_its_breakdowns(db, spread, window):
+    dashboard = crud.analytics.get_dashboard(db, *window, limit=10)
+    summary = dashboard.summary
+
+    assert len(dashboard.sales_by_region) == len(dashboard.sales_by_brand) == len(dashboard.sales_by_category) == 2
+    for name, _ in BREAKDOWNS:
+        assert sum(b.total_sales for b in getattr(dashboard, name)) == pytest.approx(summary.total_sales)
+    assert sum(p.total_sales for p in dashboard.top_selling_products) == pytest.approx(summary.total_sales)
+    assert sum(r.total_transactions for r in dashboard.sales_by_region) == summary.total_transactions
+    assert sum(r.total_stores for r in dashboard.sales_by_region) == 3
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_dashboard_matches_the_separate_queries(db, spread, window):
+    dashboard = crud.analytics.get_dashboard(db, *window, limit=3)
+
+    for name, method in BREAKDOWNS:
+        assert _plain(getattr(dashboard, name)) == _plain(getattr(crud.analytics, method)(db, *window))
+    assert _plain(dashboard.top_selling_products) == _plain(crud.analytics.get_top_selling_products(db, *window, 3))
+    assert _plain([dashboard.summary]) == _plain([crud.analytics.get_transaction_summary(db, *window, exact=True)])
+
+
+def test_mysql_branches_group_with_rollup():
+    analytics = crud.CRUDAnalytics()
+    base = analytics._dashboard_base(*WINDOWS[0])
+
+    sql = str(analytics._dashboard_branch(base, "brand", base.c.brand_id, base.c.product_id, rollup=True).compile(
+        dialect=mysql.dialect()
+    ))
+
+    assert sql.rstrip().endswith("GROUP BY dashboard_base.brand_id, dashboard_base.product_id WITH ROLLUP")
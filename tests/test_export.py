@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+import warnings
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SADeprecationWarning
+from sqlalchemy.orm import Session
+
+from app.crud.export import CSV_HEADER, transaction_export
+from app.db.base import Base
+from app.models import retail as models
+from tests.conftest import API
+
+
+def test_ndjson_has_one_line_per_transaction(client, db, transactions):
+    response = client.get(f"{API}/retail/transactions/export", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == db.query(models.Transaction).count()
+    assert sum(len(r["items"]) for r in records) == db.query(models.TransactionItem).count()
+    assert len({r["transaction_code"] for r in records}) == len(records)
+
+
+def test_csv_has_one_line_per_item(client, db, transactions):
+    response = client.get(f"{API}/retail/transactions/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == CSV_HEADER
+    assert len(rows) - 1 == db.query(models.TransactionItem).count()
+
+
+def test_export_filters_by_window(client, db, transactions):
+    params = {"format": "ndjson", "start_date": "2024-01-10T00:00:00", "end_date": "2024-01-20T23:59:59"}
+
+    lines = client.get(f"{API}/retail/transactions/export", params=params).text.splitlines()
+
+    assert 0 < len(lines) == db.query(models.Transaction).filter(
+        models.Transaction.transaction_date.between(datetime(2024, 1, 10), datetime(2024, 1, 20, 23, 59, 59))
+    ).count()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_compressed_export_decodes_to_the_same_rows(client, transactions, fmt):
+    plain = client.get(
+        f"{API}/retail/transactions/export", params={"format": fmt}, headers={"Accept-Encoding": "identity"}
+    )
+    compressed = client.get(
+        f"{API}/retail/transactions/export", params={"format": fmt}, headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    # The client decodes the body
+    assert compressed.content == plain.content
+
+
+def test_unfiltered_export_builds_without_deprecations():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SADeprecationWarning)
+        transaction_export.statement()
+
+
+def test_export_reads_the_engine_of_the_given_session(db, transactions, tmp_path):
+    other_engine = create_engine(f"sqlite:///{tmp_path}/other.db")
+    Base.metadata.create_all(other_engine)
+    with Session(other_engine) as other:
+        exported = b"".join(transaction_export.stream(other, "csv"))
+
+    assert exported.decode().splitlines() == [",".join(CSV_HEADER)]
+
+
+def test_unknown_export_format_is_rejected(client, db):
+    assert client.get(f"{API}/retail/transactions/export", params={"format": "xml"}).status_code == 400
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.crud.group_commit import TransactionGroupCommit
+from app.db.base import SessionLocal
+from app.models import retail as models
+from tests.conftest import API, make_transactions
+
+
+def _queue(session_factory=SessionLocal, **options):
+    return TransactionGroupCommit(
+        session_factory, **{"max_batch": 5, "interval_ms": 1000, "max_queue": 100, "timeout": 10, **options}
+    )
+
+
+@pytest.fixture
+def group_commit(monkeypatch):
+    """Route POST /transactions through a group commit queue built by the returned function."""
+    monkeypatch.setattr(settings, "GROUP_COMMIT_ENABLED", True)
+    queues = []
+
+    def install(queue):
+        monkeypatch.setattr("app.api.v1.retail.transaction_group_commit", queue)
+        queues.append(queue)
+        return queue
+
+    yield install
+    for queue in queues:
+        queue.close()
+
+
+def test_concurrent_records_share_batches(db, retail):
+    queue = _queue()
+    records = make_transactions(retail, 12)
+
+    futures = [queue.submit(obj_in) for obj_in in records]
+    queue.close()
+
+    assert [f.result().status for f in futures] == ["created"] * 12
+    stats = queue.stats()
+    assert (stats["batches"], stats["max_batch_size"], stats["records"]) == (3, 5, 12)
+    assert db.query(models.Transaction).count() == 12
+
+
+def test_a_failing_record_does_not_fail_its_batch(db, retail):
+    queue = _queue()
+    good, bad, other = make_transactions(retail, 3)
+
+    futures = [queue.submit(obj_in) for obj_in in (good, bad.model_copy(update={"store_id": 9999}), other)]
+    queue.close()
+
+    results = [f.result() for f in futures]
+    assert [r.status for r in results] == ["created", "failed", "created"]
+    assert results[1].error == "Unknown store_id 9999"
+    assert queue.stats()["failed_batches"] == 0
+
+
+def test_posted_record_is_committed_through_the_queue(client, db, retail, group_commit):
+    queue = group_commit(_queue(interval_ms=1))
+    good, bad = (t.model_dump(mode="json") for t in make_transactions(retail, 2))
+
+    created = client.post(f"{API}/retail/transactions", json=good)
+    rejected = client.post(f"{API}/retail/transactions", json={**bad, "store_id": 9999})
+
+    assert created.status_code == 200
+    assert created.json()["transaction_code"] == good["transaction_code"]
+    assert rejected.status_code == 400
+    assert rejected.json()["detail"] == "Unknown store_id 9999"
+    assert queue.stats()["records"] == 2
+
+
+def test_slow_commit_times_out_with_503_and_retry_is_safe(client, db, retail, group_commit):
+    release = threading.Event()
+
+    def stalled_session():
+        release.wait()
+        return SessionLocal()
+
+    queue = group_commit(_queue(stalled_session, interval_ms=1, timeout=0.5))
+    payload = make_transactions(retail, 1)[0].model_dump(mode="json")
+
+    timed_out = client.post(f"{API}/retail/transactions", json=payload)
+    release.set()
+    queue.close()
+
+    assert timed_out.status_code == 503
+    # The record was already being flushed, so it still landed
+    assert db.query(models.Transaction).count() == 1
+    group_commit(_queue(interval_ms=1))
+    retried = client.post(f"{API}/retail/transactions", json=payload)
+    assert retried.status_code == 400
+    assert retried.json()["detail"] == "Transaction code already exists"
@@ -0,0 +1,106 @@
+import csv
+import sys
+from datetime import datetime
+
+import pytest
+
+import import_pos_history
+from app.core.config import settings
+from app.crud import retail as crud
+from app.models import retail as models
+from tests.conftest import make_transactions
+
+DAYS = (datetime(2024, 1, 1), datetime(2024, 3, 1))
+TRANSACTION_COLUMNS = [
+    "transaction_code", "store_code", "customer_code", "transaction_date", "total_amount",
+    "discount_amount", "tax_amount", "payment_method", "status",
+]
+ITEM_COLUMNS = ["transaction_code", "sku", "quantity", "unit_price", "total_price", "discount_amount"]
+
+
+@pytest.fixture
+def pos_files(retail, tmp_path):
+    """A 40-transaction file pair plus one transaction row for an unknown store."""
+    stores = {s.id: s.code for s in retail["stores"]}
+    customers = {c.id: c.customer_code for c in retail["customers"]}
+    skus = {p.id: p.sku for p in retail["products"]}
+    records = make_transactions(retail, 40)
+    transactions_path = tmp_path / "pos_transactions.csv"
+    with open(transactions_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, TRANSACTION_COLUMNS)
+        writer.writeheader()
+        for t in records:
+            writer.writerow({
+                "transaction_code": t.transaction_code, "store_code": stores[t.store_id],
+                "customer_code": customers.get(t.customer_id, ""), "transaction_date": t.transaction_date.isoformat(),
+                "total_amount": t.total_amount, "discount_amount": 0, "tax_amount": 0, "payment_method": "cash",
+                "status": "completed",
+            })
+        writer.writerow({"transaction_code": "TX-UNKNOWN-STORE", "store_code": "NOPE",
+                         "transaction_date": "2024-01-02T10:00:00", "total_amount": 1})
+    with open(tmp_path / "pos_items.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, ITEM_COLUMNS)
+        writer.writeheader()
+        for t in records:
+            for item in t.items:
+                writer.writerow({
+                    "transaction_code": t.transaction_code, "sku": skus[item.product_id], "quantity": item.quantity,
+                    "unit_price": item.unit_price, "total_price": item.total_price, "discount_amount": 0,
+                })
+    return str(transactions_path), str(tmp_path / "pos_items.csv"), records
+
+
+@pytest.fixture
+def worker(db, retail):
+    """This process set up as an import worker on the test database."""
+    for ids in (import_pos_history._store_ids, import_pos_history._customer_ids, import_pos_history._product_ids):
+        ids.clear()
+    import_pos_history._init_worker(settings.DATABASE_URL)
+
+
+def test_cli_loads_publishes_and_rolls_up(db, pos_files, monkeypatch, capsys):
+    transactions_path, _, records = pos_files
+    monkeypatch.setattr(sys, "argv", [
+        "import_pos_history.py", transactions_path, "--workers", "1", "--chunk-rows", "15"
+    ])
+
+    import_pos_history.main()
+
+    output = capsys.readouterr().out
+    assert "Loaded 40 transactions" in output and "rejected 1" in output
+    assert db.query(models.Transaction).count() == db.query(models.TransactionCode).count() == 40
+    assert db.query(models.TransactionItem).count() == sum(len(t.items) for t in records)
+    assert db.query(models.Transaction).filter(models.Transaction.change_seq.is_(None)).count() == 0
+    analytics = crud.CRUDAnalytics()
+    from_rollups = analytics.get_transaction_summary(db, *DAYS)
+    assert from_rollups.total_transactions == 40
+    assert from_rollups.total_sales == pytest.approx(sum(t.total_amount for t in records))
+
+
+def test_interrupted_import_resumes_after_the_last_checkpoint(db, pos_files, worker, monkeypatch):
+    transactions_path, items_path, records = pos_files
+    load = import_pos_history._load_transactions
+    calls = []
+
+    def fail_second_chunk(session, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("worker killed")
+        return load(session, rows)
+
+    monkeypatch.setattr(import_pos_history, "_load_transactions", fail_second_chunk)
+    with pytest.raises(RuntimeError):
+        import_pos_history.import_file_pair(transactions_path, items_path, 15)
+    assert db.query(models.Transaction).count() == 15
+    assert db.query(models.ImportCheckpoint).one().rows_read == 15
+
+    monkeypatch.setattr(import_pos_history, "_load_transactions", load)
+    resumed = import_pos_history.import_file_pair(transactions_path, items_path, 15)
+    again = import_pos_history.import_file_pair(transactions_path, items_path, 15)
+
+    assert resumed["transactions"]["resumed_at"] == 15
+    assert (resumed["transactions"]["loaded"], resumed["transactions"]["rejected"]) == (25, 1)
+    assert resumed["items"]["loaded"] == sum(len(t.items) for t in records)
+    assert again["transactions"]["loaded"] == again["items"]["loaded"] == 0
+    codes = [code for code, in db.query(models.Transaction.transaction_code)]
+    assert sorted(codes) == sorted(t.transaction_code for t in records)
@@ -0,0 +1,114 @@
+import json
+
+from sqlalchemy import event
+
+from app.db.base import engine
+from app.models import retail as models
+from tests.conftest import API, make_transactions
+
+
+def test_bulk_reports_each_failed_record(client, db, retail):
+    good = make_transactions(retail, 3)
+    duplicate = good[0].model_copy(update={"transaction_code": good[1].transaction_code})
+    bad_store = make_transactions(retail, 1, start=10)[0].model_copy(update={"store_id": 9999})
+    bad_product = make_transactions(retail, 1, start=11)[0]
+    bad_product.items[0].product_id = 9999
+    payload = [t.model_dump(mode="json") for t in good + [duplicate, bad_store, bad_product]]
+
+    response = client.post(f"{API}/retail/transactions/bulk", json=payload, params={"chunk_size": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (3, 3)
+    statuses = [(r["index"], r["status"]) for r in body["results"]]
+    assert statuses == [
+        (0, "created"), (1, "created"), (2, "created"), (3, "failed"), (4, "failed"), (5, "failed")
+    ]
+    errors = {r["index"]: r["error"] for r in body["results"] if r["status"] == "failed"}
+    assert errors == {
+        3: "Duplicate transaction_code in this upload",
+        4: "Unknown store_id 9999",
+        5: "Unknown product_id 9999",
+    }
+    assert db.query(models.Transaction).count() == 3
+
+
+def test_bulk_rejects_codes_already_stored(client, db, retail):
+    first, second = (t.model_dump(mode="json") for t in make_transactions(retail, 2))
+    client.post(f"{API}/retail/transactions/bulk", json=[first])
+
+    body = client.post(f"{API}/retail/transactions/bulk", json=[first, second]).json()
+
+    assert [r["status"] for r in body["results"]] == ["failed", "created"]
+    assert body["results"][0]["error"] == "Transaction code already exists"
+    assert db.query(models.Transaction).count() == 2
+
+
+def test_stream_reports_errors_by_line(client, db, retail):
+    records = make_transactions(retail, 4)
+    lines = [
+        records[0].model_dump_json(),
+        "{not json",
+        records[1].model_dump_json(),
+        json.dumps({"transaction_code": "TX-INCOMPLETE"}),
+        "",
+        records[2].model_copy(update={"store_id": 9999}).model_dump_json(),
+        records[0].model_dump_json(),
+        records[3].model_dump_json(),
+    ]
+
+    response = client.post(
+        f"{API}/retail/transactions/stream",
+        content="\n".join(lines) + "\n",
+        params={"batch_size": 2},
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["failed"]) == (3, 4)
+    assert [e["line"] for e in report["errors"]] == [2, 4, 6, 7]
+    assert report["errors"][2]["error"] == "Unknown store_id 9999"
+    assert db.query(models.Transaction).count() == 3
+    assert db.query(models.TransactionItem).count() == sum(len(r.items) for r in (records[0], records[1], records[3]))
+
+
+def _post_counting_statements(client, payload):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.post(f"{API}/retail/transactions", json=payload)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+def test_create_runs_the_same_statements_for_any_number_of_items(client, db, retail):
+    first, one_item, all_items = (t.model_dump(mode="json") for t in make_transactions(retail, 3))
+    template = first["items"][0]
+    items = [
+        {**template, "product_id": p.id, "unit_price": p.selling_price,
+         "total_price": template["quantity"] * p.selling_price}
+        for p in retail["products"]
+    ]
+    # Same business day, so neither request adds a calendar row
+    _post_counting_statements(client, {**first, "transaction_date": "2024-01-10T10:00:00"})
+
+    small, small_count = _post_counting_statements(client, {
+        **one_item, "transaction_date": "2024-01-10T11:00:00", "items": items[:1],
+        "total_amount": items[0]["total_price"]
+    })
+    large, large_count = _post_counting_statements(client, {
+        **all_items, "transaction_date": "2024-01-10T12:00:00", "items": items,
+        "total_amount": sum(item["total_price"] for item in items)
+    })
+
+    assert small_count == large_count
+    assert [item["product"]["sku"] for item in large["items"]] == [p.sku for p in retail["products"]]
+    assert large["store"]["region"]["code"] == "NCR"
+    assert len(small["items"]) == 1
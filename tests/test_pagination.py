@@ -0,0 +1,67 @@
+import pytest
+
+from app.core.pagination import MAX_PAGE_SIZE
+from app.crud.rfm import customer_segment
+from tests.conftest import API
+
+
+def walk(client, path, limit, **params):
+    """Every item of a cursor-paginated listing, following next_cursor to the end."""
+    items, cursor = [], ""
+    while cursor is not None:
+        response = client.get(path, params={**params, "cursor": cursor, "limit": limit})
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= limit
+        items += page["items"]
+        cursor = page["next_cursor"]
+    return items
+
+
+@pytest.mark.parametrize("path, limit, params", [
+    ("/retail/products", 2, {}),
+    ("/retail/customers", 3, {}),
+    ("/retail/transactions", 7, {"days": 100000}),
+])
+def test_cursor_walk_matches_offset_listing(client, transactions, path, limit, params):
+    listed = client.get(f"{API}{path}", params={**params, "limit": MAX_PAGE_SIZE}).json()
+
+    walked = walk(client, f"{API}{path}", limit, **params)
+
+    assert walked == listed
+    assert len({item["id"] for item in walked}) == len(walked)
+
+
+def test_cursor_walk_matches_offset_listing_for_segments(client, db, transactions):
+    assert client.get(f"{API}/retail/customers/rfm-segments").status_code == 503
+    customer_segment.refresh(db)
+    listed = client.get(f"{API}/retail/customers/rfm-segments", params={"limit": MAX_PAGE_SIZE}).json()
+
+    assert walk(client, f"{API}/retail/customers/rfm-segments", 4) == listed
+    assert len(listed) == 10
+
+
+def test_cursor_walk_matches_offset_listing_for_analytics(client, analytics_db):
+    listed = client.get(f"{API}/analytics/transactions", params={"limit": MAX_PAGE_SIZE}).json()
+
+    walked = walk(client, f"{API}/analytics/transactions", 40)
+
+    assert sorted(walked, key=lambda t: t["id"]) == sorted(listed, key=lambda t: t["id"])
+    assert [(t["order_date"], t["id"]) for t in walked] == sorted((t["order_date"], t["id"]) for t in walked)
+
+
+def test_cursor_page_size_is_capped(client, analytics_db):
+    for params in ({"limit": MAX_PAGE_SIZE + 1, "cursor": ""}, {"limit": 0, "cursor": ""}):
+        response = client.get(f"{API}/analytics/transactions", params=params)
+        assert response.status_code == 400
+
+
+def test_offset_page_size_is_not_capped(client, analytics_db):
+    response = client.get(f"{API}/analytics/transactions", params={"limit": MAX_PAGE_SIZE + 1})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 250
+
+
+def test_malformed_cursor_is_a_bad_request(client, db, retail):
+    assert client.get(f"{API}/retail/customers", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,123 @@
+import sys
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+import manage_partitions
+from app.crud import retail as crud
+from app.db.partitions import (
+    add_months, drop_partitions_before, ensure_future_partitions, partition_month, partition_name
+)
+from app.models import retail as models
+from tests.conftest import make_transactions
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalar(self):
+        return self._rows[0][0] if self._rows else None
+
+
+class MySQLCatalog:
+    """Answers the information_schema and archive_segments reads of app.db.partitions; records the DDL."""
+
+    def __init__(self, partitions, archived_months=()):
+        self.partitions = partitions
+        self.archived_months = list(archived_months)
+        self.ddl = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "information_schema.PARTITIONS" in sql:
+            return _Result([(name, 100) for name in self.partitions.get(params["table"], [])])
+        if "archive_segments" in sql:
+            return _Result([(max(self.archived_months, default=None),)])
+        self.ddl.append(sql)
+        return _Result([])
+
+
+def _monthly(*names):
+    return {"transactions": [*names, "pmax"], "transaction_items": [*names, "pmax"]}
+
+
+def test_partition_names_round_trip_to_months():
+    assert partition_name(date(2024, 12, 1)) == "p202412"
+    assert partition_month("p202412") == date(2024, 12, 1)
+    assert partition_month("pmax") is None
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_future_months_are_split_out_of_pmax():
+    conn = MySQLCatalog(_monthly("p202401", "p202402"))
+
+    created = ensure_future_partitions(conn, date(2024, 4, 1))
+
+    assert created == [
+        "transactions.p202403", "transactions.p202404", "transaction_items.p202403", "transaction_items.p202404"
+    ]
+    assert conn.ddl[0] == (
+        "ALTER TABLE transactions REORGANIZE PARTITION pmax INTO ("
+        "PARTITION p202403 VALUES LESS THAN ('2024-04-01'), PARTITION p202404 VALUES LESS THAN ('2024-05-01'), "
+        "PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+    )
+    assert ensure_future_partitions(MySQLCatalog(_monthly("p202404")), date(2024, 4, 1)) == []
+
+
+def test_only_archived_months_are_dropped():
+    partitions = _monthly("p202401", "p202402", "p202403")
+
+    with pytest.raises(ValueError, match="p202402 are not archived"):
+        drop_partitions_before(MySQLCatalog(partitions, [date(2024, 1, 1)]), date(2024, 3, 1))
+
+    conn = MySQLCatalog(partitions, [date(2024, 1, 1), date(2024, 2, 1)])
+    dropped = drop_partitions_before(conn, date(2024, 3, 15))
+
+    assert dropped == [
+        "transaction_items.p202401", "transaction_items.p202402", "transactions.p202401", "transactions.p202402"
+    ]
+    assert conn.ddl == [
+        "ALTER TABLE transaction_items DROP PARTITION p202401, p202402",
+        "ALTER TABLE transactions DROP PARTITION p202401, p202402",
+    ]
+
+
+def test_cli_refuses_databases_without_partitions(db, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["manage_partitions.py", "status"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        manage_partitions.main()
+
+    assert exit_info.value.code == 1
+    assert "only supported on MySQL, not sqlite" in capsys.readouterr().out
+
+
+@pytest.fixture
+def widened_code_key(db):
+    """The transaction code key as partitioning leaves it: unique only per (code, date)."""
+    db.execute(text("DROP INDEX ix_transactions_transaction_code"))
+    db.execute(text(
+        "CREATE UNIQUE INDEX ix_transactions_transaction_code ON transactions (transaction_code, transaction_date)"
+    ))
+    db.commit()
+
+
+def test_codes_stay_unique_with_the_widened_key(db, retail, widened_code_key):
+    first = make_transactions(retail, 1)[0]
+    crud.transaction.create(db, obj_in=first)
+    later = first.model_copy(update={"transaction_date": first.transaction_date + timedelta(days=3)})
+
+    with pytest.raises(IntegrityError):
+        crud.transaction.create(db, obj_in=later)
+    db.rollback()
+    result = crud.transaction.create_bulk(db, [later])
+
+    assert result.results[0].error == "Transaction code already exists"
+    assert db.query(models.Transaction).count() == db.query(models.TransactionCode).count() == 1
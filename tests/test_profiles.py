@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import exc
+
+from app.core.config import settings
+from app.crud.profiles import transaction_profile
+from app.models import retail as models
+from tests.conftest import API, make_transactions
+
+EXPANSIONS = [{}, {"expand": ""}, {"expand": "store,items.product"}, {"fields": "id,store.name,items.product.sku"}]
+
+
+@pytest.fixture(autouse=True)
+def raise_on_lazy_load(monkeypatch):
+    monkeypatch.setattr(settings, "RAISE_ON_LAZY_LOAD", True)
+
+
+def _lists(retail):
+    store = retail["stores"][0]
+    product = retail["products"][0]
+    return [
+        ("/retail/geography/provinces", {"region_id": store.region_id}),
+        ("/retail/geography/cities", {"province_id": store.city.province_id}),
+        ("/retail/stores/by-region", {}),
+        ("/retail/stores/by-region", {"region_id": store.region_id}),
+        ("/retail/products", {}),
+        ("/retail/products", {"cursor": ""}),
+        ("/retail/products/by-category", {"category_id": product.category_id}),
+        ("/retail/customers", {}),
+        ("/retail/customers", {"cursor": ""}),
+    ]
+
+
+def test_lists_load_without_lazy_loads(client, transactions, retail):
+    for path, params in _lists(retail):
+        response = client.get(f"{API}{path}", params=params)
+        assert response.status_code == 200, (path, params, response.text)
+        assert response.json()
+
+
+@pytest.mark.parametrize("selection", EXPANSIONS)
+@pytest.mark.parametrize("params", [{}, {"cursor": ""}])
+def test_transaction_lists_load_without_lazy_loads(client, transactions, selection, params):
+    response = client.get(f"{API}/retail/transactions", params={"days": 100000, "limit": 50, **selection, **params})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert len(body["items"] if "cursor" in params else body) == 50
+
+
+def test_product_expansions_load_without_lazy_loads(client, transactions):
+    for selection in ({"expand": ""}, {"expand": "brand"}, {"fields": "sku,category.name"}):
+        response = client.get(f"{API}/retail/products", params=selection)
+        assert response.status_code == 200, (selection, response.text)
+
+
+def test_analytics_transactions_load_without_lazy_loads(client, analytics_db):
+    for params in ({}, {"cursor": ""}):
+        response = client.get(f"{API}/analytics/transactions", params=params)
+        assert response.status_code == 200, response.text
+
+
+def test_created_transaction_loads_without_lazy_loads(client, db, retail):
+    obj_in = make_transactions(retail, 1)[0]
+
+    response = client.post(f"{API}/retail/transactions", json=obj_in.model_dump(mode="json"))
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["store"]["code"] and body["items"][0]["product"]["sku"]
+
+
+def test_unplanned_relationship_reads_raise(db, transactions):
+    loaded = db.query(models.Transaction).options(*transaction_profile.options()).first()
+
+    assert loaded.store.code
+    with pytest.raises(exc.InvalidRequestError):
+        loaded.store.transactions
+
+
+def test_projection_with_a_query_per_row_raises(db, transactions, monkeypatch):
+    def attach_per_parent(session, path, parents, expanded):
+        for parent, key in parents:
+            parent["items"] = session.query(models.TransactionItem).filter_by(transaction_id=key).all()
+
+    monkeypatch.setattr(transaction_profile, "_attach", attach_per_parent)
+
+    with pytest.raises(exc.InvalidRequestError):
+        transaction_profile.project(db.query(models.Transaction).limit(5))
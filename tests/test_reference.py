@@ -0,0 +1,56 @@
+import pytest
+
+from app.models import retail as models
+from tests.conftest import API
+
+
+def _payloads(retail):
+    """Per route: the model, its natural key and a new record."""
+    store, product = retail["stores"][0], retail["products"][0]
+    return {path: rest for path, *rest in [
+        ("/retail/regions", models.Region, "code", {"code": "VIS", "name": "Visayas"}),
+        ("/retail/brands", models.Brand, "code", {"code": "BR9", "name": "Brand Nine"}),
+        ("/retail/categories", models.Category, "code", {"code": "CAT9", "name": "Category Nine"}),
+        ("/retail/stores", models.Store, "code", {
+            "code": "ST9", "name": "Store Nine", "region_id": store.region_id, "city_id": store.city_id
+        }),
+        ("/retail/products", models.Product, "sku", {
+            "sku": "SKU9", "name": "Product Nine", "brand_id": product.brand_id,
+            "category_id": product.category_id, "selling_price": 99.0
+        }),
+        ("/retail/customers", models.Customer, "customer_code", {"customer_code": "CUST99", "name": "Customer 99"}),
+    ]}
+
+
+@pytest.mark.parametrize("path", [
+    "/retail/regions", "/retail/brands", "/retail/categories", "/retail/stores", "/retail/products",
+    "/retail/customers",
+])
+def test_posting_a_record_twice_updates_it(client, db, retail, path):
+    model, key, payload = _payloads(retail)[path]
+
+    first = client.post(f"{API}{path}", json=payload)
+    again = client.post(f"{API}{path}", json=payload)
+    renamed = client.post(f"{API}{path}", json={**payload, "name": "Renamed"})
+
+    assert first.status_code == again.status_code == renamed.status_code == 200
+    assert first.json()["id"] == again.json()["id"] == renamed.json()["id"]
+    assert renamed.json()["name"] == "Renamed"
+    assert db.query(model).filter(getattr(model, key) == payload[key]).count() == 1
+
+
+def test_bulk_upserts_return_every_id_and_keep_the_last_duplicate(client, db, retail):
+    brands = [{"code": "BR1", "name": "Brand One Renamed"}, {"code": "BR7", "name": "First"},
+              {"code": "BR7", "name": "Last"}]
+
+    body = client.post(f"{API}/retail/brands/bulk", json=brands).json()
+    again = client.post(f"{API}/retail/brands/bulk", json=brands).json()
+
+    assert body == again
+    assert body["upserted"] == 2
+    stored = {b.code: (b.id, b.name) for b in db.query(models.Brand)}
+    assert stored == {
+        "BR1": (body["ids"]["BR1"], "Brand One Renamed"),
+        "BR7": (body["ids"]["BR7"], "Last"),
+    }
+    assert body["ids"]["BR1"] == retail["products"][0].brand_id
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, model_response
+from app.crud import retail as crud
+from app.schemas.ph_awards import PHAwardsResponse
+from tests.conftest import API
+
+RETAIL_LISTINGS = [
+    ("/retail/transactions", {"days": 100000, "limit": 50}),
+    ("/retail/transactions", {"days": 100000, "limit": 50, "cursor": ""}),
+    ("/retail/transactions", {"days": 100000, "limit": 50, "expand": "store,items.product"}),
+    ("/retail/products", {}),
+    ("/retail/products", {"cursor": "", "expand": "brand"}),
+    ("/retail/customers", {"cursor": ""}),
+    ("/retail/stores/by-region", {"expand": "region"}),
+]
+
+
+def _both_ways(client, monkeypatch, path, params):
+    """The body of ``path`` through FastAPI's encoder, then through the fast path."""
+    bodies = []
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+        response = client.get(f"{API}{path}", params=params)
+        assert response.status_code == 200, response.text
+        bodies.append(response.content)
+    return bodies
+
+
+@pytest.mark.parametrize("path, params", RETAIL_LISTINGS)
+def test_fast_listings_are_byte_identical(client, transactions, monkeypatch, path, params):
+    default, fast = _both_ways(client, monkeypatch, path, params)
+
+    assert fast == default
+
+
+@pytest.mark.parametrize("params", [{}, {"cursor": ""}])
+def test_fast_analytics_transactions_are_byte_identical(client, analytics_db, monkeypatch, params):
+    default, fast = _both_ways(client, monkeypatch, "/analytics/transactions", params)
+
+    assert fast == default
+
+
+def test_orjson_renders_what_json_dumps_renders(db, transactions):
+    dashboard = jsonable_encoder(crud.analytics.get_dashboard(db, datetime(2024, 1, 1), datetime(2024, 3, 1)))
+
+    assert FastJSONResponse(dashboard).body == JSONResponse(dashboard).body
+
+
+def test_fast_model_response_matches_the_response_model_encoding(monkeypatch):
+    model = PHAwardsResponse(
+        success=True,
+        data={"campaigns": [{"campaign_name": "Bayanihan", "overall_ces_score": 87.5, "won_award": 1}],
+              "pagination": {"total": 1, "limit": 20, "offset": 0, "has_more": False}},
+        timestamp="2024-01-01T00:00:00"
+    )
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+
+    assert model_response(model).body == JSONResponse(jsonable_encoder(model)).body
@@ -0,0 +1,61 @@
+from datetime import date
+
+import numpy as np
+
+from app.crud import retail as crud
+from app.crud.rfm import NO_PURCHASES_SEGMENT, _SEGMENT_RULES, _quintile_scores, customer_segment
+from app.models import retail as models
+from tests.conftest import make_transactions
+
+AS_OF = date(2024, 3, 15)
+
+
+def _segments(db):
+    return {
+        s.customer_id: (s.frequency, round(s.monetary, 6), s.first_purchase_date, s.last_purchase_date,
+                        s.r_score, s.f_score, s.m_score, s.segment, s.clv, s.loyalty_score)
+        for s in db.query(models.CustomerSegment)
+    }
+
+
+def test_quintile_scores_rank_values_into_fifths():
+    assert _quintile_scores(np.arange(10.0)).tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+    assert _quintile_scores(np.array([5.0, 1.0, 5.0, 5.0, 3.0])).tolist() == [3, 1, 3, 3, 2]
+
+
+def test_segments_follow_the_scoring_rules(db, transactions):
+    idle = models.Customer(customer_code="IDLE", name="No purchases")
+    db.add(idle)
+    db.commit()
+
+    customer_segment.refresh(db, as_of=AS_OF)
+
+    segments = db.query(models.CustomerSegment).all()
+    assert len(segments) == 11
+    for s in segments:
+        if s.frequency == 0:
+            assert (s.segment, s.r_score, s.loyalty_score) == (NO_PURCHASES_SEGMENT, 0, 0)
+            continue
+        fm = (s.f_score + s.m_score) // 2
+        expected = next(
+            (label for label, r_min, r_max, fm_min, fm_max in _SEGMENT_RULES
+             if r_min <= s.r_score <= r_max and fm_min <= fm <= fm_max),
+            "Lost"
+        )
+        assert s.segment == expected
+        assert s.loyalty_score == round((s.r_score + s.f_score + s.m_score) / 15 * 100)
+    assert next(s for s in segments if s.customer_id == idle.id).segment == NO_PURCHASES_SEGMENT
+
+
+def test_incremental_refresh_reaggregates_only_new_buyers(db, retail, transactions):
+    customer_segment.refresh(db, as_of=AS_OF)
+    buyer = retail["customers"][0]
+    for obj_in in make_transactions(retail, 3, seed=2, start=300):
+        crud.transaction.create(db, obj_in=obj_in.model_copy(update={"customer_id": buyer.id}))
+
+    assert customer_segment.refresh(db, as_of=AS_OF) == 1
+    incremental = _segments(db)
+    assert customer_segment.refresh(db, as_of=AS_OF) == 0
+
+    customer_segment.refresh(db, full=True, as_of=AS_OF)
+    assert _segments(db) == incremental
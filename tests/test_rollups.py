@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.sketches import QUANTILE_RELATIVE_ACCURACY
+from app.crud import retail as crud
+from app.crud.columnar import columnar_analytics
+from app.models import retail as models
+from tests.conftest import make_transactions
+
+ROLLUP_MODELS = [
+    models.DailyStoreSales, models.DailyProductSales, models.DailyGroupSales,
+    models.DailySketchRegister, models.DailyBasketBucket,
+]
+
+# Day-aligned, so answered from the rollups
+DAYS = (datetime(2024, 1, 5), datetime(2024, 2, 21))
+# The same transactions (none fall in a day's first or last second) read from raw rows
+RAW = (datetime(2024, 1, 5, 0, 0, 1), datetime(2024, 2, 20, 23, 59, 59))
+# Sketched by the SQL engine, exact in the columnar one
+PERCENTILES = ("p50_basket_size", "p90_basket_size", "p99_basket_size")
+
+
+def _rollup_rows(db):
+    rows = {}
+    for model in ROLLUP_MODELS:
+        columns = [c.name for c in model.__table__.columns if c.name not in ("id", "updated_at")]
+        rows[model.__tablename__] = sorted(
+            tuple(round(v, 6) if isinstance(v, float) else v for v in row)
+            for row in db.query(*(model.__table__.c[name] for name in columns))
+        )
+    return rows
+
+
+def _normalized(result):
+    """Results as sorted plain values, floats rounded past summation noise."""
+    def plain(value):
+        if isinstance(value, float):
+            return round(value, 6)
+        if isinstance(value, dict):
+            return {k: plain(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return sorted((plain(v) for v in value), key=repr)
+        return value
+    if isinstance(result, list):
+        return plain([item.model_dump() for item in result])
+    return plain(result.model_dump())
+
+
+def test_rebuild_matches_incremental_rollups(db, retail):
+    crud.transaction.create_bulk(db, make_transactions(retail, 200), chunk_size=50)
+    for obj_in in make_transactions(retail, 20, seed=1, start=200):
+        crud.transaction.create(db, obj_in=obj_in)
+    incremental = _rollup_rows(db)
+    assert incremental["daily_store_sales"]
+
+    crud.sales_rollup.rebuild(db)
+
+    assert _rollup_rows(db) == incremental
+
+
+@pytest.mark.parametrize("method, kwargs", [
+    ("get_sales_by_region", {}),
+    ("get_sales_by_brand", {}),
+    ("get_sales_by_category", {}),
+    ("get_store_performance", {}),
+    ("get_top_selling_products", {"limit": 3}),
+    ("get_sales_trends", {"granularity": "day"}),
+    ("get_sales_trends", {"granularity": "week"}),
+    ("get_transaction_summary", {}),
+])
+def test_rollup_raw_and_columnar_answers_agree(db, transactions, method, kwargs):
+    from_rollups = getattr(crud.analytics, method)(db, *DAYS, **kwargs)
+    from_raw = getattr(crud.analytics, method)(db, *RAW, **kwargs)
+    from_columns = getattr(columnar_analytics, method)(db, *DAYS, **kwargs)
+
+    assert from_rollups
+    assert _normalized(from_rollups) == _normalized(from_raw)
+    if method == "get_store_performance":
+        for sketched, exact in zip(from_raw, from_columns):
+            for name in PERCENTILES:
+                assert getattr(sketched, name) == pytest.approx(getattr(exact, name), rel=QUANTILE_RELATIVE_ACCURACY)
+        from_raw = [r.model_copy(update={name: None for name in PERCENTILES}) for r in from_raw]
+        from_columns = [r.model_copy(update={name: None for name in PERCENTILES}) for r in from_columns]
+    assert _normalized(from_columns) == _normalized(from_raw)
+
+
+def test_windows_are_half_open_on_both_paths(db, retail):
+    last_moment, next_midnight = datetime(2024, 2, 20, 23, 59, 59, 500000), datetime(2024, 2, 21)
+    for obj_in, when in zip(make_transactions(retail, 2), (last_moment, next_midnight)):
+        crud.transaction.create(db, obj_in=obj_in.model_copy(update={"transaction_date": when}))
+
+    from_rollups = crud.analytics.get_transaction_summary(db, datetime(2024, 2, 20), next_midnight)
+    from_raw = crud.analytics.get_transaction_summary(db, datetime(2024, 2, 20, 0, 0, 1), next_midnight)
+
+    assert from_rollups.total_transactions == from_raw.total_transactions == 1
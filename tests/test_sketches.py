@@ -0,0 +1,56 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from app.core.sketches import HLL_PRECISION, hll_estimate, hll_register
+from app.crud import retail as crud
+from app.models import retail as models
+
+DAYS = (datetime(2024, 1, 5), datetime(2024, 2, 21))
+# Three standard errors; the hash is fixed, so this cannot flake
+HLL_BOUND = 3 * 1.04 / math.sqrt(1 << HLL_PRECISION)
+
+
+def _sketch(values):
+    registers = {}
+    for value in values:
+        index, weight = hll_register(value)
+        registers[index] = min(weight, registers.get(index, 1.0))
+    return registers
+
+
+def _estimate(registers):
+    return hll_estimate(sum(registers.values()), len(registers))
+
+
+@pytest.mark.parametrize("count", [10, 1000, 20000, 200000])
+def test_hll_estimates_stay_within_the_error_bound(count):
+    assert _estimate(_sketch(range(count))) == pytest.approx(count, rel=HLL_BOUND)
+
+
+def test_merged_sketches_estimate_the_union():
+    left, right = _sketch(range(0, 30000)), _sketch(range(20000, 50000))
+
+    merged = {i: min(left.get(i, 1.0), right.get(i, 1.0)) for i in left.keys() | right.keys()}
+
+    assert merged == _sketch(range(50000))
+    assert _estimate(merged) == pytest.approx(50000, rel=HLL_BOUND)
+
+
+def test_summary_estimates_distinct_counts_and_exact_counts_them(db, transactions):
+    in_window = db.query(models.Transaction).filter(
+        models.Transaction.transaction_date >= DAYS[0], models.Transaction.transaction_date < DAYS[1]
+    ).all()
+    customers = {t.customer_id for t in in_window if t.customer_id is not None}
+    products = {item.product_id for t in in_window for item in t.items}
+
+    estimated = crud.analytics.get_transaction_summary(db, *DAYS)
+    exact = crud.analytics.get_transaction_summary(db, *DAYS, exact=True)
+
+    assert (exact.total_customers, exact.total_products_sold) == (len(customers), len(products))
+    assert estimated.total_customers == pytest.approx(len(customers), rel=HLL_BOUND)
+    assert estimated.total_products_sold == pytest.approx(len(products), rel=HLL_BOUND)
+    assert estimated.model_dump(exclude={"total_customers", "total_products_sold"}) == pytest.approx(
+        exact.model_dump(exclude={"total_customers", "total_products_sold"})
+    )
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from app.core.pagination import MAX_PAGE_SIZE
+from app.core.tabular import ARROW_STREAM, PARQUET
+from tests.conftest import API
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+WINDOW = {"start_date": "2024-01-01T00:00:00", "end_date": "2024-04-01T00:00:00"}
+
+
+def read_arrow(response):
+    return pa.ipc.open_stream(response.content).read_all()
+
+
+def read_parquet(response):
+    return pq.read_table(io.BytesIO(response.content))
+
+
+def jsonable(rows):
+    return [{k: v.isoformat() if hasattr(v, "isoformat") else v for k, v in row.items()} for row in rows]
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/retail/sales/trends", {"granularity": "week"}),
+    ("/retail/stores/performance", {}),
+])
+@pytest.mark.parametrize("engine", ["sql", "columnar"])
+def test_tables_match_the_json_response(client, transactions, path, params, engine):
+    params = {**params, **WINDOW, "engine": engine}
+    expected = client.get(f"{API}{path}", params=params).json()
+
+    arrow = client.get(f"{API}{path}", params=params, headers={"Accept": ARROW_STREAM})
+    parquet = client.get(f"{API}{path}", params=params, headers={"Accept": PARQUET})
+
+    assert arrow.headers["content-type"] == ARROW_STREAM
+    assert parquet.headers["content-type"] == PARQUET
+    assert jsonable(read_arrow(arrow).to_pylist()) == expected
+    assert read_parquet(parquet).equals(read_arrow(arrow))
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (f"application/json, {ARROW_STREAM};q=0.9", "application/json"),
+    (f"application/json;q=0.5, {PARQUET}", PARQUET),
+    (f"{ARROW_STREAM}, {PARQUET}", ARROW_STREAM),
+    ("text/html", "application/json"),
+])
+def test_accept_header_picks_the_format(client, transactions, accept, expected):
+    response = client.get(f"{API}/retail/sales/trends", params=WINDOW, headers={"Accept": accept})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(expected)
+
+
+def test_parquet_is_not_compressed_again(client, transactions):
+    response = client.get(
+        f"{API}/retail/sales/trends", params=WINDOW, headers={"Accept": PARQUET, "Accept-Encoding": "gzip"}
+    )
+
+    assert "content-encoding" not in response.headers
+
+
+def test_tabular_formats_need_pyarrow(client, transactions, monkeypatch):
+    monkeypatch.setattr("app.api.deps.pa", None)
+
+    assert client.get(f"{API}/retail/sales/trends", headers={"Accept": ARROW_STREAM}).status_code == 406
+    assert client.get(f"{API}/retail/sales/trends").status_code == 200
+
+
+def test_offset_tables_are_not_capped_at_a_page(client, analytics_db):
+    response = client.get(
+        f"{API}/analytics/transactions", params={"limit": MAX_PAGE_SIZE * 10}, headers={"Accept": ARROW_STREAM}
+    )
+
+    table = read_arrow(response)
+    assert table.num_rows == 250
+    assert table.column_names == list(client.get(f"{API}/analytics/transactions").json()[0])
+
+
+def test_cursor_tables_send_the_next_cursor_in_a_header(client, analytics_db):
+    rows, cursor = [], ""
+    while cursor is not None:
+        response = client.get(
+            f"{API}/analytics/transactions", params={"cursor": cursor, "limit": 100}, headers={"Accept": PARQUET}
+        )
+        rows += read_parquet(response).to_pylist()
+        cursor = response.headers.get("x-next-cursor")
+
+    assert len(rows) == 250
+    assert len({row["id"] for row in rows}) == 250